@@ -32,6 +32,9 @@ from kivy.uix.popup import Popup
 from kivy.core.window import Window
 from kivy.graphics import Color, Rectangle
 from kivy.uix.relativelayout import RelativeLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.metrics import dp
 
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
@@ -92,6 +95,35 @@ class Profile:
         return asdict(self)
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# WIDGETS - Listy wirtualizowane
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TesterRecycleList(RecycleView):
+    """
+    Lista OneLineListItem oparta o RecycleView
+
+    Widżety powstają tylko dla widocznych wierszy; odświeżenie to podmiana
+    listy `data`, bez clear_widgets() i tworzenia widżetu na każdy wpis.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.viewclass = 'OneLineListItem'
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, dp(48)),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+
+    def set_texts(self, texts) -> None:
+        """Podmień wiersze listy"""
+        self.data = [{'text': text} for text in texts]
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # DATABASE - Obsługa bazy danych SQLite
 # ═══════════════════════════════════════════════════════════════════════════
@@ -819,7 +851,7 @@ class WorkHoursTesterApp(MDApp):
         """Tab do przeglądania wpisów"""
         layout = MDBoxLayout(orientation='vertical', padding=15, spacing=10)
         
-        self.entries_list = MDList(size_hint_y=0.9)
+        self.entries_list = TesterRecycleList(size_hint_y=0.9)
         self._refresh_entries_list()
         
         layout.add_widget(self.entries_list)
@@ -903,7 +935,7 @@ class WorkHoursTesterApp(MDApp):
         layout.add_widget(form_layout)
         
         # Profiles list
-        self.profiles_list = MDList(size_hint_y=0.85)
+        self.profiles_list = TesterRecycleList(size_hint_y=0.85)
         self._refresh_profiles_list()
         layout.add_widget(self.profiles_list)
         
@@ -1034,9 +1066,7 @@ class WorkHoursTesterApp(MDApp):
         self.entry_status.text = ''
 
     def _refresh_entries_list(self):
-        """Odśwież listę wpisów"""
-        self.entries_list.clear_widgets()
-        
+        """Odśwież listę wpisów (podmiana danych RecycleView)"""
         entries = self.db.get_work_entries_month(
             self.current_profile_id,
             datetime.now().year,
@@ -1044,11 +1074,10 @@ class WorkHoursTesterApp(MDApp):
         )
         
         if not entries:
-            self.entries_list.add_widget(
-                OneLineListItem(text='Brak wpisów w tym miesiącu')
-            )
+            self.entries_list.set_texts(['Brak wpisów w tym miesiącu'])
             return
         
+        texts = []
         for entry in entries:
             calc = self.calculator.calculate_work_time(
                 entry['start_time'],
@@ -1057,12 +1086,12 @@ class WorkHoursTesterApp(MDApp):
                 entry['day_type']
             )
             
-            text = (
+            texts.append(
                 f"{entry['date']}: {entry['start_time']} - {entry['end_time']} "
                 f"({calc['net_formatted']}) - {entry['day_type']}"
             )
-            
-            self.entries_list.add_widget(OneLineListItem(text=text))
+        
+        self.entries_list.set_texts(texts)
 
     def _on_generate_report(self, instance):
         """Generuj raport miesiączny"""
@@ -1132,14 +1161,9 @@ Dni wolne: {summary['day_counts']['day_off']}
             self.report_display.text = f'[color=ff0000]Błąd: {str(e)}[/color]'
 
     def _refresh_profiles_list(self):
-        """Odśwież listę profili"""
-        self.profiles_list.clear_widgets()
-        
+        """Odśwież listę profili (podmiana danych RecycleView)"""
         profiles = self.db.get_all_profiles()
-        
-        for profile in profiles:
-            text = f"👤 {profile['name']}"
-            self.profiles_list.add_widget(OneLineListItem(text=text))
+        self.profiles_list.set_texts(f"👤 {profile['name']}" for profile in profiles)
 
     def _on_add_profile(self, instance):
         """Dodaj nowy profil"""
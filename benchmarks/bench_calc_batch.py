@@ -0,0 +1,86 @@
+"""
+Benchmark - obliczenia wsadowe dni pracy
+
+Porównuje pętlę calculate_work_day (jeden WorkDayResult na dzień)
+z CalcService.calculate_work_days_batch (ścieżka NumPy, jeśli dostępna,
+oraz ścieżka czystego Pythona).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_calc_batch
+"""
+
+import random
+import time
+from datetime import date, timedelta
+
+from src.services.calc_service import CalcService, NUMPY_AVAILABLE
+
+ENTRIES = (1_000, 10_000, 50_000)
+REPEATS = 5
+
+
+def make_columns(count: int):
+    """Losowe kolumny wejściowe (ok. 10% dni wolnych, część nocnych zmian)"""
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    dates, starts, ends, breaks, types = [], [], [], [], []
+    for i in range(count):
+        dates.append((start + timedelta(days=i % 3650)).isoformat())
+        if rng.random() < 0.1:
+            starts.append(None)
+            ends.append(None)
+            breaks.append(0)
+            types.append(rng.choice(["vacation", "day_off", "sick_day"]))
+            continue
+        begin = rng.randrange(0, 24 * 60, 5)
+        length = rng.randrange(60, 11 * 60, 5)
+        end = (begin + length) % (24 * 60)
+        starts.append(f"{begin // 60:02d}:{begin % 60:02d}")
+        ends.append(f"{end // 60:02d}:{end % 60:02d}")
+        breaks.append(rng.choice([0, 15, 30, 45]))
+        types.append("work_day")
+    return dates, starts, ends, breaks, types
+
+
+def scalar(service: CalcService, columns) -> int:
+    """Pętla po calculate_work_day"""
+    total = 0
+    for row in zip(*columns):
+        result = service.calculate_work_day(*row)
+        if result.is_valid:
+            total += result.net_minutes
+    return total
+
+
+def measure(func, *args) -> float:
+    """Najlepszy czas z REPEATS uruchomień (ms)"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    service = CalcService()
+    print(f"NumPy: {'tak' if NUMPY_AVAILABLE else 'nie'}")
+    print(f"{'wpisy':>8} | {'skalarnie':>10} | {'wsad Python':>11} | {'wsad NumPy':>10}")
+    for count in ENTRIES:
+        columns = make_columns(count)
+        expected = scalar(service, columns)
+        python_total = service.calculate_work_days_batch(*columns, use_numpy=False).total_net_minutes()
+        assert python_total == expected
+        
+        old = measure(scalar, service, columns)
+        batch_py = measure(lambda: service.calculate_work_days_batch(*columns, use_numpy=False))
+        if NUMPY_AVAILABLE:
+            assert service.calculate_work_days_batch(*columns, use_numpy=True).total_net_minutes() == expected
+            batch_np = f"{measure(lambda: service.calculate_work_days_batch(*columns, use_numpy=True)):>7.2f} ms"
+        else:
+            batch_np = f"{'-':>10}"
+        print(f"{count:>8} | {old:>7.2f} ms | {batch_py:>8.2f} ms | {batch_np}")
+
+
+if __name__ == "__main__":
+    main()
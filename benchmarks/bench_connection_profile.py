@@ -0,0 +1,113 @@
+"""
+Benchmark - profile połączenia (WAL vs dziennik rollback)
+
+Mierzy:
+- opóźnienie pojedynczego zapisu z commit (insert_work_entry),
+- opóźnienie odczytu miesiąca z osobnego połączenia w trakcie
+  ciągłych zapisów w wątku tła (blokowanie czytelnika).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_connection_profile
+"""
+
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.db import Database, ConnectionProfile
+
+WRITES = 300
+READ_SECONDS = 2.0
+
+
+def entry(profile_id: int, i: int) -> dict:
+    """Wpis dla i-tego dnia (kolejne dni od 2020-01-01)"""
+    year, day = 2020 + i // 336, i % 336
+    return {
+        'profile_id': profile_id,
+        'date': f"{year:04d}-{day // 28 + 1:02d}-{day % 28 + 1:02d}",
+        'start_time': '08:00',
+        'end_time': '16:00',
+        'break_minutes': 30,
+        'day_type': 'work_day',
+        'notes': ''
+    }
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def bench_writes(db: Database, profile_id: int) -> list:
+    """Czasy (ms) pojedynczych zapisów z commit"""
+    timings = []
+    for i in range(WRITES):
+        t0 = time.perf_counter()
+        db.insert_work_entry(entry(profile_id, i))
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def bench_reader_blocking(db: Database, profile_id: int) -> tuple:
+    """Czasy (ms) odczytów miesiąca podczas zapisów w tle i liczba błędów blokady"""
+    stop = threading.Event()
+    
+    def writer():
+        writer_db = Database(str(db.db_path), db.connection_profile)
+        i = WRITES
+        while not stop.is_set():
+            writer_db.insert_work_entry(entry(profile_id, i % 3000))
+            i += 1
+        writer_db.close()
+    
+    reader = sqlite3.connect(str(db.db_path), timeout=5.0)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    
+    timings, locked = [], 0
+    deadline = time.perf_counter() + READ_SECONDS
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            reader.execute(
+                "SELECT * FROM work_entries WHERE profile_id = ? AND date >= ? AND date < ?",
+                (profile_id, '2020-03-01', '2020-04-01')
+            ).fetchall()
+        except sqlite3.OperationalError:
+            locked += 1
+        timings.append((time.perf_counter() - t0) * 1000)
+    
+    stop.set()
+    thread.join()
+    reader.close()
+    return timings, locked
+
+
+def main():
+    profiles = [
+        ("rollback (DELETE/FULL)", ConnectionProfile.rollback_journal()),
+        ("WAL (NORMAL)", ConnectionProfile.wal()),
+    ]
+    for name, profile in profiles:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(str(Path(tmpdir) / "bench.db"), profile)
+            profile_id = db.create_profile("Bench")
+            
+            writes = bench_writes(db, profile_id)
+            reads, locked = bench_reader_blocking(db, profile_id)
+            db.close()
+        
+        print(f"\n{name}")
+        print(f"  zapis:  średnio {statistics.mean(writes):.3f} ms, "
+              f"p95 {percentile(writes, 0.95):.3f} ms, max {max(writes):.3f} ms")
+        print(f"  odczyt: {len(reads)} zapytań, średnio {statistics.mean(reads):.3f} ms, "
+              f"p99 {percentile(reads, 0.99):.3f} ms, max {max(reads):.3f} ms, "
+              f"błędy blokady: {locked}")
+
+
+if __name__ == "__main__":
+    main()
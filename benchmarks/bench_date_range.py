@@ -0,0 +1,86 @@
+"""
+Benchmark - pobieranie wpisów z zakresu dat
+
+Porównuje dawną pętlę dzień po dniu (jedno zapytanie get_by_date na dzień)
+z jednym zapytaniem BETWEEN (WorkEntryRepository.get_date_range).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_date_range
+"""
+
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.db import Database
+from src.models import WorkEntry
+from src.repository import WorkEntryRepository
+
+YEARS = 5
+REPEATS = 5
+
+
+def seed(db: Database, profile_id: int, start: date, days: int) -> None:
+    """Wypełnij bazę wpisami dla dni roboczych"""
+    conn = db.get_connection()
+    rows = []
+    for i in range(days):
+        day = start + timedelta(days=i)
+        if day.weekday() < 5:
+            rows.append((profile_id, day.isoformat(), "08:00", "16:00", 30, "work_day", ""))
+    conn.executemany("""
+        INSERT INTO work_entries
+        (profile_id, date, start_time, end_time, break_minutes, day_type, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+
+
+def day_by_day(repo: WorkEntryRepository, profile_id: int, start: date, end: date):
+    """Dawna implementacja: jedno zapytanie na dzień kalendarzowy"""
+    entries = []
+    current = start
+    while current <= end:
+        entry = repo.get_by_date(profile_id, current.isoformat())
+        if entry:
+            entries.append(entry)
+        current += timedelta(days=1)
+    return entries
+
+
+def measure(func, *args) -> float:
+    """Najlepszy czas z REPEATS uruchomień (ms)"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "bench.db"))
+        profile_id = db.create_profile("Bench")
+        start = date(2020, 1, 1)
+        days = 365 * YEARS
+        seed(db, profile_id, start, days)
+        repo = WorkEntryRepository(db)
+        
+        print(f"Dane: {YEARS} lat, profil {profile_id}")
+        print(f"{'zakres':>10} | {'dzień po dniu':>14} | {'BETWEEN':>10} | {'przysp.':>8}")
+        for span in (7, 31, 365, days):
+            end = start + timedelta(days=span - 1)
+            old = measure(day_by_day, repo, profile_id, start, end)
+            new = measure(repo.get_date_range, profile_id, start.isoformat(), end.isoformat())
+            assert len(day_by_day(repo, profile_id, start, end)) == len(
+                repo.get_date_range(profile_id, start.isoformat(), end.isoformat())
+            )
+            print(f"{span:>7} dni | {old:>11.2f} ms | {new:>7.2f} ms | {old / new:>7.1f}x")
+        
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark - hydratacja modeli z wierszy bazy
+
+Porównuje dawną konwersję przez konstruktor WorkEntry(...) (z __init__
+i __post_init__) z WorkEntry.from_row, dla get_month (31 wpisów)
+i zakresu 10 000 wpisów.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_hydration
+"""
+
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.db import Database
+from src.models import WorkEntry
+from src.repository import WorkEntryRepository
+
+LARGE = 10_000
+REPEATS = 20
+
+
+def legacy_row_to_model(row) -> WorkEntry:
+    """Dawna implementacja _row_to_model (konstruktor dataclass)"""
+    return WorkEntry(
+        id=row['id'],
+        profile_id=row['profile_id'],
+        date=row['date'],
+        start_time=row['start_time'],
+        end_time=row['end_time'],
+        break_minutes=row['break_minutes'],
+        day_type=row['day_type'],
+        notes=row['notes'],
+        created_at=row['created_at'],
+        updated_at=row['updated_at'],
+        start_minute=row['start_minute'],
+        end_minute=row['end_minute'],
+        net_minutes=row['net_minutes'],
+        is_midnight_crossing=bool(row['is_midnight_crossing'])
+    )
+
+
+def measure(func, *args) -> float:
+    """Najlepszy czas z REPEATS uruchomień (ms)"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "bench.db"))
+        profile_id = db.create_profile("Bench")
+        start = date(2000, 1, 1)
+        db.insert_work_entries_many(
+            {
+                'profile_id': profile_id, 'date': (start + timedelta(days=i)).isoformat(),
+                'start_time': "08:00", 'end_time': "16:00", 'break_minutes': 30, 'day_type': "work_day"
+            }
+            for i in range(LARGE)
+        )
+        repo = WorkEntryRepository(db)
+        end = (start + timedelta(days=LARGE - 1)).isoformat()
+        
+        month_rows = db.get_work_entries_month(profile_id, 2000, 1)
+        range_rows = db.get_work_entries_range(profile_id, start.isoformat(), end)
+        
+        print(f"{'przypadek':>24} | {'konstruktor':>11} | {'from_row':>9} | {'przysp.':>7}")
+        for name, rows in (("get_month (31)", month_rows), (f"zakres ({LARGE})", range_rows)):
+            old = measure(lambda: [legacy_row_to_model(r) for r in rows])
+            new = measure(lambda: [WorkEntry.from_row(r) for r in rows])
+            print(f"{name + ' - konwersja':>24} | {old:>8.3f} ms | {new:>6.3f} ms | {old / new:>6.1f}x")
+        
+        total = measure(repo.get_month, profile_id, 2000, 1)
+        print(f"{'get_month (31) - całość':>24} | {total:>8.3f} ms (zapytanie + from_row)")
+        total = measure(repo.get_date_range, profile_id, start.isoformat(), end)
+        print(f"{'zakres - całość':>24} | {total:>8.3f} ms (zapytanie + from_row)")
+        
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark - pamięć modeli na wpis (tracemalloc)
+
+Porównuje:
+- dawny WorkEntry (dataclass z __dict__) z obecnym WorkEntry
+  (dataclass(slots=True)) i z WorkEntryRecord (krotka)
+- dawny WorkDayResult (dataclass z __dict__ i gotowymi napisami godzin)
+  z obecnym WorkDayResult (__slots__, formaty liczone leniwie)
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_model_memory
+"""
+
+import tracemalloc
+from dataclasses import dataclass, field, fields, make_dataclass
+from typing import Optional
+
+from src.models import WorkEntry, WorkEntryRecord
+from src.services.calc_service import CalcService, WorkDayResult
+
+COUNT = 10_000
+
+# Kopia dawnego WorkEntry (bez __slots__) - punkt odniesienia
+LegacyWorkEntry = make_dataclass(
+    'LegacyWorkEntry',
+    [(f.name, f.type, field(default=f.default)) for f in fields(WorkEntry)]
+)
+
+
+@dataclass
+class LegacyWorkDayResult:
+    """Kopia dawnego WorkDayResult (przed __slots__) - punkt odniesienia"""
+    date: str
+    work_minutes: int
+    work_hours_decimal: float
+    work_hours_hm: str
+    break_minutes: int
+    net_minutes: int
+    net_hours_decimal: float
+    net_hours_hm: str
+    day_type: str
+    start_time: Optional[str]
+    end_time: Optional[str]
+    is_midnight_crossing: bool
+    is_valid: bool
+    error_message: Optional[str]
+
+
+def rows(count: int):
+    """Wiersze jak z bazy (różne daty i godziny)"""
+    for i in range(count):
+        start = 6 * 60 + i % 180
+        end = start + 8 * 60 + i % 60
+        yield {
+            'id': i + 1, 'profile_id': 1, 'date': f"{2000 + i // 372}-{i // 31 % 12 + 1:02d}-{i % 31 + 1:02d}",
+            'start_time': f"{start // 60:02d}:{start % 60:02d}",
+            'end_time': f"{end // 60:02d}:{end % 60:02d}",
+            'break_minutes': 30, 'day_type': 'work_day', 'notes': '',
+            'created_at': f"2025-01-01T08:{i % 60:02d}:00.{i:06d}",
+            'updated_at': f"2025-01-01T08:{i % 60:02d}:00.{i:06d}",
+            'start_minute': start, 'end_minute': end, 'net_minutes': end - start - 30,
+            'is_midnight_crossing': False,
+        }
+
+
+def measure(build) -> float:
+    """Bajty zaalokowane na obiekt (bez danych wejściowych)"""
+    data = list(rows(COUNT))
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [build(row) for row in data]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    assert len(objects) == COUNT
+    return size / COUNT
+
+
+def legacy_result(row) -> LegacyWorkDayResult:
+    calc = CalcService
+    minutes = row['end_minute'] - row['start_minute']
+    net = minutes - row['break_minutes']
+    return LegacyWorkDayResult(
+        row['date'], minutes, calc.minutes_to_decimal_hours(minutes), calc.minutes_to_hours_hm(minutes),
+        row['break_minutes'], net, calc.minutes_to_decimal_hours(net), calc.minutes_to_hours_hm(net),
+        row['day_type'], row['start_time'], row['end_time'], False, True, None
+    )
+
+
+def slotted_result(row) -> WorkDayResult:
+    minutes = row['end_minute'] - row['start_minute']
+    return WorkDayResult(
+        row['date'], minutes, row['break_minutes'], minutes - row['break_minutes'],
+        row['day_type'], row['start_time'], row['end_time'], False, True, None
+    )
+
+
+def main():
+    print(f"{COUNT} obiektów, bajty na obiekt (tracemalloc)")
+    print(f"{'model':>22} | {'przed':>8} | {'po':>8} | {'oszczędność':>11}")
+    for name, old, new in (
+        ("WorkEntry", lambda r: LegacyWorkEntry(**r), lambda r: WorkEntry(**r)),
+        ("WorkEntryRecord", lambda r: LegacyWorkEntry(**r), lambda r: WorkEntryRecord(**r)),
+        ("WorkDayResult", legacy_result, slotted_result),
+    ):
+        before = measure(old)
+        after = measure(new)
+        print(f"{name:>22} | {before:>8.0f} | {after:>8.0f} | {1 - after / before:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,32 +4,84 @@ Prosta, działająca aplikacja z Kivy + KivyMD minimum
 """
 
 import logging
+import re
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
+from typing import Optional
+from datetime import datetime, timedelta
 from kivymd.app import MDApp
-from kivy.uix.screenmanager import ScreenManager, Screen
+from kivy.clock import Clock
+from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
+from src.ui.recycle_list import RecycleList
+from src.ui.screen_registry import LazyScreenManager
+from src.utils.lazy_import import LazyModule
+from src.ui.view_models import DashboardViewModel
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Widżety używane tylko przez część ekranów - ładowane przy budowie
+# pierwszego ekranu, który ich potrzebuje
+spinner = LazyModule('kivy.uix.spinner')
+textinput = LazyModule('kivy.uix.textinput')
+
 
 class DashboardScreen(Screen):
     def __init__(self, app, **kwargs):
         super().__init__(**kwargs)
         self.app = app
+        self._load_token = 0     # Numer bieżącego ładowania (starsze wyniki są pomijane)
+        self._view_model: Optional[DashboardViewModel] = None
+        self._data_version = None  # Wersja danych ostatnio wyświetlonych (lub ładowanych)
+        
+        # Widżety budowane raz - odświeżenie zmienia tylko ich właściwości
         self.layout = GridLayout(cols=1, spacing=10, size_hint_y=None, padding=10)
         self.layout.bind(minimum_height=self.layout.setter('height'))  # type: ignore
         
-        scroll = ScrollView(size_hint=(1, 0.85))
-        scroll.add_widget(self.layout)
+        self.layout.add_widget(Label(
+            text="🏢 Dashboard - Miesięczny Przegląd",
+            size_hint_y=None,
+            height=50,
+            font_size='16sp',
+            bold=True
+        ))
+        
+        self.stats_label = Label(
+            text="⏳ Ładowanie danych...",
+            size_hint_y=None,
+            height=140,
+            font_size='13sp',
+            markup=True,
+            color=(0.7, 0.7, 0.7, 1)
+        )
+        self.layout.add_widget(self.stats_label)
+        
+        self.layout.add_widget(Label(
+            text="📋 Ostatnie wpisy (7 dni):",
+            size_hint_y=None,
+            height=30,
+            font_size='12sp',
+            bold=True
+        ))
+        
+        # Ostatnie wpisy - lista wirtualizowana, odświeżana podmianą danych
+        self.entries_list = RecycleList(
+            row_height=25,
+            row_defaults={'font_size': '11sp', 'color': (1, 1, 1, 1)}
+        )
+        
+        content = BoxLayout(orientation='vertical', size_hint=(1, 0.85))
+        content.add_widget(self.layout)
+        content.add_widget(self.entries_list)
         
         main = BoxLayout(orientation='vertical')
-        main.add_widget(scroll)
+        main.add_widget(content)
         
         # Górny menu (odśwież + dodaj + raport)
         top_btn_layout = BoxLayout(size_hint_y=0.08, spacing=3)
@@ -52,147 +104,158 @@ class DashboardScreen(Screen):
     def refresh_data(self, instance):  # type: ignore
         """Ręczne odświeżenie danych"""
         logger.info("🔄 Odświeżanie danych...")
+        self._data_version = None
         self.on_enter()
     
+    def _current_data_version(self, today: datetime) -> tuple:
+        """Klucz wersji danych: profil, dzień oraz wersje miesięcy okna 7 dni"""
+        ctx = self.app.app_context
+        profile_id = ctx.get_current_profile_id()
+        if profile_id is None:
+            return (None,)
+        
+        week_start = today - timedelta(days=7)
+        months = {(today.year, today.month), (week_start.year, week_start.month)}
+        return (profile_id, today.date()) + tuple(
+            ctx.get_month_version(profile_id, year, month) for year, month in sorted(months)
+        )
+    
     def on_enter(self, *args):  # type: ignore
-        """Odśwież dane gdy ekran się pojawi"""
-        self.layout.clear_widgets()
+        """
+        Odśwież dane gdy ekran się pojawi
+        
+        Gdy wersja danych się nie zmieniła, widżety nie są dotykane. W przeciwnym
+        razie dane (repozytorium + podsumowanie miesiąca) są pobierane w wątku
+        roboczym, a w wątku głównym (Clock.schedule_once) aktualizowane są tylko
+        widżety zależne od zmienionych pól view-modelu. Do pierwszego
+        załadowania ekran pokazuje placeholder.
+        """
+        started = time.perf_counter()
+        version = self._current_data_version(datetime.now())
+        if version == self._data_version:
+            logger.info("⏱️ Dashboard: dane bez zmian - pominięto odświeżenie")
+            return
+        
+        self._data_version = version
+        self._load_token += 1
+        threading.Thread(
+            target=self._load_data,
+            args=(self._load_token, started),
+            name="DashboardLoader",
+            daemon=True
+        ).start()
+        logger.info(f"⏱️ Dashboard: ekran gotowy po {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    def _load_data(self, token: int, started: float) -> None:
+        """Pobierz dane dashboardu (wątek roboczy)"""
+        try:
+            data = self._fetch_data()
+        except Exception as e:
+            logger.error(f"❌ Błąd ładowania danych DashboardScreen: {e}", exc_info=True)
+            data = e
+        loaded = time.perf_counter()
+        Clock.schedule_once(lambda dt: self._render(token, data, started, loaded))
+    
+    def _fetch_data(self) -> Optional[DashboardViewModel]:
+        """
+        Zbierz dane dashboardu bez tworzenia widżetów
+        
+        Returns:
+            DashboardViewModel lub None bez profilu
+        """
+        profile = self.app.app_context.get_current_profile()
+        if not profile:
+            return None
+        
+        today = datetime.now()
+        
+        # Podsumowanie miesiąca (utrzymywane przyrostowo w AppContext)
+        repo = self.app.app_context.work_entry_repository
+        summary = self.app.app_context.get_month_summary(profile.id, today.year, today.month)
+        
+        week_start = today - timedelta(days=7)
+        week_entries = repo.get_date_range(
+            profile.id,
+            week_start.date().isoformat(),
+            today.date().isoformat()
+        )
+        return DashboardViewModel.build(
+            profile.name,
+            today.year,
+            today.month,
+            summary,
+            sorted(week_entries, key=lambda e: e.date, reverse=True)
+        )
+    
+    def _render(self, token: int, data, started: float, loaded: float) -> None:
+        """Zaktualizuj widżety zależne od zmienionych pól (wątek główny)"""
+        if token != self._load_token:
+            # W międzyczasie rozpoczęło się nowsze ładowanie
+            return
         
         try:
-            from datetime import timedelta as td
-            from datetime import timedelta as td
-            
-            # Tytuł
-            title = Label(
-                text="🏢 Dashboard - Miesięczny Przegląd",
-                size_hint_y=None,
-                height=50,
-                font_size='16sp',
-                bold=True
-            )
-            self.layout.add_widget(title)
-            
-            # Pobierz bieżący profil i miesiąc
-            profile = self.app.app_context.get_current_profile()
-            if not profile:
-                no_profile = Label(
-                    text="⚠️ Brak profilu - utwórz go w Ustawieniach",
-                    size_hint_y=None,
-                    height=50,
-                    color=(1, 0.5, 0, 1)
-                )
-                self.layout.add_widget(no_profile)
+            if isinstance(data, Exception):
+                raise data
+            
+            if data is None:
+                self._view_model = None
+                self.stats_label.text = "⚠️ Brak profilu - utwórz go w Ustawieniach"
+                self.stats_label.color = (1, 0.5, 0, 1)
+                self.entries_list.clear()
                 return
-                
-            today = datetime.now()
-            
-            # Pobierz wpisy z miesiąca
-            from src.repository import WorkEntryRepository
-            repo = WorkEntryRepository(self.app.app_context.database)
-            entries = repo.get_month(profile.id, today.year, today.month)
-            
-            # Oblicz statystyki
-            from src.services.calc_service import CalcService
-            calc = self.app.app_context.calc_service
-            
-            if entries:
-                # Konwertuj do WorkDayResult
-                results = []
-                for entry in entries:
-                    result = calc.calculate_work_day(
-                        date=entry.date,
-                        start_time=entry.start_time,
-                        end_time=entry.end_time,
-                        break_minutes=entry.break_minutes,
-                        day_type=entry.day_type
-                    )
-                    if result.success:
-                        results.append(result)
-                
-                # Podsumowanie miesiąca
-                summary = calc.calculate_month_summary(results)
-                
-                # Wyświetl statystyki
-                fmt = self.app.app_context.formatters
-                
-                stat_info = (
-                    f"👤 {profile.name}\n"
-                    f"📅 {fmt.format_month_year(today.year, today.month)}\n\n"
-                    f"⏰ Łączne godziny: {fmt.format_duration_hm(summary.total_work_hours_decimal)}\n"
-                    f"📊 Średnia dzienna: {fmt.format_duration_decimal(summary.average_daily_hours)}h\n"
-                    f"📝 Dni z wpisami: {len(summary.days_with_entries)}\n"
-                    f"🏥 Dni choroby: {summary.sick_days} | "
-                    f"🏖️ Urlop: {summary.vacation_days} | "
-                    f"❌ Wolne: {summary.day_offs}"
-                )
-            else:
-                fmt = self.app.app_context.formatters
-                stat_info = (
-                    f"👤 {profile.name}\n"
-                    f"📅 {fmt.format_month_year(today.year, today.month)}\n\n"
-                    "Brak wpisów w tym miesiącu"
-                )
-            
-            stats = Label(
-                text=stat_info,
-                size_hint_y=None,
-                height=140,
-                font_size='13sp',
-                markup=True
-            )
-            self.layout.add_widget(stats)
-            
-            # Ostatnie wpisy (7 dni)
-            recent_header = Label(
-                text="📋 Ostatnie wpisy (7 dni):",
-                size_hint_y=None,
-                height=30,
-                font_size='12sp',
-                bold=True
-            )
-            self.layout.add_widget(recent_header)
-            
-            week_start = today - td(days=7)
-            week_entries = repo.get_date_range(
-                profile.id,
-                week_start.date().isoformat(),
-                today.date().isoformat()
-            )
             
-            if week_entries:
-                for entry in sorted(week_entries, key=lambda e: e.date, reverse=True)[:10]:
-                    entry_text = (
-                        f"📅 {entry.date} | "
-                        f"{entry.day_type.upper():<10} | "
-                        f"{entry.start_time}-{entry.end_time}"
-                    )
-                    entry_label = Label(
-                        text=entry_text,
-                        size_hint_y=None,
-                        height=25,
-                        font_size='11sp'
-                    )
-                    self.layout.add_widget(entry_label)
-            else:
-                no_recent = Label(
-                    text="Brak wpisów w ostatnich 7 dniach",
-                    size_hint_y=None,
-                    height=25,
-                    font_size='11sp',
-                    color=(0.7, 0.7, 0.7, 1)
-                )
-                self.layout.add_widget(no_recent)
+            changed = data.changed_fields(self._view_model)
+            if changed - {'recent_entries'}:
+                self.stats_label.text = self._stats_text(data)
+                self.stats_label.color = (1, 1, 1, 1)
+            if 'recent_entries' in changed:
+                self._set_recent_entries(data)
+            self._view_model = data
             
         except Exception as e:
             logger.error(f"❌ Błąd w DashboardScreen: {e}", exc_info=True)
-            error_label = Label(
-                text=f"⚠️ Błąd: {str(e)}",
-                size_hint_y=None,
-                height=100,
-                color=(1, 0, 0, 1),
-                font_size='12sp'
+            self._view_model = None
+            self._data_version = None
+            self.stats_label.text = f"⚠️ Błąd: {str(e)}"
+            self.stats_label.color = (1, 0, 0, 1)
+            self.entries_list.clear()
+        finally:
+            rendered = time.perf_counter()
+            logger.info(
+                f"⏱️ Dashboard: dane {(loaded - started) * 1000:.1f} ms (wątek roboczy), "
+                f"render {(rendered - loaded) * 1000:.1f} ms"
             )
-            self.layout.add_widget(error_label)
+    
+    def _stats_text(self, vm: DashboardViewModel) -> str:
+        """Tekst statystyk miesiąca"""
+        fmt = self.app.app_context.formatters
+        header = (
+            f"👤 {vm.profile_name}\n"
+            f"📅 {fmt.format_month_year(vm.year, vm.month)}\n\n"
+        )
+        if not vm.days_with_entries:
+            return header + "Brak wpisów w tym miesiącu"
+        return header + (
+            f"⏰ Łączne godziny: {fmt.format_duration_hm(vm.total_work_hours_decimal)}\n"
+            f"📊 Średnia dzienna: {fmt.format_duration_decimal(vm.average_daily_hours)}h\n"
+            f"📝 Dni z wpisami: {vm.days_with_entries}\n"
+            f"🏥 Dni choroby: {vm.sick_days} | "
+            f"🏖️ Urlop: {vm.vacation_days} | "
+            f"❌ Wolne: {vm.day_offs}"
+        )
+    
+    def _set_recent_entries(self, vm: DashboardViewModel) -> None:
+        """Podmień dane listy ostatnich wpisów"""
+        if vm.recent_entries:
+            self.entries_list.set_texts(
+                f"📅 {date} | {day_type.upper():<10} | {start}-{end}"
+                for date, day_type, start, end in vm.recent_entries
+            )
+        else:
+            self.entries_list.set_rows([{
+                'text': "Brak wpisów w ostatnich 7 dniach",
+                'color': (0.7, 0.7, 0.7, 1)
+            }])
 
 
 class EntryScreen(Screen):
@@ -200,9 +263,6 @@ class EntryScreen(Screen):
         super().__init__(**kwargs)
         self.app = app
         
-        from kivy.uix.textinput import TextInput
-        from kivy.uix.spinner import Spinner
-        
         main = BoxLayout(orientation='vertical', spacing=10, padding=10)
         
         # Tytuł
@@ -222,7 +282,7 @@ class EntryScreen(Screen):
         
         # Data
         form.add_widget(Label(text="📅 Data:", size_hint_y=None, height=40))
-        self.date_input = TextInput(
+        self.date_input = textinput.TextInput(
             text=datetime.now().strftime('%Y-%m-%d'),
             multiline=False,
             size_hint_y=None,
@@ -233,7 +293,7 @@ class EntryScreen(Screen):
         
         # Czas początkowy
         form.add_widget(Label(text="⏰ Początek:", size_hint_y=None, height=40))
-        self.start_input = TextInput(
+        self.start_input = textinput.TextInput(
             text="08:00",
             multiline=False,
             size_hint_y=None,
@@ -244,7 +304,7 @@ class EntryScreen(Screen):
         
         # Czas końcowy
         form.add_widget(Label(text="🛑 Koniec:", size_hint_y=None, height=40))
-        self.end_input = TextInput(
+        self.end_input = textinput.TextInput(
             text="16:00",
             multiline=False,
             size_hint_y=None,
@@ -255,7 +315,7 @@ class EntryScreen(Screen):
         
         # Przerwa
         form.add_widget(Label(text="☕ Przerwa (min):", size_hint_y=None, height=40))
-        self.break_input = TextInput(
+        self.break_input = textinput.TextInput(
             text="30",
             multiline=False,
             size_hint_y=None,
@@ -267,7 +327,7 @@ class EntryScreen(Screen):
         
         # Typ dnia (Spinner/Dropdown)
         form.add_widget(Label(text="📌 Typ dnia:", size_hint_y=None, height=40))
-        self.type_spinner = Spinner(
+        self.type_spinner = spinner.Spinner(
             text="work",
             values=("work", "sick_day", "vacation", "day_off"),
             size_hint_y=None,
@@ -296,9 +356,6 @@ class EntryScreen(Screen):
         """Zapisz wpis do bazy"""
         try:
             from src.models import WorkEntry
-            from src.repository import WorkEntryRepository
-            from datetime import datetime as dt
-            import re
             
             profile = self.app.app_context.get_current_profile()
             if not profile:
@@ -316,7 +373,7 @@ class EntryScreen(Screen):
             
             # Walidacja formatu daty
             try:
-                dt.strptime(date_str, '%Y-%m-%d')
+                datetime.strptime(date_str, '%Y-%m-%d')
             except ValueError:
                 raise ValueError("❌ Niepoprawny format daty (użyj YYYY-MM-DD)")
             
@@ -354,10 +411,13 @@ class EntryScreen(Screen):
                 notes=""
             )
             
-            repo = WorkEntryRepository(self.app.app_context.database)
-            repo.create(entry)
+            # Zapis w tle - ekran nie czeka na COMMIT
+            future = self.app.app_context.save_entry_async(entry)
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self.on_entry_saved(f, entry))
+            )
             
-            logger.info(f"✅ Wpis zapisany: {entry.date} ({entry.start_time}-{entry.end_time}) [{day_type}]")
+            logger.info(f"⏳ Wpis w kolejce zapisu: {entry.date} ({entry.start_time}-{entry.end_time}) [{day_type}]")
             
             # Wróć do dashboard
             setattr(self.app.sm, 'current', 'dashboard')
@@ -370,6 +430,17 @@ class EntryScreen(Screen):
             logger.error(f"❌ Błąd zapisu: {e}", exc_info=True)
             self.show_error(f"❌ Błąd: {str(e)}")
     
+    def on_entry_saved(self, future, entry) -> None:
+        """Uzgodnij UI po zakończeniu zapisu w tle (wątek główny)"""
+        error = future.exception()
+        if error is not None:
+            self.show_error(f"❌ Błąd zapisu {entry.date}: {error}")
+            return
+        
+        logger.info(f"✅ Wpis zapisany: {entry.date} ({entry.start_time}-{entry.end_time}) [{entry.day_type}]")
+        if self.app.sm.current == 'dashboard':
+            self.app.sm.get_screen('dashboard').on_enter()
+    
     def show_error(self, msg: str):
         """Pokaż komunikat błędu"""
         logger.error(f"Błąd UI: {msg}")
@@ -379,8 +450,6 @@ class ReportScreen(Screen):
     def __init__(self, app, **kwargs):
         super().__init__(**kwargs)
         self.app = app
-        from kivy.uix.spinner import Spinner
-        from datetime import datetime
         
         main = BoxLayout(orientation='vertical', spacing=10, padding=10)
         
@@ -401,7 +470,7 @@ class ReportScreen(Screen):
         date_layout.add_widget(Label(text="Rok:", size_hint_y=None, height=50))
         current_year = datetime.now().year
         years = [str(y) for y in range(current_year - 2, current_year + 1)]
-        self.year_spinner = Spinner(
+        self.year_spinner = spinner.Spinner(
             text=str(current_year),
             values=years,
             size_hint_y=None,
@@ -417,7 +486,7 @@ class ReportScreen(Screen):
         month_layout.add_widget(Label(text="Miesiąc:", size_hint_y=None, height=50))
         current_month = datetime.now().month
         months = [str(m).zfill(2) for m in range(1, 13)]
-        self.month_spinner = Spinner(
+        self.month_spinner = spinner.Spinner(
             text=str(current_month).zfill(2),
             values=months,
             size_hint_y=None,
@@ -560,7 +629,6 @@ class ProfileScreen(Screen):
     def __init__(self, app, **kwargs):
         super().__init__(**kwargs)
         self.app = app
-        from kivy.uix.textinput import TextInput
         
         main = BoxLayout(orientation='vertical', spacing=10, padding=10)
         
@@ -618,7 +686,7 @@ class ProfileScreen(Screen):
         # Input dla nowej nazwy
         form_layout = GridLayout(cols=2, spacing=5, size_hint_y=None, height=50, padding=5)
         form_layout.add_widget(Label(text="Nazwa:", size_hint_y=None, height=50))
-        self.new_profile_input = TextInput(
+        self.new_profile_input = textinput.TextInput(
             text="Nowy Profil",
             multiline=False,
             size_hint_y=None,
@@ -649,7 +717,6 @@ class ProfileScreen(Screen):
         """Utwórz nowy profil"""
         try:
             from src.models import Profile
-            from src.repository import ProfileRepository
             
             name = self.new_profile_input.text.strip()
             if not name:
@@ -662,14 +729,23 @@ class ProfileScreen(Screen):
                 created_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             )
             
-            repo = ProfileRepository(self.app.app_context.database)
-            repo.create(profile)
-            
-            logger.info(f"✅ Profil '{name}' został utworzony")
+            # Zapis w tle - wątek UI nie pisze do bazy bezpośrednio
+            future = self.app.app_context.create_profile_async(profile)
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self.on_profile_created(f, name))
+            )
             self.new_profile_input.text = ""
             
         except Exception as e:
             logger.error(f"❌ Błąd tworzenia profilu: {e}", exc_info=True)
+    
+    def on_profile_created(self, future, name) -> None:
+        """Zaloguj wynik utworzenia profilu (wątek główny)"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"❌ Błąd tworzenia profilu: {error}")
+            return
+        logger.info(f"✅ Profil '{name}' został utworzony")
 
 
 class ThemeScreen(Screen):
@@ -768,6 +844,12 @@ class ThemeScreen(Screen):
 
 
 class WorkHoursApp(MDApp):
+    # Ekran -> ekran budowany z wyprzedzeniem po wejściu na niego
+    SCREEN_PREFETCH = {
+        'dashboard': 'entry',
+        'settings': 'profile',
+    }
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.app_context = None
@@ -791,21 +873,21 @@ class WorkHoursApp(MDApp):
         title = Label(text="🏢 WorkHours - Ewidencja Godzin", size_hint_y=0.08, font_size='16sp', bold=True)
         main.add_widget(title)
         
-        # Screen Manager
-        self.sm = ScreenManager()
+        # Screen Manager - ekrany budowane przy pierwszym wejściu,
+        # prawdopodobny następny ekran budowany w wolnej chwili
+        self.sm = LazyScreenManager(prefetch=self.SCREEN_PREFETCH)
         
-        # Dodaj ekrany
         screens = [
-            ('dashboard', DashboardScreen(self, name='dashboard')),
-            ('entry', EntryScreen(self, name='entry')),
-            ('report', ReportScreen(self, name='report')),
-            ('settings', SettingsScreen(self, name='settings')),
-            ('profile', ProfileScreen(self, name='profile')),
-            ('theme', ThemeScreen(self, name='theme')),
+            ('dashboard', DashboardScreen),
+            ('entry', EntryScreen),
+            ('report', ReportScreen),
+            ('settings', SettingsScreen),
+            ('profile', ProfileScreen),
+            ('theme', ThemeScreen),
         ]
         
-        for name, screen in screens:
-            self.sm.add_widget(screen)
+        for name, screen_cls in screens:
+            self.sm.register(name, lambda cls=screen_cls, n=name: cls(self, name=n))
         
         self.sm.current = 'dashboard'
         main.add_widget(self.sm)
@@ -825,6 +907,8 @@ class WorkHoursApp(MDApp):
     def on_stop(self) -> None:
         logger.info("Zamykanie...")
         if self.app_context:
+            # Dokończ zapisy z kolejki przed zamknięciem bazy
+            self.app_context.flush_writes()
             self.app_context.shutdown()
 
 
@@ -3,9 +3,16 @@ AppContext - Singleton aplikacji
 Centralne miejsce dla wszystkich serwisów i konfiguracji
 """
 
-from typing import Optional
-from src.db import Database
-from src.services.calc_service import CalcService
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from src.db import Database, WriteBehindQueue
+from src.models import Profile
+from src.repository import ProfileRepository, UnitOfWork, WorkEntryRepository
+from src.services.calc_service import (
+    CalcService, IncrementalMonthSummary, MonthSummary, WorkDayResult
+)
 from src.utils.validators import Validators
 from src.utils.formatters import Formatters
 import logging
@@ -22,10 +29,22 @@ class AppContext:
     - Serwisy (CalcService, etc.)
     - Obecny profil użytkownika
     - Konfigurację aplikacji
+    
+    Wątek UI nie zapisuje do bazy bezpośrednio: zapisy z ekranów idą przez
+    write_queue (save_entry_async, create_profile_async, delete_profile_async,
+    submit_write). Kolejka trzyma połączenie zapisujące przez całą serię
+    zadań, więc synchroniczny zapis z wątku głównego czekałby na nią
+    i blokował UI.
     """
     
     _instance: Optional['AppContext'] = None
     
+    # Co ile zmian przyrostowych podsumowanie jest weryfikowane pełnym przeliczeniem
+    SUMMARY_VERIFY_INTERVAL = 50
+    
+    # Liczba miesięcy w cache współdzielonego repozytorium wpisów
+    MONTH_CACHE_SIZE = 12
+    
     def __init__(self, db_path: str = "workhours_app.db"):
         """
         Inicjalizuj AppContext
@@ -34,10 +53,35 @@ class AppContext:
             db_path: Ścieżka do bazy danych
         """
         self.database = Database(db_path)
-        self.calc_service = CalcService()
+        self.calc_service = CalcService(self.database)
         self.validators = Validators()
         self.formatters = Formatters()
         
+        # Współdzielone repozytorium wpisów z cache miesięcy - ekrany zapisują
+        # i czytają przez nie, więc cache jest unieważniany przy każdym zapisie
+        self.work_entry_repository = WorkEntryRepository(
+            self.database,
+            cache_size=self.MONTH_CACHE_SIZE
+        )
+        
+        # Zapisy z ekranów wykonywane w tle (serie łączone w jedną transakcję);
+        # jedyna droga zapisu z wątku UI
+        self.write_queue = WriteBehindQueue(self.database)
+        
+        # Przyrostowe podsumowania miesięcy: (profile_id, rok, miesiąc) -> stan
+        self._month_summaries: Dict[Tuple[int, int, int], IncrementalMonthSummary] = {}
+        self._summaries_lock = threading.Lock()
+        
+        # Miesiące z zapisami w kolejce: (profile_id, rok, miesiąc) -> liczba
+        self._pending_months: Dict[Tuple[int, int, int], int] = {}
+        
+        # Wersje danych miesięcy (rosnący licznik) - ekrany pomijają odświeżenie,
+        # gdy wersja się nie zmieniła
+        self._version_counter = 0
+        self._month_versions: Dict[Tuple[int, int, int], int] = {}
+        self._profile_versions: Dict[int, int] = {}
+        self._global_version = 0
+        
         # Obecny profil (domyślnie pierwszy)
         self.current_profile_id: Optional[int] = None
         self._load_default_profile()
@@ -63,6 +107,7 @@ class AppContext:
     def reset(cls) -> None:
         """Zresetuj singleton (dla testów)"""
         if cls._instance:
+            cls._instance.write_queue.close()
             cls._instance.database.close()
             cls._instance = None
     
@@ -96,6 +141,13 @@ class AppContext:
         """Pobierz ID obecnego profilu"""
         return self.current_profile_id
     
+    def get_current_profile(self) -> Optional[Profile]:
+        """Pobierz obecny profil (None jeśli brak)"""
+        if self.current_profile_id:
+            row = self.database.get_profile(self.current_profile_id)
+            return Profile.from_row(row) if row else None
+        return None
+    
     def get_current_profile_name(self) -> str:
         """Pobierz nazwę obecnego profilu"""
         if self.current_profile_id:
@@ -103,9 +155,258 @@ class AppContext:
             return profile['name'] if profile else "Unknown"
         return "Unknown"
     
+    # ═══════════════════════════════════════════════════════════════════════
+    # PODSUMOWANIA MIESIĘCY (PRZYROSTOWE)
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def _entry_result(self, entry: Any) -> WorkDayResult:
+        """Oblicz wynik dnia dla wpisu (WorkEntry lub słownik z bazy)"""
+        data = entry.to_dict() if hasattr(entry, 'to_dict') else entry
+        return self.calc_service.calculate_work_day(
+            date=data['date'],
+            start_time=data.get('start_time') or None,
+            end_time=data.get('end_time') or None,
+            break_minutes=data.get('break_minutes') or 0,
+            day_type=data.get('day_type', CalcService.WORK_DAY)
+        )
+    
+    def _month_results(self, profile_id: int, year: int, month: int) -> Iterator[WorkDayResult]:
+        """Wyniki wszystkich dni miesiąca prosto z bazy"""
+        for row in self.database.get_work_entries_month(profile_id, year, month):
+            yield self._entry_result(row)
+    
+    @staticmethod
+    def _summary_key(entry: Any) -> Tuple[int, int, int]:
+        data = entry.to_dict() if hasattr(entry, 'to_dict') else entry
+        return data['profile_id'], int(data['date'][:4]), int(data['date'][5:7])
+    
+    def get_month_summary(self, profile_id: int, year: int, month: int) -> MonthSummary:
+        """
+        Pobierz podsumowanie miesiąca
+        
+        Pierwsze wywołanie liczy miesiąc z bazy; kolejne korzystają ze stanu
+        utrzymywanego przez apply_entry_change. Co SUMMARY_VERIFY_INTERVAL
+        zmian stan jest weryfikowany pełnym przeliczeniem. Podsumowanie
+        miesiąca z oczekującymi zapisami w tle jest liczone, ale nie
+        zapamiętywane (zapis zostanie doliczony dopiero po COMMIT), a jego
+        weryfikacja czeka na uzgodnienie wszystkich zapisów - baza może już
+        zawierać zapis, którego apply_entry_change jeszcze nie doliczyło.
+        
+        Args:
+            profile_id: ID profilu
+            year: Rok
+            month: Miesiąc
+            
+        Returns:
+            Podsumowanie miesiąca
+        """
+        key = (profile_id, year, month)
+        with self._summaries_lock:
+            summary = self._month_summaries.get(key)
+            if summary is None:
+                summary = IncrementalMonthSummary(year, month)
+                summary.update(self._month_results(profile_id, year, month))
+                summary.changes_since_verify = 0
+                if key in self._pending_months:
+                    return summary.to_summary()
+                self._month_summaries[key] = summary
+            elif (summary.changes_since_verify >= self.SUMMARY_VERIFY_INTERVAL
+                    and key not in self._pending_months):
+                summary.verify(self._month_results(profile_id, year, month))
+            return summary.to_summary()
+    
+    def apply_entry_change(self, old_entry: Any = None, new_entry: Any = None) -> None:
+        """
+        Zastosuj zmianę wpisu do podsumowań miesięcy (O(1))
+        i indeksu zakresów dat (O(log n))
+        
+        Args:
+            old_entry: Poprzednia wersja wpisu (None dla nowego wpisu)
+            new_entry: Nowa wersja wpisu (None dla usunięcia)
+        """
+        old_result = self._entry_result(old_entry) if old_entry is not None else None
+        new_result = self._entry_result(new_entry) if new_entry is not None else None
+        
+        with self._summaries_lock:
+            if old_result is not None:
+                key = self._summary_key(old_entry)
+                summary = self._month_summaries.get(key)
+                if summary is not None:
+                    summary.remove(old_result)
+                self._month_versions[key] = self._next_version()
+            if new_result is not None:
+                key = self._summary_key(new_entry)
+                summary = self._month_summaries.get(key)
+                if summary is not None:
+                    summary.add(new_result)
+                self._month_versions[key] = self._next_version()
+        
+        if old_result is not None:
+            self.calc_service.apply_range_change(self._summary_key(old_entry)[0], old=old_result)
+        if new_result is not None:
+            self.calc_service.apply_range_change(self._summary_key(new_entry)[0], new=new_result)
+    
+    def invalidate_month_summaries(self, profile_id: Optional[int] = None) -> None:
+        """
+        Porzuć przechowywane podsumowania, indeks zakresów i cache miesięcy
+        (np. po operacjach masowych)
+        
+        Args:
+            profile_id: Tylko dla tego profilu (None - wszystkie)
+        """
+        self.calc_service.invalidate_range_index(profile_id)
+        self.work_entry_repository.invalidate_cache(profile_id)
+        with self._summaries_lock:
+            if profile_id is None:
+                self._month_summaries.clear()
+                self._global_version = self._next_version()
+            else:
+                for key in [k for k in self._month_summaries if k[0] == profile_id]:
+                    del self._month_summaries[key]
+                self._profile_versions[profile_id] = self._next_version()
+    
+    def _next_version(self) -> int:
+        # Wywoływane pod _summaries_lock
+        self._version_counter += 1
+        return self._version_counter
+    
+    def get_month_version(self, profile_id: int, year: int, month: int) -> int:
+        """
+        Wersja danych miesiąca
+        
+        Rośnie przy każdej zmianie wpisów miesiąca przez apply_entry_change
+        (także po zapisie w tle) i przy unieważnieniu podsumowań. Ta sama
+        wersja oznacza, że dane miesiąca nie zmieniły się od poprzedniego
+        odczytu.
+        
+        Args:
+            profile_id: ID profilu
+            year: Rok
+            month: Miesiąc
+            
+        Returns:
+            Numer wersji
+        """
+        with self._summaries_lock:
+            return max(
+                self._month_versions.get((profile_id, year, month), 0),
+                self._profile_versions.get(profile_id, 0),
+                self._global_version
+            )
+    
+    @contextmanager
+    def unit_of_work(self) -> Iterator[UnitOfWork]:
+        """
+        Jednostka pracy na współdzielonych repozytoriach (jeden COMMIT)
+        
+        Po zakończeniu (także po wycofaniu) podsumowania, indeks zakresów
+        i cache miesięcy są unieważniane - operacje zbiorcze nie przechodzą
+        przez apply_entry_change.
+        """
+        try:
+            with UnitOfWork(self.database, work_entries=self.work_entry_repository) as uow:
+                yield uow
+        finally:
+            self.invalidate_month_summaries()
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # ZAPISY W TLE
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def save_entry_async(self, entry: Any) -> Future:
+        """
+        Zapisz (utwórz lub nadpisz) wpis w tle
+        
+        Zapis trafia do kolejki zapisów; po COMMIT podsumowania, indeks
+        zakresów i cache miesiąca są uzgadniane ze zmianą.
+        
+        Args:
+            entry: WorkEntry do zapisania
+            
+        Returns:
+            Future z poprzednią wersją wpisu (None dla nowego wpisu)
+        """
+        repo = self.work_entry_repository
+        key = self._summary_key(entry)
+        
+        def write():
+            previous = repo.get_by_date(entry.profile_id, entry.date)
+            repo.create(entry)
+            return previous
+        
+        def reconcile(future: Future) -> None:
+            try:
+                # Odczyt w trakcie transakcji mógł zapisać w cache stan sprzed COMMIT
+                repo.invalidate_cache(*key)
+                if future.exception() is None:
+                    self.apply_entry_change(future.result(), entry)
+            finally:
+                self._release_pending_month(key)
+        
+        with self._summaries_lock:
+            self._pending_months[key] = self._pending_months.get(key, 0) + 1
+        try:
+            future = self.write_queue.submit(write)
+        except Exception:
+            self._release_pending_month(key)
+            raise
+        future.add_done_callback(reconcile)
+        return future
+    
+    def submit_write(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Zleć dowolny zapis do kolejki zapisów (zamiast zapisu z wątku UI)
+        
+        Args:
+            fn: Funkcja zapisu wywoływana w wątku zapisów, w transakcji
+            *args, **kwargs: Argumenty funkcji
+            
+        Returns:
+            Future z wynikiem fn (ustawiany po COMMIT)
+        """
+        return self.write_queue.submit(fn, *args, **kwargs)
+    
+    def create_profile_async(self, profile: Profile) -> Future:
+        """
+        Utwórz profil w tle
+        
+        Args:
+            profile: Profil do utworzenia
+            
+        Returns:
+            Future z ID nowego profilu
+        """
+        return self.write_queue.submit(ProfileRepository(self.database).create, profile)
+    
+    def delete_profile_async(self, profile_id: int) -> Future:
+        """
+        Usuń profil (z wpisami) w tle; po COMMIT podsumowania profilu
+        są unieważniane
+        
+        Args:
+            profile_id: ID profilu
+            
+        Returns:
+            Future z wynikiem usuwania (True jeśli usunięto)
+        """
+        future = self.write_queue.submit(ProfileRepository(self.database).delete, profile_id)
+        future.add_done_callback(lambda f: self.invalidate_month_summaries(profile_id))
+        return future
+    
+    def _release_pending_month(self, key: Tuple[int, int, int]) -> None:
+        with self._summaries_lock:
+            remaining = self._pending_months.pop(key) - 1
+            if remaining:
+                self._pending_months[key] = remaining
+    
+    def flush_writes(self) -> None:
+        """Poczekaj na zakończenie wszystkich zleconych zapisów w tle"""
+        self.write_queue.flush()
+    
     def shutdown(self) -> None:
-        """Zamknij AppContext i zasoby"""
+        """Zamknij AppContext i zasoby (po wykonaniu oczekujących zapisów)"""
         logger.info("Zamykanie AppContext...")
+        self.write_queue.close()
         if self.database:
             self.database.close()
         AppContext._instance = None
@@ -1,5 +1,6 @@
 """Database module"""
-from .database import Database
-from .migrations import MigrationRunner
+from .database import Database, ConnectionProfile
+from .migrations import MigrationRunner, backfill
+from .write_queue import WriteBehindQueue
 
-__all__ = ['Database', 'MigrationRunner']
+__all__ = ['Database', 'ConnectionProfile', 'MigrationRunner', 'backfill', 'WriteBehindQueue']
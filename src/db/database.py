@@ -2,140 +2,353 @@
 Database - Warstwa dostępu do danych SQLite
 """
 
+import hashlib
 import sqlite3
+from itertools import groupby, islice
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Iterator
 from datetime import datetime
 import logging
 
+from .entry_minutes import entry_minutes, time_minutes
+from .migrations import MigrationRunner
+from .pool import ConnectionPool
+
 logger = logging.getLogger(__name__)
 
 
+def _sql_net_minutes(date, start_time, end_time, break_minutes, day_type) -> Optional[int]:
+    """Funkcja SQL wh_net_minutes(): minuty netto poprawnego wpisu lub NULL"""
+    return entry_minutes(date, start_time, end_time, break_minutes, day_type)[2]
+
+
+def _sql_midnight_crossing(date, start_time, end_time, break_minutes, day_type) -> int:
+    """Funkcja SQL wh_midnight_crossing(): 1 gdy zmiana przechodzi przez północ"""
+    return int(entry_minutes(date, start_time, end_time, break_minutes, day_type)[3])
+
+
+def prepare_connection(conn: sqlite3.Connection) -> None:
+    """
+    Przygotuj połączenie do pracy ze schematem aplikacji
+    
+    - rejestruje funkcje wh_*() liczące wartości minutowe (entry_minutes,
+      te same zasady co CalcService) - używane przez migracje wypełniające
+      kolumny
+    - włącza recursive_triggers, aby INSERT OR REPLACE uruchamiał trigger
+      DELETE dla zastępowanego wiersza
+    """
+    conn.create_function("wh_net_minutes", 5, _sql_net_minutes, deterministic=True)
+    conn.create_function("wh_midnight_crossing", 5, _sql_midnight_crossing, deterministic=True)
+    conn.create_function("wh_time_minutes", 1, time_minutes, deterministic=True)
+    conn.execute("PRAGMA recursive_triggers = ON")
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """
+    Ustawienia PRAGMA stosowane przy otwieraniu połączenia
+    
+    Wartość None oznacza pozostawienie domyślnego ustawienia SQLite.
+    Domyślny profil (WAL) pozwala UI czytać podczas zapisu w tle,
+    a synchronous=NORMAL nie wymusza pełnego fsync przy każdym commit.
+    """
+    journal_mode: Optional[str] = "WAL"
+    synchronous: Optional[str] = "NORMAL"
+    temp_store: Optional[str] = "MEMORY"
+    mmap_size: Optional[int] = 32 * 1024 * 1024   # bajty
+    cache_size: Optional[int] = -8000              # ujemne = KiB (~8 MB)
+    foreign_keys: bool = True
+    timeout: float = 5.0                           # oczekiwanie na blokadę (s)
+    
+    @classmethod
+    def wal(cls) -> 'ConnectionProfile':
+        """Profil domyślny: WAL + synchronous=NORMAL"""
+        return cls()
+    
+    @classmethod
+    def rollback_journal(cls) -> 'ConnectionProfile':
+        """Klasyczny dziennik rollback z pełnym fsync (dawne zachowanie)"""
+        return cls(
+            journal_mode="DELETE",
+            synchronous="FULL",
+            temp_store=None,
+            mmap_size=None,
+            cache_size=None
+        )
+    
+    def pragmas(self) -> List[Tuple[str, Any]]:
+        """Zwróć listę (nazwa, wartość) PRAGMA do ustawienia"""
+        values = [
+            ('journal_mode', self.journal_mode),
+            ('synchronous', self.synchronous),
+            ('temp_store', self.temp_store),
+            ('mmap_size', self.mmap_size),
+            ('cache_size', self.cache_size),
+            ('foreign_keys', 'ON' if self.foreign_keys else 'OFF'),
+        ]
+        return [(name, value) for name, value in values if value is not None]
+    
+    def apply(self, conn: sqlite3.Connection) -> None:
+        """Ustaw PRAGMA na połączeniu"""
+        for name, value in self.pragmas():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+
 class Database:
     """
     Wrapper dla bazy danych SQLite
     
     Zarządza:
-    - Połączeniami z bazą
+    - Połączeniami z bazą (pula: jeden writer + czytelnicy per wątek)
     - Schematem bazy danych
     - Operacjami CRUD
     - Transakcjami
     """
     
-    def __init__(self, db_path: str = "workhours_app.db"):
+    # Wersja schematu bazowego (tabele tworzone w _bootstrap_schema). Schemat
+    # bazowy się nie zmienia - zmiany idą przez migracje, a wersja bazy to
+    # skrót SCHEMA_BASE_VERSION i odcisku migracji, zapisany w PRAGMA
+    # user_version.
+    SCHEMA_BASE_VERSION = 1
+    
+    def __init__(
+        self,
+        db_path: str = "workhours_app.db",
+        connection_profile: Optional[ConnectionProfile] = None,
+        readers: int = 2
+    ):
         """
         Inicjalizuj bazę danych
         
         Args:
             db_path: Ścieżka do pliku bazy danych
+            connection_profile: Ustawienia PRAGMA połączenia
+                (domyślnie ConnectionProfile.wal())
+            readers: Liczba połączeń tylko do odczytu w puli
         """
         self.db_path = Path(db_path)
-        self.connection: Optional[sqlite3.Connection] = None
+        self.connection_profile = connection_profile or ConnectionProfile.wal()
+        self._pool = ConnectionPool(
+            self.db_path,
+            self.connection_profile,
+            readers,
+            on_connect=prepare_connection
+        )
+        self._transaction_depth = 0   # Zmieniany tylko pod blokadą writera
         self.initialize()
     
+    @classmethod
+    def target_schema_version(cls) -> int:
+        """
+        Wersja schematu oczekiwana przez aplikację (bez dostępu do bazy)
+        
+        Identyfikuje zestaw migracji, a nie ich liczbę: dodanie, zmiana
+        nazwy lub edycja pliku migracji daje inną wersję, więc baza przechodzi
+        pełną inicjalizację (z weryfikacją sum kontrolnych).
+        
+        Returns:
+            Dodatnia liczba 31-bitowa (0 w PRAGMA user_version - brak wersji)
+        """
+        digest = hashlib.sha256(
+            f"{cls.SCHEMA_BASE_VERSION}:{MigrationRunner.fingerprint()}".encode('ascii')
+        ).digest()
+        return int.from_bytes(digest[:4], 'big') & 0x7FFFFFFF or 1
+    
+    def get_schema_version(self) -> int:
+        """Wersja schematu zapisana w bazie (PRAGMA user_version, 0 - brak)"""
+        with self._pool.reader() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+    
     def initialize(self) -> None:
-        """Inicjalizuj schemat bazy danych"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        """
+        Inicjalizuj schemat bazy danych
         
-        try:
-            # Tabela profili
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS profiles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Tabela wpisów pracy
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS work_entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    profile_id INTEGER NOT NULL,
-                    date TEXT NOT NULL,
-                    start_time TEXT,
-                    end_time TEXT,
-                    break_minutes INTEGER DEFAULT 0,
-                    day_type TEXT DEFAULT 'work_day',
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE,
-                    UNIQUE(profile_id, date)
-                )
-            """)
-            
-            # Tabela ustawień
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    profile_id INTEGER NOT NULL,
-                    key TEXT NOT NULL,
-                    value TEXT NOT NULL,
-                    type TEXT DEFAULT 'string',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE,
-                    UNIQUE(profile_id, key)
-                )
-            """)
-            
-            # Tabela niestandardowych motywów
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS custom_themes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    profile_id INTEGER NOT NULL,
-                    theme_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    config_json TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE
+        Gdy PRAGMA user_version równa się oczekiwanej wersji schematu, baza
+        jest aktualna i cała inicjalizacja jest pomijana (jeden odczyt PRAGMA).
+        W przeciwnym razie tworzony jest schemat bazowy, uruchamiane są
+        migracje, a na końcu zapisywana jest nowa wersja. Baza z migracjami
+        nieznanymi aplikacji (utworzona przez nowszą wersję) nie dostaje
+        nowej wersji.
+        """
+        target = self.target_schema_version()
+        with self._pool.writer() as conn:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        if current == target:
+            logger.info(f"Baza danych aktualna (schemat v{current}): {self.db_path}")
+            return
+        
+        self._bootstrap_schema()
+        
+        # Migracje na połączeniu zapisującym puli (bez osobnego połączenia)
+        with self._pool.writer() as conn:
+            runner = MigrationRunner(str(self.db_path), connection=conn)
+            runner.run_pending_migrations()
+            known = {version for version, _ in runner.available_migrations(runner.migrations_dir)}
+            unknown = sorted(set(runner.get_applied_migrations()) - known)
+            if unknown:
+                logger.warning(
+                    f"Baza danych ma migracje nieznane aplikacji ({', '.join(unknown)}) - "
+                    "pozostawiam wersję schematu"
                 )
-            """)
-            
-            # Indeksy dla wydajności
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_work_entries_profile_date
-                ON work_entries(profile_id, date)
-            """)
+                return
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        logger.info(f"Schemat bazy zaktualizowany: v{current} -> v{target}")
+    
+    def _bootstrap_schema(self) -> None:
+        """Utwórz schemat bazowy (idempotentnie) i domyślny profil"""
+        with self._pool.writer() as conn:
+            cursor = conn.cursor()
             
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_work_entries_profile_month
-                ON work_entries(profile_id, strftime('%Y-%m', date))
-            """)
+            try:
+                # Tabela profili
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS profiles (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL UNIQUE,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Tabela wpisów pracy
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS work_entries (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        profile_id INTEGER NOT NULL,
+                        date TEXT NOT NULL,
+                        start_time TEXT,
+                        end_time TEXT,
+                        break_minutes INTEGER DEFAULT 0,
+                        day_type TEXT DEFAULT 'work_day',
+                        notes TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE,
+                        UNIQUE(profile_id, date)
+                    )
+                """)
+                
+                # Tabela ustawień
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS settings (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        profile_id INTEGER NOT NULL,
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        type TEXT DEFAULT 'string',
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE,
+                        UNIQUE(profile_id, key)
+                    )
+                """)
+                
+                # Tabela niestandardowych motywów
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS custom_themes (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        profile_id INTEGER NOT NULL,
+                        theme_id INTEGER NOT NULL,
+                        name TEXT NOT NULL,
+                        config_json TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE
+                    )
+                """)
+                
+                # Indeksy dla wydajności
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_work_entries_profile_date
+                    ON work_entries(profile_id, date)
+                """)
+                
+                # Domyślny profil
+                cursor.execute("SELECT COUNT(*) FROM profiles")
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute(
+                        "INSERT INTO profiles (name) VALUES (?)",
+                        ("Default User",)
+                    )
+                    logger.info("Domyślny profil stworzony")
+                
+                conn.commit()
+                logger.info(f"Baza danych zainicjalizowana: {self.db_path}")
+                
+            except Exception as e:
+                logger.error(f"Błąd inicjalizacji bazy: {e}")
+                conn.rollback()
+                raise
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Transakcja obejmująca wiele operacji zapisu
+        
+        Metody zapisu wywołane wewnątrz nie zatwierdzają zmian same - całość
+        kończy jeden COMMIT (jeden fsync). Zagnieżdżone transakcje używają
+        SAVEPOINT, więc błąd wewnątrz wycofuje tylko swój fragment. Wyjątek
+        wycofuje transakcję i jest przekazywany dalej.
+        
+        Połączenie zapisujące jest zablokowane dla innych wątków do końca
+        najbardziej zewnętrznej transakcji.
+        
+        Yields:
+            Połączenie zapisujące
             
-            # Domyślny profil
-            cursor.execute("SELECT COUNT(*) FROM profiles")
-            if cursor.fetchone()[0] == 0:
-                cursor.execute(
-                    "INSERT INTO profiles (name) VALUES (?)",
-                    ("Default User",)
-                )
-                logger.info("Domyślny profil stworzony")
+        Raises:
+            RuntimeError: Na połączeniu zapisującym jest niezakończona
+                transakcja spoza transaction() (np. przez get_connection())
+        """
+        with self._pool.writer() as conn:
+            depth = self._transaction_depth
+            savepoint = f"wh_savepoint_{depth}"
+            if depth == 0:
+                if conn.in_transaction:
+                    # Nie zatwierdzaj cudzej, nieznanej pracy
+                    logger.error("Niezakończona transakcja na połączeniu zapisującym")
+                    raise RuntimeError(
+                        "Połączenie zapisujące ma niezakończoną transakcję - "
+                        "zatwierdź ją lub wycofaj przed transaction()"
+                    )
+                conn.execute("BEGIN IMMEDIATE")
+            else:
+                conn.execute(f"SAVEPOINT {savepoint}")
             
-            conn.commit()
-            logger.info(f"Baza danych zainicjalizowana: {self.db_path}")
+            self._transaction_depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                self._transaction_depth = depth
+                if depth == 0:
+                    conn.rollback()
+                else:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                raise
             
-        except Exception as e:
-            logger.error(f"Błąd inicjalizacji bazy: {e}")
-            conn.rollback()
-            raise
+            self._transaction_depth = depth
+            if depth == 0:
+                conn.commit()
+            else:
+                conn.execute(f"RELEASE {savepoint}")
     
     def get_connection(self) -> sqlite3.Connection:
-        """Pobierz aktywne połączenie z bazą"""
-        if self.connection is None:
-            self.connection = sqlite3.connect(str(self.db_path))
-            self.connection.row_factory = sqlite3.Row
-        return self.connection
+        """
+        Pobierz połączenie zapisujące
+        
+        Operacje Database same pobierają połączenia z puli; ta metoda
+        służy do bezpośredniego dostępu (np. w testach i benchmarkach).
+        """
+        return self._pool.get_writer()
     
     def close(self) -> None:
-        """Zamknij połączenie z bazą"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            logger.info("Połączenie z bazą zamknięte")
+        """Zamknij wszystkie połączenia z bazą"""
+        self._pool.close()
+        logger.info("Połączenie z bazą zamknięte")
     
     # ═══════════════════════════════════════════════════════════════════════
     # OPERACJE PROFILI
@@ -154,56 +367,76 @@ class Database:
         Raises:
             ValueError: Jeśli profil już istnieje
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute(
+                    "INSERT INTO profiles (name) VALUES (?)",
+                    (name,)
+                )
+                profile_id = cursor.lastrowid
+                logger.info(f"Profil '{name}' (ID: {profile_id}) stworzony")
+                return profile_id
+            except sqlite3.IntegrityError:
+                logger.error(f"Profil '{name}' już istnieje")
+                raise ValueError(f"Profil '{name}' już istnieje")
         
-        try:
-            cursor.execute(
-                "INSERT INTO profiles (name) VALUES (?)",
-                (name,)
-            )
-            conn.commit()
-            profile_id = cursor.lastrowid
-            logger.info(f"Profil '{name}' (ID: {profile_id}) stworzony")
-            return profile_id
-        except sqlite3.IntegrityError:
-            logger.error(f"Profil '{name}' już istnieje")
-            raise ValueError(f"Profil '{name}' już istnieje")
-    
     def get_all_profiles(self) -> List[Dict]:
         """Pobierz wszystkie profile"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM profiles ORDER BY created_at")
-        return [dict(row) for row in cursor.fetchall()]
-    
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM profiles ORDER BY created_at")
+            return [dict(row) for row in cursor.fetchall()]
+        
     def get_profile(self, profile_id: int) -> Optional[Dict]:
         """Pobierz profil po ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM profiles WHERE id = ?", (profile_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
-    
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM profiles WHERE id = ?", (profile_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        
+    def count_profiles(self) -> int:
+        """Zlicz profile"""
+        with self._pool.reader() as conn:
+            return conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+        
+    def profile_exists(self, profile_id: int) -> bool:
+        """Sprawdź czy profil istnieje (bez pobierania wiersza)"""
+        with self._pool.reader() as conn:
+            row = conn.execute("SELECT 1 FROM profiles WHERE id = ? LIMIT 1", (profile_id,)).fetchone()
+            return row is not None
+        
     def delete_profile(self, profile_id: int) -> bool:
         """Usuń profil (cascading delete)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
+                logger.info(f"Profil ID {profile_id} usunięty")
+                return cursor.rowcount > 0
+            except Exception as e:
+                logger.error(f"Błąd usuwania profilu: {e}")
+                raise
         
-        try:
-            cursor.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
-            conn.commit()
-            logger.info(f"Profil ID {profile_id} usunięty")
-            return cursor.rowcount > 0
-        except Exception as e:
-            logger.error(f"Błąd usuwania profilu: {e}")
-            conn.rollback()
-            raise
-    
     # ═══════════════════════════════════════════════════════════════════════
     # OPERACJE WPISÓW PRACY
     # ═══════════════════════════════════════════════════════════════════════
     
+    UPSERT_WORK_ENTRY_SQL = """
+        INSERT OR REPLACE INTO work_entries
+        (profile_id, date, start_time, end_time, break_minutes, day_type, notes,
+         start_minute, end_minute, net_minutes, is_midnight_crossing)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    # Górna granica partii insert_work_entries_many: wyszukiwanie ID używa
+    # jednego parametru na datę (+ profile_id), a starsze kompilacje SQLite
+    # dopuszczają najwyżej 999 parametrów w zapytaniu
+    MAX_BULK_CHUNK_SIZE = 900
+    
     def insert_work_entry(self, entry: Dict) -> int:
         """
         Dodaj lub zaktualizuj wpis pracy (UPSERT)
@@ -214,63 +447,467 @@ class Database:
         Returns:
             ID wpisu
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute(self.UPSERT_WORK_ENTRY_SQL, self._work_entry_params(entry))
+                logger.info(f"Wpis {entry['date']} zapisany dla profilu {entry['profile_id']}")
+                return cursor.lastrowid
+            except Exception as e:
+                logger.error(f"Błąd zapisywania wpisu: {e}")
+                raise
         
-        try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO work_entries
-                (profile_id, date, start_time, end_time, break_minutes, day_type, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                entry['profile_id'],
-                entry['date'],
-                entry['start_time'],
-                entry['end_time'],
-                entry['break_minutes'],
-                entry['day_type'],
-                entry['notes']
-            ))
-            conn.commit()
-            logger.info(f"Wpis {entry['date']} zapisany dla profilu {entry['profile_id']}")
-            return cursor.lastrowid
-        except Exception as e:
-            logger.error(f"Błąd zapisywania wpisu: {e}")
-            conn.rollback()
-            raise
+    def insert_work_entries_many(self, entries: Iterable[Any], chunk_size: int = 500) -> List[Dict]:
+        """
+        Dodaj lub zaktualizuj wiele wpisów w jednej transakcji (UPSERT)
+        
+        Wpisy są pobierane z iteratora partiami po chunk_size i zapisywane
+        przez executemany, a całość kończy jeden commit.
+        
+        Args:
+            entries: Iterowalne obiekty WorkEntry (to_dict) lub słowniki
+            chunk_size: Liczba wpisów w jednej partii executemany
+                (najwyżej MAX_BULK_CHUNK_SIZE - większe wartości są obcinane)
+            
+        Returns:
+            Lista słowników {profile_id, date, id, replaced} w kolejności
+            wejścia; replaced=True gdy wpis dla (profile_id, date) już
+            istniał i został zastąpiony
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size musi być dodatni")
+        chunk_size = min(chunk_size, self.MAX_BULK_CHUNK_SIZE)
+        
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            iterator = iter(entries)
+            results = []
+            written = set()
+            
+            try:
+                while True:
+                    chunk = [self._work_entry_params(e) for e in islice(iterator, chunk_size)]
+                    if not chunk:
+                        break
+                    
+                    keys = [(params[0], params[1]) for params in chunk]
+                    existing = self._lookup_work_entry_ids(cursor, keys)
+                    
+                    cursor.executemany(self.UPSERT_WORK_ENTRY_SQL, chunk)
+                    
+                    saved = self._lookup_work_entry_ids(cursor, keys)
+                    for key in keys:
+                        results.append({
+                            'profile_id': key[0],
+                            'date': key[1],
+                            'id': saved[key],
+                            'replaced': key in existing or key in written
+                        })
+                        written.add(key)
+                
+                logger.info(f"Zapisano {len(results)} wpisów (bulk)")
+                return results
+            except Exception as e:
+                logger.error(f"Błąd zapisywania wpisów (bulk): {e}")
+                raise
+        
+    @staticmethod
+    def _work_entry_params(entry: Any) -> Tuple:
+        """
+        Konwertuj WorkEntry lub słownik do parametrów UPSERT
+        
+        Wartości minutowe (start_minute, end_minute, net_minutes,
+        is_midnight_crossing) są liczone tutaj, raz na zapis.
+        """
+        if hasattr(entry, 'to_dict'):
+            entry = entry.to_dict()
+        date = entry['date']
+        start_time = entry.get('start_time')
+        end_time = entry.get('end_time')
+        break_minutes = entry.get('break_minutes', 0)
+        day_type = entry.get('day_type', 'work_day')
+        start_minute, end_minute, net_minutes, is_midnight_crossing = (
+            entry_minutes(date, start_time, end_time, break_minutes, day_type)
+        )
+        return (
+            entry['profile_id'],
+            date,
+            start_time,
+            end_time,
+            break_minutes,
+            day_type,
+            entry.get('notes'),
+            start_minute,
+            end_minute,
+            net_minutes,
+            int(is_midnight_crossing)
+        )
+    
+    @staticmethod
+    def _lookup_work_entry_ids(cursor: sqlite3.Cursor, keys: List[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        """Pobierz ID wpisów dla kluczy (profile_id, date), grupując po profilu"""
+        dates_by_profile: Dict[int, set] = {}
+        for profile_id, date in keys:
+            dates_by_profile.setdefault(profile_id, set()).add(date)
+        
+        ids = {}
+        for profile_id, dates in dates_by_profile.items():
+            placeholders = ", ".join("?" * len(dates))
+            cursor.execute(
+                f"SELECT id, date FROM work_entries WHERE profile_id = ? AND date IN ({placeholders})",
+                (profile_id, *dates)
+            )
+            for row in cursor.fetchall():
+                ids[(profile_id, row[1])] = row[0]
+        return ids
     
     def get_work_entry(self, profile_id: int, date: str) -> Optional[Dict]:
         """Pobierz wpis dla danego dnia"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM work_entries WHERE profile_id = ? AND date = ?",
-            (profile_id, date)
-        )
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM work_entries WHERE profile_id = ? AND date = ?",
+                (profile_id, date)
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        
+    @staticmethod
+    def _month_bounds(year: int, month: int) -> Tuple[str, str]:
+        """
+        Zwróć półotwarty zakres dat miesiąca [start, end)
+        
+        Porównania date >= start AND date < end korzystają z indeksu
+        idx_work_entries_profile_date, w przeciwieństwie do strftime().
+        """
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return f"{year:04d}-{month:02d}-01", f"{next_year:04d}-{next_month:02d}-01"
     
     def get_work_entries_month(self, profile_id: int, year: int, month: int) -> List[Dict]:
         """Pobierz wszystkie wpisy z miesiąca"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM work_entries
+                WHERE profile_id = ? AND date >= ? AND date < ?
+                ORDER BY date
+            """, (profile_id, *self._month_bounds(year, month)))
+            return [dict(row) for row in cursor.fetchall()]
+        
+    def work_entry_exists(self, profile_id: int, date: str) -> bool:
+        """Sprawdź czy wpis istnieje (bez pobierania wiersza)"""
+        with self._pool.reader() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM work_entries WHERE profile_id = ? AND date = ? LIMIT 1",
+                (profile_id, date)
+            ).fetchone()
+            return row is not None
+        
+    def count_work_entries_month(self, profile_id: int, year: int, month: int) -> int:
+        """Zlicz wpisy z miesiąca"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) FROM work_entries
+                WHERE profile_id = ? AND date >= ? AND date < ?
+            """, (profile_id, *self._month_bounds(year, month)))
+            return cursor.fetchone()[0]
+        
+    def get_work_entries_range(self, profile_id: int, start: str, end: str) -> List[Dict]:
+        """
+        Pobierz wpisy z zakresu dat (włącznie) jednym zapytaniem
+        
+        Args:
+            profile_id: ID profilu
+            start: Początkowa data YYYY-MM-DD
+            end: Końcowa data YYYY-MM-DD
+            
+        Returns:
+            Lista wpisów posortowana po dacie
+        """
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM work_entries
+                WHERE profile_id = ? AND date BETWEEN ? AND ?
+                ORDER BY date
+            """, (profile_id, start, end))
+            return [dict(row) for row in cursor.fetchall()]
+        
+    def iter_work_entries(
+        self,
+        profile_id: int,
+        start: str,
+        end: str,
+        batch_size: int = 500
+    ) -> Iterator[Dict]:
+        """
+        Strumieniowo iteruj po wpisach z zakresu dat (włącznie)
+        
+        Wiersze są pobierane partiami (fetchmany), więc pamięć nie rośnie
+        z rozmiarem zakresu. Połączenie odczytu jest zajęte do wyczerpania
+        (lub zamknięcia) iteratora.
+        
+        Args:
+            profile_id: ID profilu
+            start: Początkowa data YYYY-MM-DD
+            end: Końcowa data YYYY-MM-DD
+            batch_size: Liczba wierszy pobieranych naraz
+            
+        Returns:
+            Iterator wpisów posortowanych po dacie
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size musi być dodatni")
+        
+        return self._iter_rows("""
             SELECT * FROM work_entries
-            WHERE profile_id = ? AND strftime('%Y-%m', date) = ?
+            WHERE profile_id = ? AND date BETWEEN ? AND ?
             ORDER BY date
-        """, (profile_id, f"{year:04d}-{month:02d}"))
-        return [dict(row) for row in cursor.fetchall()]
+        """, (profile_id, start, end), batch_size)
+    
+    def _iter_rows(
+        self,
+        sql: str,
+        params: Tuple,
+        batch_size: int,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> Iterator[Dict]:
+        """
+        Generator wierszy zapytania pobieranych partiami przez fetchmany
+        
+        Args:
+            conn: Połączenie do użycia (np. z _read_transaction); domyślnie
+                czytelnik z puli na czas iteracji
+        """
+        if conn is None:
+            with self._pool.reader() as conn:
+                yield from self._iter_rows(sql, params, batch_size, conn)
+            return
+        
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                for row in batch:
+                    yield dict(row)
+        finally:
+            cursor.close()
+    
+    @contextmanager
+    def _read_transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Połączenie do odczytu w jednej transakcji
+        
+        Wszystkie zapytania w bloku widzą ten sam stan bazy (jeden snapshot
+        WAL), nawet gdy inny wątek zatwierdza zapisy w międzyczasie.
+        """
+        with self._pool.reader() as conn:
+            if conn.in_transaction:
+                # Writer w trakcie transakcji tego wątku - odczyt już jest spójny
+                yield conn
+                return
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+    
+    def get_work_entry_minutes(self, profile_id: int) -> List[Dict]:
+        """
+        Pobierz zapisane minuty netto wszystkich poprawnych wpisów profilu
+        
+        Args:
+            profile_id: ID profilu
+            
+        Returns:
+            Lista {date, day_type, net_minutes} posortowana po dacie
+        """
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT date, day_type, net_minutes FROM work_entries
+                WHERE profile_id = ? AND net_minutes IS NOT NULL
+                ORDER BY date
+            """, (profile_id,))
+            return [dict(row) for row in cursor.fetchall()]
     
     def delete_work_entry(self, profile_id: int, date: str) -> bool:
         """Usuń wpis"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "DELETE FROM work_entries WHERE profile_id = ? AND date = ?",
-            (profile_id, date)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM work_entries WHERE profile_id = ? AND date = ?",
+                (profile_id, date)
+            )
+            return cursor.rowcount > 0
+        
+    def delete_work_entries_month(self, profile_id: int, year: int, month: int) -> int:
+        """
+        Usuń wszystkie wpisy z miesiąca jednym zapytaniem
+        
+        Returns:
+            Liczba usuniętych wpisów
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute("""
+                    DELETE FROM work_entries
+                    WHERE profile_id = ? AND date >= ? AND date < ?
+                """, (profile_id, *self._month_bounds(year, month)))
+                return cursor.rowcount
+            except Exception as e:
+                logger.error(f"Błąd usuwania wpisów miesiąca: {e}")
+                raise
+        
+    # ═══════════════════════════════════════════════════════════════════════
+    # PODSUMOWANIA MIESIĘCZNE (month_aggregates)
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    AGGREGATE_FIELDS = (
+        'entry_count', 'valid_days', 'work_days', 'sick_days',
+        'vacation_days', 'day_offs', 'days_with_work', 'net_minutes'
+    )
+    
+    def get_month_aggregate(self, profile_id: int, year: int, month: int) -> Optional[Dict]:
+        """Pobierz podsumowanie miesiąca (None gdy brak wpisów)"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM month_aggregates WHERE profile_id = ? AND year_month = ?",
+                (profile_id, f"{year:04d}-{month:02d}")
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def get_year_aggregates(self, profile_id: int, year: int) -> List[Dict]:
+        """Pobierz podsumowania wszystkich miesięcy roku z wpisami"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM month_aggregates
+                WHERE profile_id = ? AND year_month BETWEEN ? AND ?
+                ORDER BY year_month
+            """, (profile_id, f"{year:04d}-01", f"{year:04d}-12"))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def rebuild_month_aggregates(self, profile_id: Optional[int] = None) -> int:
+        """
+        Przelicz month_aggregates od zera na podstawie work_entries
+        
+        Sumuje zapisane kolumny net_minutes (czyste GROUP BY w SQL).
+        
+        Args:
+            profile_id: Ogranicz do jednego profilu (domyślnie wszystkie)
+            
+        Returns:
+            Liczba odtworzonych wierszy podsumowań
+        """
+        where, params = ("WHERE profile_id = ?", (profile_id,)) if profile_id is not None else ("", ())
+        
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute(f"DELETE FROM month_aggregates {where}", params)
+                cursor.execute(f"""
+                    INSERT INTO month_aggregates (
+                        profile_id, year_month, entry_count, valid_days, work_days, sick_days,
+                        vacation_days, day_offs, days_with_work, net_minutes
+                    )
+                    SELECT
+                        profile_id,
+                        substr(date, 1, 7),
+                        COUNT(*),
+                        SUM(net_minutes IS NOT NULL),
+                        SUM(day_type = 'work_day' AND net_minutes IS NOT NULL),
+                        SUM(day_type = 'sick_day' AND net_minutes IS NOT NULL),
+                        SUM(day_type = 'vacation' AND net_minutes IS NOT NULL),
+                        SUM(day_type = 'day_off' AND net_minutes IS NOT NULL),
+                        SUM(IFNULL(net_minutes, 0) > 0),
+                        SUM(IFNULL(net_minutes, 0))
+                    FROM work_entries {where}
+                    GROUP BY profile_id, substr(date, 1, 7)
+                """, params)
+                logger.info(f"Odtworzono {cursor.rowcount} podsumowań miesięcznych")
+                return cursor.rowcount
+            except Exception as e:
+                logger.error(f"Błąd odtwarzania podsumowań: {e}")
+                raise
+    
+    def verify_month_aggregates(self, profile_id: Optional[int] = None) -> List[Dict]:
+        """
+        Porównaj month_aggregates z pełnym przeliczeniem przez CalcService
+        
+        Args:
+            profile_id: Ogranicz do jednego profilu (domyślnie wszystkie)
+            
+        Returns:
+            Lista rozbieżności {profile_id, year_month, expected, actual};
+            pusta lista oznacza spójne podsumowania
+        """
+        # Import lokalny: warstwa bazy nie zależy od serwisów przy imporcie
+        from src.services.calc_service import CalcService, MonthSummaryAccumulator
+        
+        calc_service = CalcService()
+        where, params = ("WHERE profile_id = ?", (profile_id,)) if profile_id is not None else ("", ())
+        
+        expected: Dict[Tuple[int, str], Dict] = {}
+        # Oba odczyty w jednej transakcji - zapis zatwierdzony między nimi
+        # (np. z WriteBehindQueue) nie daje fałszywej rozbieżności
+        with self._read_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM month_aggregates {where}", params)
+            actual = {
+                (row['profile_id'], row['year_month']): {f: row[f] for f in self.AGGREGATE_FIELDS}
+                for row in cursor.fetchall()
+            }
+            
+            rows = self._iter_rows(
+                f"SELECT * FROM work_entries {where} ORDER BY profile_id, date", params, 500, conn
+            )
+            for key, month_rows in groupby(rows, key=lambda r: (r['profile_id'], r['date'][:7])):
+                entry_count = 0
+                accumulator = MonthSummaryAccumulator()
+                for row in month_rows:
+                    entry_count += 1
+                    accumulator.add(calc_service.calculate_work_day(
+                        date=row['date'],
+                        start_time=row['start_time'] or None,
+                        end_time=row['end_time'] or None,
+                        break_minutes=row['break_minutes'] or 0,
+                        day_type=row['day_type']
+                    ))
+                expected[key] = {
+                    'entry_count': entry_count,
+                    'valid_days': len(accumulator.days_with_entries),
+                    'work_days': accumulator.work_days,
+                    'sick_days': accumulator.sick_days,
+                    'vacation_days': accumulator.vacation_days,
+                    'day_offs': accumulator.day_offs,
+                    'days_with_work': accumulator.days_with_work,
+                    'net_minutes': accumulator.total_minutes,
+                }
+        
+        mismatches = []
+        for key in sorted(set(expected) | set(actual)):
+            if expected.get(key) != actual.get(key):
+                mismatches.append({
+                    'profile_id': key[0],
+                    'year_month': key[1],
+                    'expected': expected.get(key),
+                    'actual': actual.get(key)
+                })
+        
+        if mismatches:
+            logger.warning(f"Niespójne podsumowania miesięczne: {len(mismatches)}")
+        return mismatches
     
     # ═══════════════════════════════════════════════════════════════════════
     # OPERACJE USTAWIEŃ
@@ -278,61 +915,57 @@ class Database:
     
     def set_setting(self, profile_id: int, key: str, value: str, type_: str = "string") -> None:
         """Ustaw ustawienie (UPSERT)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO settings (profile_id, key, value, type)
+                    VALUES (?, ?, ?, ?)
+                """, (profile_id, key, value, type_))
+            except Exception as e:
+                logger.error(f"Błąd ustawienia: {e}")
+                raise
         
-        try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO settings (profile_id, key, value, type)
-                VALUES (?, ?, ?, ?)
-            """, (profile_id, key, value, type_))
-            conn.commit()
-        except Exception as e:
-            logger.error(f"Błąd ustawienia: {e}")
-            conn.rollback()
-            raise
-    
     def get_setting(self, profile_id: int, key: str) -> Optional[str]:
         """Pobierz wartość ustawienia"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT value FROM settings WHERE profile_id = ? AND key = ?",
-            (profile_id, key)
-        )
-        row = cursor.fetchone()
-        return row[0] if row else None
-    
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT value FROM settings WHERE profile_id = ? AND key = ?",
+                (profile_id, key)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+        
     # ═══════════════════════════════════════════════════════════════════════
     # OPERACJE MOTYWÓW
     # ═══════════════════════════════════════════════════════════════════════
     
     def get_custom_themes(self, profile_id: int) -> List[Dict]:
         """Pobierz niestandardowe motywy profilu"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM custom_themes WHERE profile_id = ? ORDER BY created_at",
-            (profile_id,)
-        )
-        return [dict(row) for row in cursor.fetchall()]
-    
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM custom_themes WHERE profile_id = ? ORDER BY created_at",
+                (profile_id,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        
     def insert_custom_theme(self, profile_id: int, theme_id: int, name: str, config_json: str) -> int:
         """Dodaj niestandardowy motyw"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
-                INSERT INTO custom_themes (profile_id, theme_id, name, config_json)
-                VALUES (?, ?, ?, ?)
-            """, (profile_id, theme_id, name, config_json))
-            conn.commit()
-            return cursor.lastrowid
-        except Exception as e:
-            logger.error(f"Błąd dodawania motywu: {e}")
-            conn.rollback()
-            raise
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute("""
+                    INSERT INTO custom_themes (profile_id, theme_id, name, config_json)
+                    VALUES (?, ?, ?, ?)
+                """, (profile_id, theme_id, name, config_json))
+                return cursor.lastrowid
+            except Exception as e:
+                logger.error(f"Błąd dodawania motywu: {e}")
+                raise
 
 
-__all__ = ['Database']
+__all__ = ['Database', 'ConnectionProfile', 'prepare_connection']
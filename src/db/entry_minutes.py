@@ -0,0 +1,98 @@
+"""
+Entry minutes - Wartości minutowe wpisu liczone przez warstwę bazy
+
+Zasady są te same co w CalcService.calculate_work_day (zgodność pilnują
+testy), ale moduł nie zależy od src.services - baza liczy kolumny
+start_minute/end_minute/net_minutes/is_midnight_crossing i rejestruje
+funkcje SQL wh_*() bez ładowania serwisów.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+
+# Typy dni (jak CalcService)
+WORK_DAY = "work_day"
+SICK_DAY = "sick_day"
+VACATION = "vacation"
+DAY_OFF = "day_off"
+
+SICK_DAY_MINUTES = 8 * 60    # Norma dnia (CalcService.STANDARD_WORKING_HOURS)
+MIN_WORK_MINUTES = 15
+MAX_WORK_MINUTES = 12 * 60
+
+
+def time_minutes(time_str) -> Optional[int]:
+    """
+    HH:MM na minuty od północy
+
+    Returns:
+        Minuty lub None dla pustego lub błędnego czasu
+    """
+    if not isinstance(time_str, str):
+        return None
+    parts = time_str.split(':')
+    if len(parts) != 2:
+        return None
+    try:
+        hours, minutes = int(parts[0]), int(parts[1])
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def _valid_date(date) -> bool:
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def entry_minutes(
+    date: str,
+    start_time: Optional[str],
+    end_time: Optional[str],
+    break_minutes: int = 0,
+    day_type: str = WORK_DAY
+) -> Tuple[Optional[int], Optional[int], Optional[int], bool]:
+    """
+    Oblicz wartości minutowe wpisu zapisywane razem z nim w bazie
+
+    Args:
+        date: Data YYYY-MM-DD
+        start_time: Godzina rozpoczęcia HH:MM (lub pusta)
+        end_time: Godzina zakończenia HH:MM (lub pusta)
+        break_minutes: Liczba minut przerwy
+        day_type: Typ dnia
+
+    Returns:
+        (start_minute, end_minute, net_minutes, is_midnight_crossing);
+        minuty startu/końca są None dla pustego lub błędnego czasu,
+        net_minutes jest None dla niepoprawnego wpisu
+    """
+    start_minute = time_minutes(start_time)
+    end_minute = time_minutes(end_time)
+    break_minutes = break_minutes or 0
+    if not _valid_date(date):
+        return start_minute, end_minute, None, False
+    if day_type in (VACATION, DAY_OFF):
+        return start_minute, end_minute, 0, False
+    if day_type == SICK_DAY:
+        return start_minute, end_minute, SICK_DAY_MINUTES, False
+    if start_minute is None or end_minute is None:
+        return start_minute, end_minute, None, False
+    is_midnight_crossing = end_minute < start_minute
+    if is_midnight_crossing:
+        work_minutes = (24 * 60 - start_minute) + end_minute
+    else:
+        work_minutes = end_minute - start_minute
+    if not MIN_WORK_MINUTES <= work_minutes <= MAX_WORK_MINUTES:
+        return start_minute, end_minute, None, is_midnight_crossing
+    if break_minutes < 0 or break_minutes >= work_minutes:
+        return start_minute, end_minute, None, is_midnight_crossing
+    return start_minute, end_minute, work_minutes - break_minutes, is_midnight_crossing
+
+
+__all__ = ['entry_minutes', 'time_minutes']
@@ -2,60 +2,179 @@
 Migrations - System kontroli wersji bazy danych
 """
 
+import hashlib
+import importlib.util
 import sqlite3
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
 
+# Domyślny rozmiar partii dla backfill()
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    update_sql: str,
+    compute: Callable[[Tuple], Optional[Tuple]],
+    where: str = "1",
+    batch_size: int = BACKFILL_BATCH_SIZE
+) -> int:
+    """
+    Uzupełnij dane tabeli partiami (dla migracji w Pythonie)
+    
+    Wiersze są czytane po rowid (paginacja kluczem, bez OFFSET), więc
+    w pamięci jest naraz najwyżej batch_size wierszy.
+    
+    Args:
+        conn: Połączenie (w transakcji migracji)
+        table: Nazwa tabeli
+        columns: Kolumny przekazywane do compute (po rowid)
+        update_sql: Instrukcja UPDATE z parametrami zwracanymi przez compute
+        compute: Funkcja (rowid, *kolumny) -> parametry update_sql
+            lub None (wiersz pominięty)
+        where: Dodatkowy warunek wyboru wierszy
+        batch_size: Liczba wierszy w partii
+    
+    Returns:
+        Liczba zaktualizowanych wierszy
+    """
+    select_sql = (
+        f"SELECT rowid, {', '.join(columns)} FROM {table} "
+        f"WHERE rowid > ? AND ({where}) ORDER BY rowid LIMIT ?"
+    )
+    last_rowid = -(2 ** 63)
+    updated = 0
+    while True:
+        rows = conn.execute(select_sql, (last_rowid, batch_size)).fetchall()
+        if not rows:
+            break
+        params = [p for p in map(compute, rows) if p is not None]
+        if params:
+            conn.executemany(update_sql, params)
+        updated += len(params)
+        last_rowid = rows[-1][0]
+    return updated
+
+
 class MigrationRunner:
     """
     Zarządza migracjami bazy danych
     
-    - Detektuje pliki migracji SQL
-    - Śledzi zastosowane migracje
-    - Uruchamia nowe migracje w porządku
+    - Detektuje pliki migracji: SQL (*.sql) i Python (*.py z funkcją
+      migrate(conn), np. z backfill() dla dużych tabel)
+    - Śledzi zastosowane migracje i sumy kontrolne ich plików
+    - Uruchamia nowe migracje w porządku, każdą w osobnej transakcji razem
+      z wpisem do schema_migrations
+    - Używa jednego połączenia przez cały czas życia
     """
     
-    def __init__(self, db_path: str, migrations_dir: str = "src/db/migrations"):
+    # Pliki migracji leżą obok tego modułu (src/db/migrations/*.sql, *.py)
+    MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+    
+    MIGRATION_SUFFIXES = ('.sql', '.py')
+    
+    def __init__(
+        self,
+        db_path: str,
+        migrations_dir: Optional[str] = None,
+        on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+        connection: Optional[sqlite3.Connection] = None
+    ):
         """
         Inicjalizuj runner migracji
         
         Args:
             db_path: Ścieżka do bazy danych
             migrations_dir: Folder zawierający pliki migracji
+                (domyślnie src/db/migrations, niezależnie od katalogu roboczego)
+            on_connect: Opcjonalna funkcja przygotowująca połączenie
+                (funkcje SQL używane przez migracje i triggery)
+            connection: Istniejące połączenie do użycia (np. writer puli
+                Database); nie jest zamykane przez runner
         """
         self.db_path = Path(db_path)
-        self.migrations_dir = Path(migrations_dir)
-        self.connection: sqlite3.Connection = None
+        self.migrations_dir = Path(migrations_dir) if migrations_dir else self.MIGRATIONS_DIR
+        self.on_connect = on_connect
+        self._owns_connection = connection is None
+        self.connection: sqlite3.Connection = connection if connection is not None else self._connect()
         self._init_migrations_table()
     
-    def _init_migrations_table(self) -> None:
-        """Utwórz tabelę do śledzenia migracji"""
+    def _connect(self) -> sqlite3.Connection:
+        """Otwórz połączenie z bazą"""
         conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        return conn
+    
+    def close(self) -> None:
+        """Zamknij połączenie (tylko jeśli otworzył je runner)"""
+        if self._owns_connection and self.connection is not None:
+            self.connection.close()
+            self.connection = None
+    
+    def __enter__(self) -> 'MigrationRunner':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def _init_migrations_table(self) -> None:
+        """Utwórz tabelę do śledzenia migracji (z sumą kontrolną pliku)"""
+        conn = self.connection
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS schema_migrations (
                 version TEXT PRIMARY KEY,
-                executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                checksum TEXT
             )
         """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(schema_migrations)")}
+        if 'checksum' not in columns:
+            conn.execute("ALTER TABLE schema_migrations ADD COLUMN checksum TEXT")
         conn.commit()
-        conn.close()
         logger.info("Tabela migracji zainicjalizowana")
     
     def get_applied_migrations(self) -> List[str]:
         """Pobierz listę zastosowanych migracji"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute("SELECT version FROM schema_migrations ORDER BY version")
-        versions = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return versions
+        cursor = self.connection.execute("SELECT version FROM schema_migrations ORDER BY version")
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_applied_checksums(self) -> Dict[str, Optional[str]]:
+        """Pobierz sumy kontrolne zastosowanych migracji (None - brak zapisanej)"""
+        cursor = self.connection.execute("SELECT version, checksum FROM schema_migrations")
+        return {version: checksum for version, checksum in cursor.fetchall()}
+    
+    @classmethod
+    def available_migrations(cls, migrations_dir: Optional[Path] = None) -> List[Tuple[str, Path]]:
+        """
+        Pobierz listę wszystkich plików migracji (bez dostępu do bazy)
+        
+        Args:
+            migrations_dir: Folder migracji (domyślnie MIGRATIONS_DIR)
+            
+        Returns:
+            Lista (version, path) posortowana po wersji
+        """
+        migrations_dir = Path(migrations_dir) if migrations_dir else cls.MIGRATIONS_DIR
+        if not migrations_dir.exists():
+            logger.warning(f"Folder migracji nie istnieje: {migrations_dir}")
+            return []
+        
+        migrations = []
+        for file_path in sorted(migrations_dir.iterdir()):
+            if file_path.suffix not in cls.MIGRATION_SUFFIXES:
+                continue
+            version = cls._extract_version(file_path.name)
+            if version:
+                migrations.append((version, file_path))
+        return migrations
     
     def get_pending_migrations(self) -> List[Tuple[str, Path]]:
         """
@@ -64,73 +183,157 @@ class MigrationRunner:
         Returns:
             Lista (version, path) migracji do uruchomienia
         """
-        if not self.migrations_dir.exists():
-            logger.warning(f"Folder migracji nie istnieje: {self.migrations_dir}")
+        migrations = self.available_migrations(self.migrations_dir)
+        if not migrations:
             return []
         
-        # Pobierz wszystkie pliki SQL
-        migration_files = sorted(self.migrations_dir.glob("*.sql"))
-        
-        # Pobierz zastosowane
-        applied = set(self.get_applied_migrations())
-        
         # Filtruj niezastosowane
-        pending = []
-        for file_path in migration_files:
-            version = self._extract_version(file_path.name)
-            if version and version not in applied:
-                pending.append((version, file_path))
-        
-        return pending
+        applied = set(self.get_applied_migrations())
+        return [(version, path) for version, path in migrations if version not in applied]
     
-    def _extract_version(self, filename: str) -> str:
+    @staticmethod
+    def _extract_version(filename: str) -> str:
         """Wyodrębni wersję z nazwy pliku"""
         match = re.match(r'(\d{8}_\d{6})', filename)
         return match.group(1) if match else None
     
+    @staticmethod
+    def checksum(file_path: Path) -> str:
+        """Suma kontrolna SHA-256 pliku migracji"""
+        return hashlib.sha256(file_path.read_bytes()).hexdigest()
+    
+    @classmethod
+    def fingerprint(cls, migrations_dir: Optional[Path] = None) -> str:
+        """
+        Odcisk zestawu migracji (bez dostępu do bazy)
+        
+        SHA-256 z wersji i sum kontrolnych wszystkich plików migracji -
+        zmienia się po dodaniu, zmianie nazwy lub edycji dowolnej migracji.
+        
+        Args:
+            migrations_dir: Folder migracji (domyślnie MIGRATIONS_DIR)
+            
+        Returns:
+            Odcisk w postaci szesnastkowej
+        """
+        digest = hashlib.sha256()
+        for version, file_path in cls.available_migrations(migrations_dir):
+            digest.update(f"{version}:{cls.checksum(file_path)}\n".encode('ascii'))
+        return digest.hexdigest()
+    
+    def verify_checksums(self) -> None:
+        """
+        Sprawdź, czy pliki zastosowanych migracji nie zostały zmienione
+        
+        Migracje zastosowane przed zapisywaniem sum kontrolnych dostają sumę
+        bieżącego pliku.
+        
+        Wywoływana przez run_pending_migrations(). Database.initialize()
+        uruchamia runner tylko, gdy PRAGMA user_version różni się od odcisku
+        migracji (fingerprint()) - edycja pliku zmienia odcisk, więc zmiana
+        zastosowanej migracji zawsze trafia tutaj, a aktualna baza nie
+        odpytuje schema_migrations przy każdym starcie.
+        
+        Raises:
+            RuntimeError: Plik zastosowanej migracji różni się od zapisanego
+        """
+        applied = self.get_applied_checksums()
+        missing: List[Tuple[str, str]] = []
+        changed: List[str] = []
+        for version, file_path in self.available_migrations(self.migrations_dir):
+            if version not in applied:
+                continue
+            actual = self.checksum(file_path)
+            if applied[version] is None:
+                missing.append((actual, version))
+            elif applied[version] != actual:
+                changed.append(file_path.name)
+        
+        if changed:
+            raise RuntimeError(
+                f"Zmieniono pliki zastosowanych migracji: {', '.join(changed)}"
+            )
+        if missing:
+            self.connection.executemany(
+                "UPDATE schema_migrations SET checksum = ? WHERE version = ?",
+                missing
+            )
+            self.connection.commit()
+            logger.info(f"Uzupełniono sumy kontrolne {len(missing)} migracji")
+    
+    def _apply(self, version: str, file_path: Path) -> None:
+        """
+        Zastosuj jedną migrację w jawnej transakcji
+        
+        Instrukcje migracji i wpis do schema_migrations są zatwierdzane
+        razem albo w całości wycofywane. Migracja nie może sama wykonywać
+        COMMIT.
+        """
+        conn = self.connection
+        checksum = self.checksum(file_path)
+        
+        try:
+            if file_path.suffix == '.sql':
+                # executescript zatwierdza oczekującą transakcję przed startem,
+                # więc BEGIN musi być częścią skryptu
+                conn.executescript("BEGIN IMMEDIATE;\n" + file_path.read_text(encoding='utf-8'))
+            else:
+                conn.execute("BEGIN IMMEDIATE")
+                self._load_python_migration(version, file_path)(conn)
+            
+            if not conn.in_transaction:
+                raise RuntimeError(f"Migracja {file_path.name} zatwierdziła transakcję samodzielnie")
+            
+            conn.execute(
+                "INSERT INTO schema_migrations (version, checksum) VALUES (?, ?)",
+                (version, checksum)
+            )
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+    
+    @staticmethod
+    def _load_python_migration(version: str, file_path: Path) -> Callable[[sqlite3.Connection], Any]:
+        """Załaduj funkcję migrate(conn) z pliku migracji Python"""
+        spec = importlib.util.spec_from_file_location(f"_wh_migration_{version}", file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        migrate = getattr(module, 'migrate', None)
+        if not callable(migrate):
+            raise RuntimeError(f"Migracja {file_path.name} nie definiuje funkcji migrate(conn)")
+        return migrate
+    
     def run_pending_migrations(self) -> int:
         """
         Uruchom wszystkie niezastosowane migracje
         
         Returns:
             Liczba uruchomionych migracji
+        
+        Raises:
+            RuntimeError: Zmieniony plik zastosowanej migracji
         """
+        self.verify_checksums()
         pending = self.get_pending_migrations()
         
         if not pending:
             logger.info("Brak nowych migracji do uruchomienia")
             return 0
         
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        
         count = 0
         for version, file_path in pending:
             try:
                 logger.info(f"Uruchamiam migrację: {file_path.name}")
-                
-                # Przeczytaj plik SQL
-                sql_content = file_path.read_text(encoding='utf-8')
-                
-                # Uruchom instrukcje
-                cursor.executescript(sql_content)
-                
-                # Zaznacz jako zastosowaną
-                cursor.execute(
-                    "INSERT INTO schema_migrations (version) VALUES (?)",
-                    (version,)
-                )
-                conn.commit()
-                
+                self._apply(version, file_path)
                 logger.info(f"✓ Migracja zastosowana: {version}")
                 count += 1
                 
             except Exception as e:
                 logger.error(f"✗ Błąd migracji {version}: {e}")
-                conn.rollback()
                 raise
         
-        conn.close()
         logger.info(f"Zastosowano {count} migracji")
         return count
     
@@ -154,4 +357,4 @@ class MigrationRunner:
         return status
 
 
-__all__ = ['MigrationRunner']
+__all__ = ['MigrationRunner', 'backfill', 'BACKFILL_BATCH_SIZE']
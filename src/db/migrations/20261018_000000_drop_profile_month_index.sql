@@ -0,0 +1,5 @@
+-- Zapytania miesięczne używają zakresu date >= ? AND date < ?
+-- na indeksie idx_work_entries_profile_date, więc indeks wyrażeniowy
+-- po strftime('%Y-%m', date) jest zbędny i tylko spowalnia zapisy.
+
+DROP INDEX IF EXISTS idx_work_entries_profile_month;
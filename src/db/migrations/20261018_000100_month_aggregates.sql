@@ -0,0 +1,152 @@
+-- Zmaterializowane podsumowania miesięczne (profil x miesiąc)
+--
+-- Utrzymywane przez triggery na work_entries. Funkcja wh_net_minutes()
+-- (rejestrowana przez Database na każdym połączeniu) zwraca minuty netto
+-- poprawnego wpisu wg CalcService.calculate_work_day albo NULL, gdy wpis
+-- jest niepoprawny. INSERT OR REPLACE uruchamia trigger DELETE tylko przy
+-- PRAGMA recursive_triggers = ON - Database włącza je na swoich połączeniach.
+-- Triggery nie używają INSERT OR IGNORE: klauzula OR REPLACE zewnętrznej
+-- instrukcji nadpisuje ją i wyzerowałaby istniejący wiersz podsumowania.
+
+CREATE TABLE IF NOT EXISTS month_aggregates (
+    profile_id INTEGER NOT NULL,
+    year_month TEXT NOT NULL,              -- YYYY-MM
+    entry_count INTEGER NOT NULL DEFAULT 0,
+    valid_days INTEGER NOT NULL DEFAULT 0,
+    work_days INTEGER NOT NULL DEFAULT 0,
+    sick_days INTEGER NOT NULL DEFAULT 0,
+    vacation_days INTEGER NOT NULL DEFAULT 0,
+    day_offs INTEGER NOT NULL DEFAULT 0,
+    days_with_work INTEGER NOT NULL DEFAULT 0,
+    net_minutes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (profile_id, year_month),
+    FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_month_aggregates_insert
+AFTER INSERT ON work_entries
+BEGIN
+    INSERT INTO month_aggregates (profile_id, year_month)
+    SELECT NEW.profile_id, substr(NEW.date, 1, 7)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM month_aggregates
+        WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7)
+    );
+    
+    UPDATE month_aggregates SET
+        entry_count = entry_count + 1,
+        valid_days = valid_days
+            + (wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        work_days = work_days + (NEW.day_type = 'work_day'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        sick_days = sick_days + (NEW.day_type = 'sick_day'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        vacation_days = vacation_days + (NEW.day_type = 'vacation'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        day_offs = day_offs + (NEW.day_type = 'day_off'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        days_with_work = days_with_work
+            + (IFNULL(wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type), 0) > 0),
+        net_minutes = net_minutes
+            + IFNULL(wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type), 0)
+    WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_month_aggregates_delete
+AFTER DELETE ON work_entries
+BEGIN
+    UPDATE month_aggregates SET
+        entry_count = entry_count - 1,
+        valid_days = valid_days
+            - (wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        work_days = work_days - (OLD.day_type = 'work_day'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        sick_days = sick_days - (OLD.day_type = 'sick_day'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        vacation_days = vacation_days - (OLD.day_type = 'vacation'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        day_offs = day_offs - (OLD.day_type = 'day_off'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        days_with_work = days_with_work
+            - (IFNULL(wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type), 0) > 0),
+        net_minutes = net_minutes
+            - IFNULL(wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type), 0)
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7);
+    
+    DELETE FROM month_aggregates
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7) AND entry_count <= 0;
+END;
+
+-- UPDATE = usunięcie starego wkładu + dodanie nowego (ten sam kod co wyżej)
+CREATE TRIGGER IF NOT EXISTS trg_month_aggregates_update
+AFTER UPDATE OF profile_id, date, start_time, end_time, break_minutes, day_type ON work_entries
+BEGIN
+    UPDATE month_aggregates SET
+        entry_count = entry_count - 1,
+        valid_days = valid_days
+            - (wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        work_days = work_days - (OLD.day_type = 'work_day'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        sick_days = sick_days - (OLD.day_type = 'sick_day'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        vacation_days = vacation_days - (OLD.day_type = 'vacation'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        day_offs = day_offs - (OLD.day_type = 'day_off'
+            AND wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type) IS NOT NULL),
+        days_with_work = days_with_work
+            - (IFNULL(wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type), 0) > 0),
+        net_minutes = net_minutes
+            - IFNULL(wh_net_minutes(OLD.date, OLD.start_time, OLD.end_time, OLD.break_minutes, OLD.day_type), 0)
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7);
+    
+    DELETE FROM month_aggregates
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7) AND entry_count <= 0;
+    
+    INSERT INTO month_aggregates (profile_id, year_month)
+    SELECT NEW.profile_id, substr(NEW.date, 1, 7)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM month_aggregates
+        WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7)
+    );
+    
+    UPDATE month_aggregates SET
+        entry_count = entry_count + 1,
+        valid_days = valid_days
+            + (wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        work_days = work_days + (NEW.day_type = 'work_day'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        sick_days = sick_days + (NEW.day_type = 'sick_day'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        vacation_days = vacation_days + (NEW.day_type = 'vacation'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        day_offs = day_offs + (NEW.day_type = 'day_off'
+            AND wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type) IS NOT NULL),
+        days_with_work = days_with_work
+            + (IFNULL(wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type), 0) > 0),
+        net_minutes = net_minutes
+            + IFNULL(wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type), 0)
+    WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7);
+END;
+
+-- Wypełnienie dla istniejących wpisów (to samo zapytanie co Database.rebuild_month_aggregates)
+INSERT OR REPLACE INTO month_aggregates (
+    profile_id, year_month, entry_count, valid_days, work_days, sick_days,
+    vacation_days, day_offs, days_with_work, net_minutes
+)
+SELECT
+    profile_id,
+    substr(date, 1, 7),
+    COUNT(*),
+    SUM(net IS NOT NULL),
+    SUM(day_type = 'work_day' AND net IS NOT NULL),
+    SUM(day_type = 'sick_day' AND net IS NOT NULL),
+    SUM(day_type = 'vacation' AND net IS NOT NULL),
+    SUM(day_type = 'day_off' AND net IS NOT NULL),
+    SUM(IFNULL(net, 0) > 0),
+    SUM(IFNULL(net, 0))
+FROM (
+    SELECT profile_id, date, day_type,
+           wh_net_minutes(date, start_time, end_time, break_minutes, day_type) AS net
+    FROM work_entries
+)
+GROUP BY profile_id, substr(date, 1, 7);
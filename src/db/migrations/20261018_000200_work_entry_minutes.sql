@@ -0,0 +1,120 @@
+-- Wartości minutowe zapisywane razem z wpisem
+--
+-- start_minute / end_minute - minuty od północy (NULL dla pustego lub błędnego czasu)
+-- net_minutes              - minuty netto wg CalcService (NULL = wpis niepoprawny)
+-- is_midnight_crossing     - 1 gdy zmiana przechodzi przez północ
+--
+-- Database liczy je przy każdym zapisie (src/db/entry_minutes.entry_minutes),
+-- więc triggery month_aggregates korzystają z kolumn zamiast parsować HH:MM.
+
+DROP TRIGGER IF EXISTS trg_month_aggregates_insert;
+DROP TRIGGER IF EXISTS trg_month_aggregates_delete;
+DROP TRIGGER IF EXISTS trg_month_aggregates_update;
+
+ALTER TABLE work_entries ADD COLUMN start_minute INTEGER;
+ALTER TABLE work_entries ADD COLUMN end_minute INTEGER;
+ALTER TABLE work_entries ADD COLUMN net_minutes INTEGER;
+ALTER TABLE work_entries ADD COLUMN is_midnight_crossing INTEGER NOT NULL DEFAULT 0;
+
+UPDATE work_entries SET
+    start_minute = wh_time_minutes(start_time),
+    end_minute = wh_time_minutes(end_time),
+    net_minutes = wh_net_minutes(date, start_time, end_time, break_minutes, day_type),
+    is_midnight_crossing = wh_midnight_crossing(date, start_time, end_time, break_minutes, day_type);
+
+CREATE TRIGGER trg_month_aggregates_insert
+AFTER INSERT ON work_entries
+BEGIN
+    INSERT INTO month_aggregates (profile_id, year_month)
+    SELECT NEW.profile_id, substr(NEW.date, 1, 7)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM month_aggregates
+        WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7)
+    );
+    
+    UPDATE month_aggregates SET
+        entry_count = entry_count + 1,
+        valid_days = valid_days + (NEW.net_minutes IS NOT NULL),
+        work_days = work_days + (NEW.day_type = 'work_day' AND NEW.net_minutes IS NOT NULL),
+        sick_days = sick_days + (NEW.day_type = 'sick_day' AND NEW.net_minutes IS NOT NULL),
+        vacation_days = vacation_days + (NEW.day_type = 'vacation' AND NEW.net_minutes IS NOT NULL),
+        day_offs = day_offs + (NEW.day_type = 'day_off' AND NEW.net_minutes IS NOT NULL),
+        days_with_work = days_with_work + (IFNULL(NEW.net_minutes, 0) > 0),
+        net_minutes = net_minutes + IFNULL(NEW.net_minutes, 0)
+    WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7);
+END;
+
+CREATE TRIGGER trg_month_aggregates_delete
+AFTER DELETE ON work_entries
+BEGIN
+    UPDATE month_aggregates SET
+        entry_count = entry_count - 1,
+        valid_days = valid_days - (OLD.net_minutes IS NOT NULL),
+        work_days = work_days - (OLD.day_type = 'work_day' AND OLD.net_minutes IS NOT NULL),
+        sick_days = sick_days - (OLD.day_type = 'sick_day' AND OLD.net_minutes IS NOT NULL),
+        vacation_days = vacation_days - (OLD.day_type = 'vacation' AND OLD.net_minutes IS NOT NULL),
+        day_offs = day_offs - (OLD.day_type = 'day_off' AND OLD.net_minutes IS NOT NULL),
+        days_with_work = days_with_work - (IFNULL(OLD.net_minutes, 0) > 0),
+        net_minutes = net_minutes - IFNULL(OLD.net_minutes, 0)
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7);
+    
+    DELETE FROM month_aggregates
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7) AND entry_count <= 0;
+END;
+
+CREATE TRIGGER trg_month_aggregates_update
+AFTER UPDATE OF profile_id, date, day_type, net_minutes ON work_entries
+BEGIN
+    UPDATE month_aggregates SET
+        entry_count = entry_count - 1,
+        valid_days = valid_days - (OLD.net_minutes IS NOT NULL),
+        work_days = work_days - (OLD.day_type = 'work_day' AND OLD.net_minutes IS NOT NULL),
+        sick_days = sick_days - (OLD.day_type = 'sick_day' AND OLD.net_minutes IS NOT NULL),
+        vacation_days = vacation_days - (OLD.day_type = 'vacation' AND OLD.net_minutes IS NOT NULL),
+        day_offs = day_offs - (OLD.day_type = 'day_off' AND OLD.net_minutes IS NOT NULL),
+        days_with_work = days_with_work - (IFNULL(OLD.net_minutes, 0) > 0),
+        net_minutes = net_minutes - IFNULL(OLD.net_minutes, 0)
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7);
+    
+    DELETE FROM month_aggregates
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7) AND entry_count <= 0;
+    
+    INSERT INTO month_aggregates (profile_id, year_month)
+    SELECT NEW.profile_id, substr(NEW.date, 1, 7)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM month_aggregates
+        WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7)
+    );
+    
+    UPDATE month_aggregates SET
+        entry_count = entry_count + 1,
+        valid_days = valid_days + (NEW.net_minutes IS NOT NULL),
+        work_days = work_days + (NEW.day_type = 'work_day' AND NEW.net_minutes IS NOT NULL),
+        sick_days = sick_days + (NEW.day_type = 'sick_day' AND NEW.net_minutes IS NOT NULL),
+        vacation_days = vacation_days + (NEW.day_type = 'vacation' AND NEW.net_minutes IS NOT NULL),
+        day_offs = day_offs + (NEW.day_type = 'day_off' AND NEW.net_minutes IS NOT NULL),
+        days_with_work = days_with_work + (IFNULL(NEW.net_minutes, 0) > 0),
+        net_minutes = net_minutes + IFNULL(NEW.net_minutes, 0)
+    WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7);
+END;
+
+-- Odtwórz podsumowania z zapisanych kolumn (Database.rebuild_month_aggregates)
+DELETE FROM month_aggregates;
+
+INSERT INTO month_aggregates (
+    profile_id, year_month, entry_count, valid_days, work_days, sick_days,
+    vacation_days, day_offs, days_with_work, net_minutes
+)
+SELECT
+    profile_id,
+    substr(date, 1, 7),
+    COUNT(*),
+    SUM(net_minutes IS NOT NULL),
+    SUM(day_type = 'work_day' AND net_minutes IS NOT NULL),
+    SUM(day_type = 'sick_day' AND net_minutes IS NOT NULL),
+    SUM(day_type = 'vacation' AND net_minutes IS NOT NULL),
+    SUM(day_type = 'day_off' AND net_minutes IS NOT NULL),
+    SUM(IFNULL(net_minutes, 0) > 0),
+    SUM(IFNULL(net_minutes, 0))
+FROM work_entries
+GROUP BY profile_id, substr(date, 1, 7);
@@ -0,0 +1,73 @@
+-- Przeliczanie kolumn minutowych przy zwykłym UPDATE work_entries
+--
+-- Database zapisuje wpisy przez INSERT OR REPLACE (UPSERT_WORK_ENTRY_SQL) i
+-- liczy kolumny minutowe w Pythonie. Bezpośredni UPDATE godzin, przerwy,
+-- daty lub typu dnia zostawiał start_minute / end_minute / net_minutes /
+-- is_midnight_crossing (a przez nie month_aggregates) nieaktualne.
+--
+-- Trigger UPDATE jest teraz jeden: odejmuje stary wiersz od podsumowania,
+-- przelicza kolumny minutowe funkcjami wh_*() i dodaje przeliczony wiersz.
+-- Kolumny minutowe nie są na liście UPDATE OF, więc przeliczenie nie
+-- uruchamia triggera ponownie. Przeliczone net_minutes jest czytane
+-- podzapytaniem (bez UPDATE ... FROM, który wymaga SQLite 3.33).
+--
+-- Funkcje wh_*() rejestruje prepare_connection; na połączeniu bez nich
+-- (np. konsola sqlite3) taki UPDATE kończy się błędem zamiast cicho
+-- rozspójnić dane.
+
+DROP TRIGGER IF EXISTS trg_month_aggregates_update;
+
+CREATE TRIGGER trg_month_aggregates_update
+AFTER UPDATE OF profile_id, date, start_time, end_time, break_minutes, day_type ON work_entries
+BEGIN
+    UPDATE month_aggregates SET
+        entry_count = entry_count - 1,
+        valid_days = valid_days - (OLD.net_minutes IS NOT NULL),
+        work_days = work_days - (OLD.day_type = 'work_day' AND OLD.net_minutes IS NOT NULL),
+        sick_days = sick_days - (OLD.day_type = 'sick_day' AND OLD.net_minutes IS NOT NULL),
+        vacation_days = vacation_days - (OLD.day_type = 'vacation' AND OLD.net_minutes IS NOT NULL),
+        day_offs = day_offs - (OLD.day_type = 'day_off' AND OLD.net_minutes IS NOT NULL),
+        days_with_work = days_with_work - (IFNULL(OLD.net_minutes, 0) > 0),
+        net_minutes = net_minutes - IFNULL(OLD.net_minutes, 0)
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7);
+    
+    DELETE FROM month_aggregates
+    WHERE profile_id = OLD.profile_id AND year_month = substr(OLD.date, 1, 7) AND entry_count <= 0;
+    
+    UPDATE work_entries SET
+        start_minute = wh_time_minutes(NEW.start_time),
+        end_minute = wh_time_minutes(NEW.end_time),
+        net_minutes = wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type),
+        is_midnight_crossing = wh_midnight_crossing(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type)
+    WHERE id = NEW.id;
+    
+    INSERT INTO month_aggregates (profile_id, year_month)
+    SELECT NEW.profile_id, substr(NEW.date, 1, 7)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM month_aggregates
+        WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7)
+    );
+    
+    UPDATE month_aggregates SET
+        entry_count = entry_count + 1,
+        valid_days = valid_days + ((SELECT net_minutes FROM work_entries WHERE id = NEW.id) IS NOT NULL),
+        work_days = work_days + (NEW.day_type = 'work_day' AND (SELECT net_minutes FROM work_entries WHERE id = NEW.id) IS NOT NULL),
+        sick_days = sick_days + (NEW.day_type = 'sick_day' AND (SELECT net_minutes FROM work_entries WHERE id = NEW.id) IS NOT NULL),
+        vacation_days = vacation_days + (NEW.day_type = 'vacation' AND (SELECT net_minutes FROM work_entries WHERE id = NEW.id) IS NOT NULL),
+        day_offs = day_offs + (NEW.day_type = 'day_off' AND (SELECT net_minutes FROM work_entries WHERE id = NEW.id) IS NOT NULL),
+        days_with_work = days_with_work + (IFNULL((SELECT net_minutes FROM work_entries WHERE id = NEW.id), 0) > 0),
+        net_minutes = net_minutes + IFNULL((SELECT net_minutes FROM work_entries WHERE id = NEW.id), 0)
+    WHERE profile_id = NEW.profile_id AND year_month = substr(NEW.date, 1, 7);
+END;
+
+-- Kolumny minutowe są pochodne: bezpośredni zapis innej wartości niż
+-- wyliczona rozspójniłby month_aggregates, więc jest odrzucany
+CREATE TRIGGER trg_work_entries_minutes_guard
+BEFORE UPDATE OF start_minute, end_minute, net_minutes, is_midnight_crossing ON work_entries
+WHEN NEW.start_minute IS NOT wh_time_minutes(NEW.start_time)
+    OR NEW.end_minute IS NOT wh_time_minutes(NEW.end_time)
+    OR NEW.net_minutes IS NOT wh_net_minutes(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type)
+    OR NEW.is_midnight_crossing IS NOT wh_midnight_crossing(NEW.date, NEW.start_time, NEW.end_time, NEW.break_minutes, NEW.day_type)
+BEGIN
+    SELECT RAISE(ABORT, 'Kolumny minutowe wpisu są wyliczane - zmień godziny, przerwę lub typ dnia');
+END;
@@ -0,0 +1,158 @@
+"""
+ConnectionPool - Pula połączeń SQLite bezpieczna dla wątków
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    Pula połączeń: jedno połączenie zapisujące i N połączeń tylko do odczytu
+
+    - Zapis jest serializowany blokadą (RLock) - jeden writer naraz
+    - Czytelnicy dostają połączenie na czas operacji; zagnieżdżone odczyty
+      w tym samym wątku używają tego samego połączenia
+    - Odczyt w wątku, który trzyma writer (np. w transakcji), idzie przez
+      writer, aby widzieć własne niezatwierdzone zmiany
+    - Połączenia tworzone z check_same_thread=False, więc mogą być używane
+      przez wątki robocze (ThreadPoolExecutor)
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        profile,
+        readers: int = 2,
+        on_connect: Optional[Callable[[sqlite3.Connection], None]] = None
+    ):
+        """
+        Inicjalizuj pulę
+
+        Args:
+            db_path: Ścieżka do bazy danych
+            profile: ConnectionProfile stosowany do każdego połączenia
+            readers: Maksymalna liczba połączeń tylko do odczytu
+                (0 - odczyty przez połączenie zapisujące)
+            on_connect: Opcjonalna funkcja wywoływana dla każdego nowego
+                połączenia (np. rejestracja funkcji SQL)
+        """
+        self.db_path = Path(db_path)
+        self.profile = profile
+        self.max_readers = readers
+        self.on_connect = on_connect
+
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._idle_readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all_readers: List[sqlite3.Connection] = []
+        self._create_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Otwórz nowe połączenie z ustawieniami profilu"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=self.profile.timeout,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        self.profile.apply(conn)
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def get_writer(self) -> sqlite3.Connection:
+        """Pobierz (lub otwórz) połączenie zapisujące bez blokady"""
+        with self._create_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            return self._writer
+
+    def _holds_writer(self) -> bool:
+        return getattr(self._local, 'write_depth', 0) > 0
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Wyłączny dostęp do połączenia zapisującego"""
+        with self._write_lock:
+            self._local.write_depth = getattr(self._local, 'write_depth', 0) + 1
+            try:
+                yield self.get_writer()
+            finally:
+                self._local.write_depth -= 1
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Połączenie tylko do odczytu przypisane do bieżącego wątku"""
+        if self._holds_writer() or self.max_readers <= 0:
+            with self.writer() as conn:
+                yield conn
+            return
+
+        current = getattr(self._local, 'reader', None)
+        if current is not None:
+            yield current
+            return
+
+        conn = self._acquire_reader()
+        self._local.reader = conn
+        try:
+            yield conn
+        finally:
+            self._local.reader = None
+            self._idle_readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """
+        Weź wolne połączenie lub otwórz nowe (do limitu), inaczej czekaj
+
+        Oczekiwanie trwa najwyżej profile.timeout sekund (jak na blokadę
+        bazy), więc wyciek połączenia lub zawieszony wątek kończy się
+        błędem zamiast zawieszenia wszystkich kolejnych odczytów.
+
+        Raises:
+            sqlite3.OperationalError: Żadne połączenie nie zwolniło się w czasie
+        """
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._create_lock:
+            if len(self._all_readers) < self.max_readers:
+                conn = self._connect(read_only=True)
+                self._all_readers.append(conn)
+                return conn
+
+        try:
+            return self._idle_readers.get(timeout=self.profile.timeout)
+        except queue.Empty:
+            logger.error(f"Brak wolnego połączenia do odczytu po {self.profile.timeout} s")
+            raise sqlite3.OperationalError(
+                f"Wszystkie połączenia do odczytu ({self.max_readers}) są zajęte "
+                f"dłużej niż {self.profile.timeout} s"
+            ) from None
+
+    def close(self) -> None:
+        """Zamknij wszystkie połączenia"""
+        with self._write_lock, self._create_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers = []
+            self._idle_readers = queue.LifoQueue()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+__all__ = ['ConnectionPool']
@@ -0,0 +1,188 @@
+"""
+WriteBehindQueue - Kolejka zapisów wykonywanych w tle
+
+Zapisy zlecone z wątku UI trafiają do kolejki i są wykonywane przez jeden
+wątek roboczy. Serie zapisów, które nadejdą w krótkim odstępie czasu, są
+łączone w jedną transakcję (jeden COMMIT, jeden fsync).
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Znacznik zatrzymania wątku roboczego
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    Kolejka zapisów z jednym wątkiem zapisującym
+
+    - submit() zwraca Future - UI może od razu zaktualizować widok
+      i uzgodnić go po zakończeniu zapisu
+    - Wątek roboczy bierze wszystkie oczekujące zadania (do MAX_BATCH)
+      i wykonuje je w jednej transakcji Database.transaction()
+    - Każde zadanie działa we własnym SAVEPOINT, więc błąd jednego zadania
+      nie wycofuje pozostałych z tej samej serii
+    - Wyniki Future są ustawiane dopiero po COMMIT
+
+    Seria działa na współdzielonym połączeniu zapisującym puli Database
+    i trzyma jego blokadę do COMMIT. Drugie połączenie nic by nie dało -
+    SQLite i tak dopuszcza jednego zapisującego naraz. Dlatego wątek UI nie
+    może zapisywać bezpośrednio (Database/repozytoria/transaction()), bo
+    czekałby na całą serię; wszystkie zapisy z UI idą przez submit()
+    (w aplikacji: AppContext.save_entry_async, create_profile_async,
+    delete_profile_async, submit_write).
+    """
+
+    # Maksymalna liczba zadań w jednej transakcji
+    MAX_BATCH = 100
+
+    # Czas (s) oczekiwania na kolejne zadania serii po pierwszym zadaniu
+    COALESCE_DELAY = 0.02
+
+    def __init__(self, database, coalesce_delay: Optional[float] = None):
+        """
+        Inicjalizuj kolejkę i uruchom wątek roboczy
+
+        Args:
+            database: Instancja Database
+            coalesce_delay: Czas łączenia serii w sekundach
+                (None - COALESCE_DELAY)
+        """
+        self.db = database
+        self.coalesce_delay = self.COALESCE_DELAY if coalesce_delay is None else coalesce_delay
+        self.batches_committed = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="WriteBehindQueue",
+            daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Zleć zapis do wykonania w tle
+
+        Args:
+            fn: Funkcja wykonująca zapis (wywoływana w wątku roboczym,
+                wewnątrz transakcji)
+            *args, **kwargs: Argumenty funkcji
+
+        Returns:
+            Future z wynikiem fn (ustawiany po COMMIT) lub wyjątkiem
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("Kolejka zapisów jest zamknięta")
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    @property
+    def pending(self) -> int:
+        """Przybliżona liczba zadań oczekujących w kolejce"""
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Poczekaj, aż wszystkie zlecone dotąd zapisy zostaną zakończone"""
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Wykonaj oczekujące zapisy i zatrzymaj wątek roboczy
+
+        Args:
+            timeout: Maksymalny czas oczekiwania na wątek (None - bez limitu)
+        """
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Wątek zapisów nie zakończył się w wyznaczonym czasie")
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # WĄTEK ROBOCZY
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            stopping = self._collect(batch)
+            try:
+                self._execute(batch)
+            finally:
+                for _ in range(len(batch) + (1 if stopping else 0)):
+                    self._queue.task_done()
+
+    def _collect(self, batch: List[Tuple]) -> bool:
+        """
+        Dobierz do serii zadania, które już czekają lub nadejdą w COALESCE_DELAY
+
+        Returns:
+            True jeśli napotkano znacznik zatrzymania
+        """
+        while len(batch) < self.MAX_BATCH:
+            try:
+                if self.coalesce_delay > 0:
+                    item = self._queue.get(timeout=self.coalesce_delay)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _execute(self, batch: List[Tuple]) -> None:
+        """Wykonaj serię zadań w jednej transakcji i ustaw wyniki Future"""
+        outcomes: List[Tuple[Future, bool, Any]] = []
+        try:
+            with self.db.transaction():
+                for future, fn, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with self.db.transaction():
+                            result = fn(*args, **kwargs)
+                    except Exception as e:
+                        logger.error(f"Błąd zapisu w tle: {e}", exc_info=True)
+                        outcomes.append((future, False, e))
+                    else:
+                        outcomes.append((future, True, result))
+        except Exception as e:
+            logger.error(f"Błąd zatwierdzania serii zapisów: {e}", exc_info=True)
+            for future, *_ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_committed += 1
+        logger.debug(f"Zatwierdzono serię {len(outcomes)} zapisów")
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+__all__ = ['WriteBehindQueue']
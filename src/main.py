@@ -5,8 +5,6 @@ WorkHours App - Entry point aplikacji
 import logging
 from pathlib import Path
 from src.app_context import AppContext
-from src.repository import WorkEntryRepository, ProfileRepository
-from src.services import CalcService
 import sys
 
 # Konfiguracja logowania
@@ -50,7 +48,7 @@ def main():
         profile_id = app.get_current_profile_id()
         if profile_id:
             # Pobierz repozytorium
-            repo = WorkEntryRepository(app.database)
+            repo = app.work_entry_repository
             
             # Pobierz wpisy z ostatniego miesiąca
             from datetime import datetime
@@ -2,11 +2,41 @@
 Models - Definicje struktur danych aplikacji WorkHours
 """
 
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, field, fields
+from typing import Dict, NamedTuple, Optional, Tuple
 from datetime import datetime
 
 
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _hydrate(cls, row):
+    """
+    Utwórz instancję modelu z wiersza bazy (dict lub sqlite3.Row)
+    
+    Pomija __init__ i __post_init__ - wartości z bazy są kompletne,
+    więc nie ma czego uzupełniać znacznikiem czasu. Kopiowane są tylko
+    pola modelu (po nazwie, przez setattr - także dla modeli ze __slots__);
+    dodatkowe kolumny wiersza są pomijane.
+    
+    Raises:
+        KeyError: Wiersz nie zawiera któregoś pola modelu
+    """
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    obj = object.__new__(cls)
+    try:
+        for name in names:
+            setattr(obj, name, row[name])
+    except (KeyError, IndexError):   # sqlite3.Row zgłasza IndexError
+        missing = [name for name in names if name not in row.keys()]
+        if not missing:
+            raise
+        raise KeyError(f"Wiersz bez kolumn modelu {cls.__name__}: {', '.join(missing)}") from None
+    return obj
+
+
 @dataclass
 class Profile:
     """
@@ -23,17 +53,24 @@ class Profile:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
+    @classmethod
+    def from_row(cls, row) -> 'Profile':
+        """Szybka hydratacja z wiersza bazy (bez __post_init__)"""
+        return _hydrate(cls, row)
+    
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
-        if self.updated_at is None:
-            self.updated_at = datetime.now().isoformat()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now().isoformat()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkEntry:
     """
-    Model wpisu pracy
+    Model wpisu pracy (__slots__ - bez __dict__ na instancję)
     
     Atrybuty:
         id: Unikalny identyfikator wpisu
@@ -46,6 +83,10 @@ class WorkEntry:
         notes: Opcjonalne notatki
         created_at: Timestamp utworzenia
         updated_at: Timestamp ostatniej aktualizacji
+        start_minute: Start w minutach od północy (liczone przy zapisie)
+        end_minute: Koniec w minutach od północy (liczone przy zapisie)
+        net_minutes: Minuty netto, None dla niepoprawnego wpisu (liczone przy zapisie)
+        is_midnight_crossing: Czy zmiana przechodzi przez północ (liczone przy zapisie)
     """
     id: Optional[int] = None
     profile_id: int = 1
@@ -57,12 +98,25 @@ class WorkEntry:
     notes: str = ""
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    start_minute: Optional[int] = None
+    end_minute: Optional[int] = None
+    net_minutes: Optional[int] = None
+    is_midnight_crossing: bool = False
+    
+    @classmethod
+    def from_row(cls, row) -> 'WorkEntry':
+        """Szybka hydratacja z wiersza bazy (bez __post_init__)"""
+        entry = _hydrate(cls, row)
+        entry.is_midnight_crossing = bool(entry.is_midnight_crossing)
+        return entry
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
-        if self.updated_at is None:
-            self.updated_at = datetime.now().isoformat()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now().isoformat()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     def to_dict(self):
         """Konwertuj model do słownika"""
@@ -76,10 +130,45 @@ class WorkEntry:
             'day_type': self.day_type,
             'notes': self.notes,
             'created_at': self.created_at,
-            'updated_at': self.updated_at
+            'updated_at': self.updated_at,
+            'start_minute': self.start_minute,
+            'end_minute': self.end_minute,
+            'net_minutes': self.net_minutes,
+            'is_midnight_crossing': self.is_midnight_crossing
         }
 
 
+class WorkEntryRecord(NamedTuple):
+    """
+    Niemutowalny, zwarty wariant WorkEntry (krotka bez __dict__)
+    
+    Przeznaczony do odczytów masowych (listy, raporty, podsumowania).
+    Pola jak w WorkEntry; do edycji użyj to_entry().
+    """
+    id: Optional[int]
+    profile_id: int
+    date: str
+    start_time: str
+    end_time: str
+    break_minutes: int
+    day_type: str
+    notes: str
+    created_at: Optional[str]
+    updated_at: Optional[str]
+    start_minute: Optional[int]
+    end_minute: Optional[int]
+    net_minutes: Optional[int]
+    is_midnight_crossing: bool
+    
+    def to_dict(self):
+        """Konwertuj rekord do słownika"""
+        return self._asdict()
+    
+    def to_entry(self) -> WorkEntry:
+        """Konwertuj do mutowalnego WorkEntry"""
+        return WorkEntry(*self)
+
+
 @dataclass
 class Setting:
     """
@@ -102,11 +191,18 @@ class Setting:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
+    @classmethod
+    def from_row(cls, row) -> 'Setting':
+        """Szybka hydratacja z wiersza bazy (bez __post_init__)"""
+        return _hydrate(cls, row)
+    
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
-        if self.updated_at is None:
-            self.updated_at = datetime.now().isoformat()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now().isoformat()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
 
 
 @dataclass
@@ -129,9 +225,14 @@ class CustomTheme:
     config_json: str = "{}"
     created_at: Optional[str] = None
     
+    @classmethod
+    def from_row(cls, row) -> 'CustomTheme':
+        """Szybka hydratacja z wiersza bazy (bez __post_init__)"""
+        return _hydrate(cls, row)
+    
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now().isoformat()
 
 
-__all__ = ['Profile', 'WorkEntry', 'Setting', 'CustomTheme']
+__all__ = ['Profile', 'WorkEntry', 'WorkEntryRecord', 'Setting', 'CustomTheme']
@@ -1,5 +1,6 @@
 """Repository layer"""
 from .work_entry_repository import WorkEntryRepository
 from .profile_repository import ProfileRepository
+from .unit_of_work import UnitOfWork
 
-__all__ = ['WorkEntryRepository', 'ProfileRepository']
+__all__ = ['WorkEntryRepository', 'ProfileRepository', 'UnitOfWork']
@@ -89,20 +89,15 @@ class ProfileRepository:
     
     def exists(self, profile_id: int) -> bool:
         """Sprawdź czy profil istnieje"""
-        return self.get_by_id(profile_id) is not None
+        return self.db.profile_exists(profile_id)
     
     def count(self) -> int:
         """Zlicz wszystkie profile"""
-        return len(self.get_all())
+        return self.db.count_profiles()
     
     def _row_to_model(self, row: Dict) -> Profile:
         """Konwertuj rząd bazy do modelu Profile"""
-        return Profile(
-            id=row['id'],
-            name=row['name'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
-        )
+        return Profile.from_row(row)
 
 
 __all__ = ['ProfileRepository']
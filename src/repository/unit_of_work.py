@@ -0,0 +1,67 @@
+"""
+UnitOfWork - Jednostka pracy obejmująca kilka repozytoriów
+"""
+
+from typing import Optional
+from src.db import Database
+from .work_entry_repository import WorkEntryRepository
+from .profile_repository import ProfileRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWork:
+    """
+    Jednostka pracy - wszystkie zapisy repozytoriów w jednej transakcji
+    
+    Użycie:
+        with UnitOfWork(database) as uow:
+            uow.profiles.delete(old_id)
+            uow.work_entries.create_many(entries)
+    
+    Zmiany są zatwierdzane jednym COMMIT przy wyjściu z bloku, a wyjątek
+    wycofuje wszystkie. Zagnieżdżona jednostka pracy (lub
+    Database.transaction) działa jako SAVEPOINT.
+    """
+    
+    def __init__(
+        self,
+        database: Database,
+        work_entries: Optional[WorkEntryRepository] = None,
+        profiles: Optional[ProfileRepository] = None
+    ):
+        """
+        Inicjalizuj jednostkę pracy
+        
+        Args:
+            database: Instancja bazy danych
+            work_entries: Repozytorium wpisów do użycia (np. współdzielone,
+                z cache); domyślnie nowe
+            profiles: Repozytorium profili; domyślnie nowe
+        """
+        self.db = database
+        self.work_entries = work_entries or WorkEntryRepository(database)
+        self.profiles = profiles or ProfileRepository(database)
+        self._transaction = None
+    
+    def __enter__(self) -> 'UnitOfWork':
+        if self._transaction is not None:
+            raise RuntimeError("UnitOfWork jest już aktywna")
+        self._transaction = self.db.transaction()
+        self._transaction.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        transaction, self._transaction = self._transaction, None
+        try:
+            return transaction.__exit__(exc_type, exc, tb)
+        finally:
+            # Odczyty wewnątrz transakcji widzą niezatwierdzone zmiany,
+            # a po wycofaniu cache mógłby je zachować - czyścimy go zawsze
+            self.work_entries.invalidate_cache()
+            if exc_type is not None:
+                logger.warning(f"UnitOfWork wycofana: {exc}")
+
+
+__all__ = ['UnitOfWork']
@@ -2,10 +2,12 @@
 WorkEntryRepository - Warstwa dostępu do danych wpisów pracy
 """
 
-from typing import List, Optional, Dict
+from collections import OrderedDict
+from typing import List, Optional, Dict, Iterable, Iterator, Tuple
 from datetime import datetime, timedelta
+import threading
 from src.db import Database
-from src.models import WorkEntry
+from src.models import WorkEntry, WorkEntryRecord
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,16 +21,31 @@ class WorkEntryRepository:
     - CRUD operacje
     - Zapytania po dacie, miesiącu
     - Konwersję między modelami i bazą
+    - Opcjonalny cache LRU miesięcy (get_month, get_month_records)
+      unieważniany przy zapisie
+    
+    Cache przechowuje niemutowalne WorkEntryRecord; get_month buduje z nich
+    przy każdym wywołaniu nowe obiekty WorkEntry, więc edycja zwróconego
+    wpisu nie zmienia cache. Cache widzi tylko zapisy wykonane przez tę
+    instancję repozytorium - współdzielona instancja jest
+    w AppContext.work_entry_repository.
     """
     
-    def __init__(self, database: Database):
+    def __init__(self, database: Database, cache_size: int = 0):
         """
         Inicjalizuj repozytorium
         
         Args:
             database: Instancja bazy danych
+            cache_size: Maksymalna liczba miesięcy w cache (0 - bez cache)
         """
         self.db = database
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._month_cache: "OrderedDict[Tuple[int, int, int], Tuple[WorkEntryRecord, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0   # Zwiększany przy każdym unieważnieniu
     
     def create(self, work_entry: WorkEntry) -> int:
         """
@@ -47,7 +64,38 @@ class WorkEntryRepository:
             raise ValueError("profile_id jest wymagany")
         
         entry_dict = work_entry.to_dict()
-        return self.db.insert_work_entry(entry_dict)
+        entry_id = self.db.insert_work_entry(entry_dict)
+        self._invalidate_date(work_entry.profile_id, work_entry.date)
+        return entry_id
+    
+    def create_many(self, work_entries: Iterable[WorkEntry], chunk_size: int = 500) -> List[Dict]:
+        """
+        Utwórz lub zaktualizuj wiele wpisów w jednej transakcji
+        
+        Args:
+            work_entries: Iterowalne obiekty WorkEntry (mogą być generatorem)
+            chunk_size: Rozmiar partii zapisu
+            
+        Returns:
+            Lista {profile_id, date, id, replaced} dla każdego wpisu
+            
+        Raises:
+            ValueError: Jeśli któryś wpis nie ma profile_id (nic nie zostaje zapisane)
+        """
+        touched = []
+        
+        def validated():
+            for work_entry in work_entries:
+                if work_entry.profile_id is None:
+                    raise ValueError("profile_id jest wymagany")
+                touched.append((work_entry.profile_id, work_entry.date))
+                yield work_entry
+        
+        try:
+            return self.db.insert_work_entries_many(validated(), chunk_size=chunk_size)
+        finally:
+            for profile_id, date in touched:
+                self._invalidate_date(profile_id, date)
     
     def get_by_date(self, profile_id: int, date: str) -> Optional[WorkEntry]:
         """
@@ -77,8 +125,53 @@ class WorkEntryRepository:
         Returns:
             Lista WorkEntry dla miesiąca
         """
+        if self.cache_size <= 0:
+            rows = self.db.get_work_entries_month(profile_id, year, month)
+            return [self._row_to_model(row) for row in rows]
+        return [record.to_entry() for record in self._cached_month(profile_id, year, month)]
+    
+    def get_month_records(self, profile_id: int, year: int, month: int) -> List[WorkEntryRecord]:
+        """
+        Pobierz wpisy miesiąca jako zwarte, niemutowalne rekordy
+        
+        Tańsze w pamięci niż get_month - do list i raportów tylko do odczytu.
+        
+        Args:
+            profile_id: ID profilu
+            year: Rok YYYY
+            month: Miesiąc 1-12
+            
+        Returns:
+            Lista WorkEntryRecord dla miesiąca
+        """
+        if self.cache_size <= 0:
+            rows = self.db.get_work_entries_month(profile_id, year, month)
+            return [self._row_to_record(row) for row in rows]
+        return list(self._cached_month(profile_id, year, month))
+    
+    def _cached_month(self, profile_id: int, year: int, month: int) -> Tuple[WorkEntryRecord, ...]:
+        """Rekordy miesiąca z cache (odczyt z bazy przy chybieniu)"""
+        key = (profile_id, year, month)
+        with self._cache_lock:
+            records = self._month_cache.get(key)
+            if records is not None:
+                self._month_cache.move_to_end(key)
+                self.cache_hits += 1
+                return records
+            self.cache_misses += 1
+            generation = self._cache_generation
+        
         rows = self.db.get_work_entries_month(profile_id, year, month)
-        return [self._row_to_model(row) for row in rows]
+        records = tuple(self._row_to_record(row) for row in rows)
+        with self._cache_lock:
+            # Zapis w trakcie odczytu - wynik może być nieaktualny, nie zapamiętuj
+            if generation != self._cache_generation:
+                return records
+            self._month_cache[key] = records
+            self._month_cache.move_to_end(key)
+            while len(self._month_cache) > self.cache_size:
+                self._month_cache.popitem(last=False)
+        return records
     
     def get_week(self, profile_id: int, start_date: str) -> List[WorkEntry]:
         """
@@ -91,17 +184,8 @@ class WorkEntryRepository:
         Returns:
             Lista WorkEntry dla tygodnia
         """
-        entries = []
-        current_date = datetime.strptime(start_date, "%Y-%m-%d")
-        
-        for i in range(7):
-            date_str = current_date.strftime("%Y-%m-%d")
-            entry = self.get_by_date(profile_id, date_str)
-            if entry:
-                entries.append(entry)
-            current_date += timedelta(days=1)
-        
-        return entries
+        end_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=6)
+        return self.get_date_range(profile_id, start_date, end_date.strftime("%Y-%m-%d"))
     
     def get_date_range(
         self,
@@ -120,18 +204,30 @@ class WorkEntryRepository:
         Returns:
             Lista WorkEntry
         """
-        entries = []
-        current_date = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        while current_date <= end_date_obj:
-            date_str = current_date.strftime("%Y-%m-%d")
-            entry = self.get_by_date(profile_id, date_str)
-            if entry:
-                entries.append(entry)
-            current_date += timedelta(days=1)
+        rows = self.db.get_work_entries_range(profile_id, start_date, end_date)
+        return [self._row_to_model(row) for row in rows]
+    
+    def iter_date_range(
+        self,
+        profile_id: int,
+        start_date: str,
+        end_date: str,
+        batch_size: int = 500
+    ) -> Iterator[WorkEntry]:
+        """
+        Strumieniowo iteruj po wpisach z zakresu dat (stała pamięć)
         
-        return entries
+        Args:
+            profile_id: ID profilu
+            start_date: Początkowa data YYYY-MM-DD
+            end_date: Końcowa data YYYY-MM-DD
+            batch_size: Liczba wierszy pobieranych z bazy naraz
+            
+        Returns:
+            Iterator WorkEntry posortowanych po dacie
+        """
+        rows = self.db.iter_work_entries(profile_id, start_date, end_date, batch_size)
+        return (self._row_to_model(row) for row in rows)
     
     def update(self, work_entry: WorkEntry) -> bool:
         """
@@ -145,6 +241,7 @@ class WorkEntryRepository:
         """
         entry_dict = work_entry.to_dict()
         self.db.insert_work_entry(entry_dict)  # UPSERT
+        self._invalidate_date(work_entry.profile_id, work_entry.date)
         return True
     
     def delete(self, profile_id: int, date: str) -> bool:
@@ -158,11 +255,13 @@ class WorkEntryRepository:
         Returns:
             True jeśli usuwanie się powiodło
         """
-        return self.db.delete_work_entry(profile_id, date)
+        deleted = self.db.delete_work_entry(profile_id, date)
+        self._invalidate_date(profile_id, date)
+        return deleted
     
     def delete_month(self, profile_id: int, year: int, month: int) -> int:
         """
-        Usuń wszystkie wpisy z miesiąca
+        Usuń wszystkie wpisy z miesiąca (jedno zapytanie DELETE)
         
         Args:
             profile_id: ID profilu
@@ -172,37 +271,103 @@ class WorkEntryRepository:
         Returns:
             Liczba usuniętych wpisów
         """
-        entries = self.get_month(profile_id, year, month)
-        count = 0
-        
-        for entry in entries:
-            if self.delete(profile_id, entry.date):
-                count += 1
-        
+        count = self.db.delete_work_entries_month(profile_id, year, month)
+        self.invalidate_cache(profile_id, year, month)
         logger.info(f"Usunięto {count} wpisów z {month:02d}/{year}")
         return count
     
     def exists(self, profile_id: int, date: str) -> bool:
         """Sprawdź czy wpis istnieje"""
-        return self.get_by_date(profile_id, date) is not None
+        return self.db.work_entry_exists(profile_id, date)
     
     def count_month(self, profile_id: int, year: int, month: int) -> int:
         """Zlicz wpisy w miesiącu"""
-        return len(self.get_month(profile_id, year, month))
+        return self.db.count_work_entries_month(profile_id, year, month)
+    
+    def get_month_aggregate(self, profile_id: int, year: int, month: int) -> Optional[Dict]:
+        """
+        Pobierz zmaterializowane podsumowanie miesiąca (bez czytania wpisów)
+        
+        Returns:
+            Słownik z polami month_aggregates lub None gdy brak wpisów
+        """
+        return self.db.get_month_aggregate(profile_id, year, month)
+    
+    def get_year_aggregates(self, profile_id: int, year: int) -> List[Dict]:
+        """Pobierz podsumowania miesięcy roku (tylko miesiące z wpisami)"""
+        return self.db.get_year_aggregates(profile_id, year)
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # CACHE MIESIĘCY
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def invalidate_cache(
+        self,
+        profile_id: Optional[int] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None
+    ) -> None:
+        """
+        Usuń miesiące z cache
+        
+        Args:
+            profile_id: Profil (None - cały cache)
+            year: Rok (None - wszystkie miesiące profilu)
+            month: Miesiąc (razem z year)
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            if profile_id is None:
+                self._month_cache.clear()
+            elif year is None:
+                for key in [k for k in self._month_cache if k[0] == profile_id]:
+                    del self._month_cache[key]
+            else:
+                self._month_cache.pop((profile_id, year, month), None)
+    
+    def _invalidate_date(self, profile_id: int, date: str) -> None:
+        """Unieważnij miesiąc zawierający datę"""
+        if self.cache_size <= 0:
+            return
+        try:
+            year, month = int(date[:4]), int(date[5:7])
+        except (TypeError, ValueError):
+            self.invalidate_cache(profile_id)
+            return
+        self.invalidate_cache(profile_id, year, month)
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Statystyki cache: trafienia, chybienia, rozmiar i limit"""
+        with self._cache_lock:
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'size': len(self._month_cache),
+                'max_size': self.cache_size,
+            }
     
     def _row_to_model(self, row: Dict) -> WorkEntry:
         """Konwertuj rząd bazy do modelu WorkEntry"""
-        return WorkEntry(
-            id=row['id'],
-            profile_id=row['profile_id'],
-            date=row['date'],
-            start_time=row['start_time'],
-            end_time=row['end_time'],
-            break_minutes=row['break_minutes'],
-            day_type=row['day_type'],
-            notes=row['notes'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
+        return WorkEntry.from_row(row)
+    
+    @staticmethod
+    def _row_to_record(row: Dict) -> WorkEntryRecord:
+        """Konwertuj rząd bazy do zwartego WorkEntryRecord"""
+        return WorkEntryRecord(
+            row['id'],
+            row['profile_id'],
+            row['date'],
+            row['start_time'],
+            row['end_time'],
+            row['break_minutes'],
+            row['day_type'],
+            row['notes'],
+            row['created_at'],
+            row['updated_at'],
+            row['start_minute'],
+            row['end_minute'],
+            row['net_minutes'],
+            bool(row['is_midnight_crossing'])
         )
 
 
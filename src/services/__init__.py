@@ -1,6 +1,32 @@
 """Services module"""
-from .calc_service import CalcService, WorkDayResult, MonthSummary
-from .pdf_service import PDFService
-from .theme_service import ThemeService, ThemeColors
+import importlib
 
-__all__ = ['CalcService', 'WorkDayResult', 'MonthSummary', 'PDFService', 'ThemeService', 'ThemeColors']
+from .calc_service import (
+    CalcService, WorkDayResult, WorkDayBatchResult, MonthSummary,
+    MonthSummaryAccumulator, IncrementalMonthSummary
+)
+from .range_index import DateRangeIndex, RangeTotals
+
+# Serwisy z ciężkimi zależnościami (ReportLab, motywy) - importowane przy
+# pierwszym odwołaniu do nazwy (PEP 562)
+_LAZY_EXPORTS = {
+    'PDFService': '.pdf_service',
+    'ThemeService': '.theme_service',
+    'ThemeColors': '.theme_service',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    'CalcService', 'WorkDayResult', 'WorkDayBatchResult', 'MonthSummary',
+    'MonthSummaryAccumulator', 'IncrementalMonthSummary', 'DateRangeIndex', 'RangeTotals',
+    'PDFService', 'ThemeService', 'ThemeColors'
+]
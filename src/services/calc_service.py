@@ -3,31 +3,99 @@ CalcService - Serwis obliczeń czasowych
 Obsługuje: godziny pracy, przerwy, przekroczenia północy, dni nierobocze
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from datetime import date as date_cls, datetime, timedelta
+from typing import Any, ClassVar, Dict, Iterable, List, Sequence, Set, Tuple, Optional
 from dataclasses import dataclass
 import logging
+import threading
+
+from src.utils.lazy_import import LazyModule, module_available
+from .range_index import DateRangeIndex, RangeTotals
+
+# NumPy jest opcjonalny - bez niego obliczenia wsadowe idą czystym Pythonem.
+# Importowany dopiero przy pierwszym obliczeniu wsadowym z NumPy.
+NUMPY_AVAILABLE = module_available('numpy')
+np = LazyModule('numpy')
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkDayResult:
-    """Wynik obliczeń dla dnia pracy"""
+    """
+    Wynik obliczeń dla dnia pracy
+    
+    Klasa ze __slots__ (bez __dict__ na instancję); formaty godzin
+    (work_hours_*, net_hours_*) są liczone dopiero przy odczycie.
+    """
     date: str                        # YYYY-MM-DD
     work_minutes: int                # Całkowita liczba minut pracy
-    work_hours_decimal: float        # Format dziesiętny (8.5)
-    work_hours_hm: str               # Format H:MM (8:30)
     break_minutes: int               # Przerwy
     net_minutes: int                 # Minuty netto (work_minutes - break_minutes)
-    net_hours_decimal: float         # Netto dziesiętny
-    net_hours_hm: str                # Netto H:MM
     day_type: str                    # work_day, sick_day, vacation, day_off
     start_time: Optional[str]        # HH:MM
     end_time: Optional[str]          # HH:MM
     is_midnight_crossing: bool       # Czy wygodnie przekracza północ
     is_valid: bool                   # Czy wpis jest poprawny
     error_message: Optional[str]     # Wiadomość o błędzie
+    
+    @property
+    def work_hours_decimal(self) -> float:
+        """Format dziesiętny (8.5)"""
+        return CalcService.minutes_to_decimal_hours(self.work_minutes)
+    
+    @property
+    def work_hours_hm(self) -> str:
+        """Format H:MM (8:30)"""
+        return CalcService.minutes_to_hours_hm(self.work_minutes)
+    
+    @property
+    def net_hours_decimal(self) -> float:
+        """Netto dziesiętny"""
+        return CalcService.minutes_to_decimal_hours(self.net_minutes)
+    
+    @property
+    def net_hours_hm(self) -> str:
+        """Netto H:MM"""
+        return CalcService.minutes_to_hours_hm(self.net_minutes)
+
+
+@dataclass
+class WorkDayBatchResult:
+    """
+    Kolumnowy wynik obliczeń wsadowych (CalcService.calculate_work_days_batch)
+    
+    Kolumny są tablicami NumPy lub listami (gdy NumPy nie jest dostępny);
+    i-ty element każdej kolumny odpowiada i-temu wpisowi wejściowemu.
+    Wartości odpowiadają polom WorkDayResult z calculate_work_day.
+    """
+    dates: Sequence[str]
+    work_minutes: Sequence[int]
+    net_minutes: Sequence[int]
+    status: Sequence[int]            # Kod poprawności (STATUS_*)
+    is_midnight_crossing: Sequence[bool]
+    
+    STATUS_VALID: ClassVar[int] = 0
+    STATUS_INVALID_DATE: ClassVar[int] = 1
+    STATUS_MISSING_TIMES: ClassVar[int] = 2
+    STATUS_INVALID_START: ClassVar[int] = 3
+    STATUS_INVALID_END: ClassVar[int] = 4
+    STATUS_TOO_SHORT: ClassVar[int] = 5
+    STATUS_TOO_LONG: ClassVar[int] = 6
+    STATUS_INVALID_BREAK: ClassVar[int] = 7
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def is_valid(self, index: int) -> bool:
+        """Czy i-ty wpis jest poprawny"""
+        return self.status[index] == self.STATUS_VALID
+    
+    def total_net_minutes(self) -> int:
+        """Suma minut netto poprawnych wpisów"""
+        if np.is_loaded() and isinstance(self.net_minutes, np.ndarray):
+            return int(self.net_minutes[self.status == self.STATUS_VALID].sum())
+        return sum(net for net, code in zip(self.net_minutes, self.status) if code == self.STATUS_VALID)
 
 
 @dataclass
@@ -46,6 +114,204 @@ class MonthSummary:
     days_with_entries: List[str]     # Lista dat z wpisami
 
 
+class MonthSummaryAccumulator:
+    """
+    Jednoprzebiegowy reduktor podsumowania miesiąca
+    
+    Przyjmuje WorkDayResult pojedynczo (add) lub z dowolnego iterowalnego
+    źródła (update), np. generatora czytającego kursor bazy. Częściowe
+    akumulatory (fragmenty danych, wątki) łączy się przez merge.
+    Niepoprawne wyniki są pomijane, jak w calculate_month_summary.
+    """
+    
+    __slots__ = (
+        'year', 'month', 'work_days', 'sick_days', 'vacation_days', 'day_offs',
+        'total_minutes', 'days_with_work', 'days_with_entries'
+    )
+    
+    def __init__(self):
+        self.year = 0
+        self.month = 0
+        self.work_days = 0
+        self.sick_days = 0
+        self.vacation_days = 0
+        self.day_offs = 0
+        self.total_minutes = 0
+        self.days_with_work = 0                 # Dni z net_minutes > 0
+        self.days_with_entries: List[str] = []
+    
+    def add(self, result: WorkDayResult) -> None:
+        """Dodaj wynik jednego dnia"""
+        if not result.is_valid:
+            return
+        if not self.days_with_entries:
+            self.year = int(result.date[:4])
+            self.month = int(result.date[5:7])
+        
+        day_type = result.day_type
+        if day_type == CalcService.WORK_DAY:
+            self.work_days += 1
+        elif day_type == CalcService.SICK_DAY:
+            self.sick_days += 1
+        elif day_type == CalcService.VACATION:
+            self.vacation_days += 1
+        elif day_type == CalcService.DAY_OFF:
+            self.day_offs += 1
+        
+        self.total_minutes += result.net_minutes
+        if result.net_minutes > 0:
+            self.days_with_work += 1
+        self._add_date(result.date)
+    
+    def _add_date(self, date: str) -> None:
+        self.days_with_entries.append(date)
+    
+    def update(self, results: Iterable[WorkDayResult]) -> 'MonthSummaryAccumulator':
+        """Dodaj wszystkie wyniki z iterowalnego źródła"""
+        for result in results:
+            self.add(result)
+        return self
+    
+    def merge(self, other: 'MonthSummaryAccumulator') -> 'MonthSummaryAccumulator':
+        """
+        Dołącz częściowy akumulator (np. z innego fragmentu lub wątku)
+        
+        Rok i miesiąc pochodzą z pierwszego niepustego akumulatora, a daty
+        są dołączane w kolejności łączenia.
+        """
+        if not other.days_with_entries:
+            return self
+        if not self.days_with_entries:
+            self.year = other.year
+            self.month = other.month
+        self.work_days += other.work_days
+        self.sick_days += other.sick_days
+        self.vacation_days += other.vacation_days
+        self.day_offs += other.day_offs
+        self.total_minutes += other.total_minutes
+        self.days_with_work += other.days_with_work
+        for date in other.days_with_entries:
+            self._add_date(date)
+        return self
+    
+    def to_summary(self) -> MonthSummary:
+        """Zbuduj MonthSummary z bieżącego stanu"""
+        average_hours = (
+            self.total_minutes / 60 / self.days_with_work
+            if self.days_with_work > 0 else 0
+        )
+        return MonthSummary(
+            year=self.year,
+            month=self.month,
+            work_days=self.work_days,
+            sick_days=self.sick_days,
+            vacation_days=self.vacation_days,
+            day_offs=self.day_offs,
+            total_work_minutes=self.total_minutes,
+            total_work_hours_decimal=CalcService.minutes_to_decimal_hours(self.total_minutes),
+            total_work_hours_hm=CalcService.minutes_to_hours_hm(self.total_minutes),
+            average_daily_hours=round(average_hours, 2),
+            days_with_entries=list(self.days_with_entries)
+        )
+
+
+class IncrementalMonthSummary(MonthSummaryAccumulator):
+    """
+    Podsumowanie miesiąca aktualizowane przyrostowo
+    
+    Edycja wpisu to replace(stary, nowy) zamiast przeliczania całego
+    miesiąca. Liczba zmian od ostatniej weryfikacji jest zliczana, aby
+    okresowo porównać stan z pełnym przeliczeniem (verify).
+    
+    Daty wpisów są trzymane w zbiorze (usunięcie w O(1)); to_summary
+    zwraca je posortowane, jak pełne przeliczenie wpisów miesiąca.
+    """
+    
+    __slots__ = ('changes_since_verify',)
+    
+    def __init__(self, year: int = 0, month: int = 0):
+        super().__init__()
+        self.year = year
+        self.month = month
+        self.days_with_entries: Set[str] = set()
+        self.changes_since_verify = 0
+    
+    def add(self, result: WorkDayResult) -> None:
+        """Dodaj wynik dnia"""
+        super().add(result)
+        self.changes_since_verify += 1
+    
+    def _add_date(self, date: str) -> None:
+        self.days_with_entries.add(date)
+    
+    def remove(self, result: WorkDayResult) -> None:
+        """Usuń wcześniej dodany wynik dnia"""
+        self.changes_since_verify += 1
+        if not result.is_valid:
+            return
+        
+        day_type = result.day_type
+        if day_type == CalcService.WORK_DAY:
+            self.work_days -= 1
+        elif day_type == CalcService.SICK_DAY:
+            self.sick_days -= 1
+        elif day_type == CalcService.VACATION:
+            self.vacation_days -= 1
+        elif day_type == CalcService.DAY_OFF:
+            self.day_offs -= 1
+        
+        self.total_minutes -= result.net_minutes
+        if result.net_minutes > 0:
+            self.days_with_work -= 1
+        if result.date in self.days_with_entries:
+            self.days_with_entries.remove(result.date)
+        else:
+            logger.warning(f"Usuwany dzień {result.date} nie był w podsumowaniu")
+    
+    def replace(self, old: Optional[WorkDayResult], new: Optional[WorkDayResult]) -> None:
+        """Zamień wynik dnia (old=None - nowy wpis, new=None - usunięcie)"""
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+    
+    def to_summary(self) -> MonthSummary:
+        """Zbuduj MonthSummary (daty posortowane)"""
+        summary = super().to_summary()
+        summary.days_with_entries.sort()
+        return summary
+    
+    def _state(self) -> Tuple:
+        return (
+            self.work_days, self.sick_days, self.vacation_days, self.day_offs,
+            self.total_minutes, self.days_with_work, self.days_with_entries
+        )
+    
+    def verify(self, results: Iterable[WorkDayResult]) -> bool:
+        """
+        Porównaj stan z pełnym przeliczeniem i napraw ewentualny dryf
+        
+        Args:
+            results: Wszystkie wyniki dni miesiąca (źródło prawdy)
+            
+        Returns:
+            True jeśli stan przyrostowy był zgodny
+        """
+        fresh = MonthSummaryAccumulator().update(results)
+        consistent = self._state() == (
+            fresh.work_days, fresh.sick_days, fresh.vacation_days, fresh.day_offs,
+            fresh.total_minutes, fresh.days_with_work, set(fresh.days_with_entries)
+        )
+        if not consistent:
+            logger.warning(f"Dryf podsumowania {self.year}-{self.month:02d} - przeliczono od nowa")
+            for field in MonthSummaryAccumulator.__slots__:
+                if field not in ('year', 'month'):
+                    setattr(self, field, getattr(fresh, field))
+            self.days_with_entries = set(fresh.days_with_entries)
+        self.changes_since_verify = 0
+        return consistent
+
+
 class CalcService:
     """
     Serwis obliczeń czasu pracy
@@ -71,6 +337,18 @@ class CalcService:
     MIN_WORK_MINUTES = 15        # 15 minut
     MAX_WORK_MINUTES = 12 * 60   # 12 godzin
     
+    def __init__(self, database=None):
+        """
+        Inicjalizuj serwis
+        
+        Args:
+            database: Opcjonalna baza danych (Database) - potrzebna tylko
+                dla zapytań o zakresy (range_totals)
+        """
+        self.database = database
+        self._range_indexes: Dict[int, DateRangeIndex] = {}
+        self._range_lock = threading.Lock()
+    
     @staticmethod
     def validate_time_format(time_str: str) -> bool:
         """
@@ -111,7 +389,7 @@ class CalcService:
         try:
             datetime.strptime(date_str, "%Y-%m-%d")
             return True
-        except ValueError:
+        except (ValueError, TypeError):
             return False
     
     @staticmethod
@@ -237,12 +515,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=0,
-                work_hours_decimal=0,
-                work_hours_hm="0:00",
                 break_minutes=0,
                 net_minutes=0,
-                net_hours_decimal=0,
-                net_hours_hm="0:00",
                 day_type=day_type,
                 start_time=start_time,
                 end_time=end_time,
@@ -256,12 +530,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=0,
-                work_hours_decimal=0,
-                work_hours_hm="0:00",
                 break_minutes=0,
                 net_minutes=0,
-                net_hours_decimal=0,
-                net_hours_hm="0:00",
                 day_type=day_type,
                 start_time=None,
                 end_time=None,
@@ -276,12 +546,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=work_minutes,
-                work_hours_decimal=self.minutes_to_decimal_hours(work_minutes),
-                work_hours_hm=self.minutes_to_hours_hm(work_minutes),
                 break_minutes=0,
                 net_minutes=work_minutes,
-                net_hours_decimal=self.minutes_to_decimal_hours(work_minutes),
-                net_hours_hm=self.minutes_to_hours_hm(work_minutes),
                 day_type=day_type,
                 start_time=None,
                 end_time=None,
@@ -295,12 +561,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=0,
-                work_hours_decimal=0,
-                work_hours_hm="0:00",
                 break_minutes=0,
                 net_minutes=0,
-                net_hours_decimal=0,
-                net_hours_hm="0:00",
                 day_type=day_type,
                 start_time=start_time,
                 end_time=end_time,
@@ -314,12 +576,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=0,
-                work_hours_decimal=0,
-                work_hours_hm="0:00",
                 break_minutes=0,
                 net_minutes=0,
-                net_hours_decimal=0,
-                net_hours_hm="0:00",
                 day_type=day_type,
                 start_time=start_time,
                 end_time=end_time,
@@ -332,12 +590,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=0,
-                work_hours_decimal=0,
-                work_hours_hm="0:00",
                 break_minutes=0,
                 net_minutes=0,
-                net_hours_decimal=0,
-                net_hours_hm="0:00",
                 day_type=day_type,
                 start_time=start_time,
                 end_time=end_time,
@@ -356,12 +610,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=0,
-                work_hours_decimal=0,
-                work_hours_hm="0:00",
                 break_minutes=0,
                 net_minutes=0,
-                net_hours_decimal=0,
-                net_hours_hm="0:00",
                 day_type=day_type,
                 start_time=start_time,
                 end_time=end_time,
@@ -374,12 +624,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=0,
-                work_hours_decimal=0,
-                work_hours_hm="0:00",
                 break_minutes=0,
                 net_minutes=0,
-                net_hours_decimal=0,
-                net_hours_hm="0:00",
                 day_type=day_type,
                 start_time=start_time,
                 end_time=end_time,
@@ -393,12 +639,8 @@ class CalcService:
             return WorkDayResult(
                 date=date,
                 work_minutes=work_minutes,
-                work_hours_decimal=self.minutes_to_decimal_hours(work_minutes),
-                work_hours_hm=self.minutes_to_hours_hm(work_minutes),
                 break_minutes=0,
                 net_minutes=work_minutes,
-                net_hours_decimal=self.minutes_to_decimal_hours(work_minutes),
-                net_hours_hm=self.minutes_to_hours_hm(work_minutes),
                 day_type=day_type,
                 start_time=start_time,
                 end_time=end_time,
@@ -413,12 +655,8 @@ class CalcService:
         return WorkDayResult(
             date=date,
             work_minutes=work_minutes,
-            work_hours_decimal=self.minutes_to_decimal_hours(work_minutes),
-            work_hours_hm=self.minutes_to_hours_hm(work_minutes),
             break_minutes=break_minutes,
             net_minutes=net_minutes,
-            net_hours_decimal=self.minutes_to_decimal_hours(net_minutes),
-            net_hours_hm=self.minutes_to_hours_hm(net_minutes),
             day_type=day_type,
             start_time=start_time,
             end_time=end_time,
@@ -427,65 +665,284 @@ class CalcService:
             error_message=None
         )
     
+    # ═══════════════════════════════════════════════════════════════════════
+    # OBLICZENIA WSADOWE
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    # Sentinele czasu w kolumnach wsadowych
+    _TIME_MISSING = -2
+    _TIME_INVALID = -1
+    
+    @classmethod
+    def _parse_time_cached(cls, time_str: Optional[str], cache: Dict[Any, int]) -> int:
+        """HH:MM -> minuty; _TIME_MISSING dla pustego, _TIME_INVALID dla błędnego"""
+        try:
+            return cache[time_str]
+        except KeyError:
+            pass
+        except TypeError:  # niehaszowalne wejście
+            return cls._TIME_INVALID
+        if not time_str:
+            value = cls._TIME_MISSING
+        elif cls.validate_time_format(time_str):
+            value = cls.time_to_minutes(time_str)
+        else:
+            value = cls._TIME_INVALID
+        cache[time_str] = value
+        return value
+    
+    @classmethod
+    def _is_valid_date_fast(cls, date_str: str) -> bool:
+        """validate_date_format z szybką ścieżką dla kanonicznego YYYY-MM-DD"""
+        if (
+            isinstance(date_str, str) and len(date_str) == 10
+            and date_str[4] == '-' and date_str[7] == '-'
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()
+        ):
+            try:
+                date_cls(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+                return True
+            except ValueError:
+                return False
+        return cls.validate_date_format(date_str)
+    
+    def calculate_work_days_batch(
+        self,
+        dates: Sequence[str],
+        start_times: Sequence[Optional[str]],
+        end_times: Sequence[Optional[str]],
+        break_minutes: Sequence[int],
+        day_types: Sequence[str],
+        use_numpy: Optional[bool] = None
+    ) -> WorkDayBatchResult:
+        """
+        Oblicz wiele dni naraz (kolumnowo), bez tworzenia WorkDayResult
+        
+        Reguły są te same co w calculate_work_day. Parsowanie HH:MM jest
+        zapamiętywane (możliwych wartości jest tylko 1440), a arytmetyka
+        i walidacja zakresów idą operacjami na tablicach NumPy.
+        
+        Args:
+            dates: Daty YYYY-MM-DD
+            start_times: Godziny rozpoczęcia (None/"" dla dni wolnych)
+            end_times: Godziny zakończenia
+            break_minutes: Minuty przerwy
+            day_types: Typy dni
+            use_numpy: Wymuś (True) lub wyłącz (False) NumPy;
+                domyślnie NumPy gdy jest zainstalowany
+            
+        Returns:
+            WorkDayBatchResult z kolumnami wyników
+        """
+        n = len(dates)
+        if not (len(start_times) == len(end_times) == len(break_minutes) == len(day_types) == n):
+            raise ValueError("Kolumny wejściowe muszą mieć tę samą długość")
+        if use_numpy is None:
+            use_numpy = NUMPY_AVAILABLE
+        elif use_numpy and not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy nie jest zainstalowany")
+        
+        cache: Dict[Any, int] = {}
+        starts = [self._parse_time_cached(t, cache) for t in start_times]
+        ends = [self._parse_time_cached(t, cache) for t in end_times]
+        date_ok = [self._is_valid_date_fast(d) for d in dates]
+        breaks = [b or 0 for b in break_minutes]
+        
+        if use_numpy:
+            return self._batch_numpy(dates, date_ok, starts, ends, breaks, day_types)
+        return self._batch_python(dates, date_ok, starts, ends, breaks, day_types)
+    
+    def _batch_numpy(self, dates, date_ok, starts, ends, breaks, day_types) -> WorkDayBatchResult:
+        """Ścieżka NumPy obliczeń wsadowych"""
+        R = WorkDayBatchResult
+        start = np.asarray(starts, dtype=np.int32)
+        end = np.asarray(ends, dtype=np.int32)
+        brk = np.asarray(breaks, dtype=np.int32)
+        types = np.asarray(day_types, dtype=object)
+        sick_minutes = int(self.STANDARD_WORKING_HOURS * 60)
+        
+        midnight = end < start
+        work = np.where(midnight, 24 * 60 - start + end, end - start)
+        
+        # Kolejność warunków = kolejność sprawdzeń w calculate_work_day
+        conditions = [
+            ~np.asarray(date_ok, dtype=bool),
+            (types == self.VACATION) | (types == self.DAY_OFF),
+            types == self.SICK_DAY,
+            (start == self._TIME_MISSING) | (end == self._TIME_MISSING),
+            start == self._TIME_INVALID,
+            end == self._TIME_INVALID,
+            work < self.MIN_WORK_MINUTES,
+            work > self.MAX_WORK_MINUTES,
+            (brk < 0) | (brk >= work),
+        ]
+        zero = np.zeros_like(work)
+        no = np.zeros_like(midnight)
+        
+        status = np.select(conditions, [
+            R.STATUS_INVALID_DATE, R.STATUS_VALID, R.STATUS_VALID, R.STATUS_MISSING_TIMES,
+            R.STATUS_INVALID_START, R.STATUS_INVALID_END, R.STATUS_TOO_SHORT,
+            R.STATUS_TOO_LONG, R.STATUS_INVALID_BREAK,
+        ], default=R.STATUS_VALID).astype(np.int8)
+        work_out = np.select(conditions, [
+            zero, zero, zero + sick_minutes, zero, zero, zero, zero, zero, work
+        ], default=work)
+        net_out = np.select(conditions, [
+            zero, zero, zero + sick_minutes, zero, zero, zero, zero, zero, work
+        ], default=work - brk)
+        midnight_out = np.select(conditions, [
+            no, no, no, no, no, no, midnight, midnight, midnight
+        ], default=midnight)
+        
+        return WorkDayBatchResult(
+            dates=list(dates),
+            work_minutes=work_out,
+            net_minutes=net_out,
+            status=status,
+            is_midnight_crossing=midnight_out
+        )
+    
+    def _batch_python(self, dates, date_ok, starts, ends, breaks, day_types) -> WorkDayBatchResult:
+        """Ścieżka czystego Pythona (bez NumPy)"""
+        R = WorkDayBatchResult
+        sick_minutes = int(self.STANDARD_WORKING_HOURS * 60)
+        work_out, net_out, status, midnight_out = [], [], [], []
+        
+        for ok, start, end, brk, day_type in zip(date_ok, starts, ends, breaks, day_types):
+            work, net, midnight = 0, 0, False
+            if not ok:
+                code = R.STATUS_INVALID_DATE
+            elif day_type == self.VACATION or day_type == self.DAY_OFF:
+                code = R.STATUS_VALID
+            elif day_type == self.SICK_DAY:
+                code, work, net = R.STATUS_VALID, sick_minutes, sick_minutes
+            elif start == self._TIME_MISSING or end == self._TIME_MISSING:
+                code = R.STATUS_MISSING_TIMES
+            elif start == self._TIME_INVALID:
+                code = R.STATUS_INVALID_START
+            elif end == self._TIME_INVALID:
+                code = R.STATUS_INVALID_END
+            else:
+                midnight = end < start
+                minutes = 24 * 60 - start + end if midnight else end - start
+                if minutes < self.MIN_WORK_MINUTES:
+                    code = R.STATUS_TOO_SHORT
+                elif minutes > self.MAX_WORK_MINUTES:
+                    code = R.STATUS_TOO_LONG
+                elif brk < 0 or brk >= minutes:
+                    code, work, net = R.STATUS_INVALID_BREAK, minutes, minutes
+                else:
+                    code, work, net = R.STATUS_VALID, minutes, minutes - brk
+            work_out.append(work)
+            net_out.append(net)
+            status.append(code)
+            midnight_out.append(midnight)
+        
+        return WorkDayBatchResult(
+            dates=list(dates),
+            work_minutes=work_out,
+            net_minutes=net_out,
+            status=status,
+            is_midnight_crossing=midnight_out
+        )
+    
     def calculate_month_summary(
         self,
-        work_days: List[WorkDayResult]
+        work_days: Iterable[WorkDayResult]
     ) -> MonthSummary:
         """
-        Oblicz podsumowanie miesiąca
+        Oblicz podsumowanie miesiąca (jeden przebieg, bez list pośrednich)
         
         Args:
-            work_days: Lista wyników obliczeń dla dni
+            work_days: Wyniki obliczeń dla dni - lista lub dowolne iterowalne
+                źródło (np. generator); niepoprawne wyniki są pomijane
             
         Returns:
             Podsumowanie miesiąca
         """
-        if not work_days:
-            return MonthSummary(
-                year=0,
-                month=0,
-                work_days=0,
-                sick_days=0,
-                vacation_days=0,
-                day_offs=0,
-                total_work_minutes=0,
-                total_work_hours_decimal=0,
-                total_work_hours_hm="0:00",
-                average_daily_hours=0,
-                days_with_entries=[]
-            )
-        
-        # Ekstraktuj rok i miesiąc z pierwszego wpisu
-        first_date = work_days[0].date
-        year = int(first_date[:4])
-        month = int(first_date[5:7])
+        return MonthSummaryAccumulator().update(work_days).to_summary()
+    
+    @staticmethod
+    def merge_month_summaries(
+        parts: Iterable[MonthSummaryAccumulator]
+    ) -> MonthSummary:
+        """
+        Połącz częściowe akumulatory w jedno podsumowanie
         
-        # Zlicz dni po typach
-        work_day_count = sum(1 for d in work_days if d.day_type == self.WORK_DAY and d.is_valid)
-        sick_day_count = sum(1 for d in work_days if d.day_type == self.SICK_DAY and d.is_valid)
-        vacation_day_count = sum(1 for d in work_days if d.day_type == self.VACATION and d.is_valid)
-        day_off_count = sum(1 for d in work_days if d.day_type == self.DAY_OFF and d.is_valid)
+        Args:
+            parts: Akumulatory kolejnych fragmentów danych
+            
+        Returns:
+            Podsumowanie miesiąca
+        """
+        total = MonthSummaryAccumulator()
+        for part in parts:
+            total.merge(part)
+        return total.to_summary()
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # SUMY DLA ZAKRESÓW DAT
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def _get_range_index(self, profile_id: int) -> DateRangeIndex:
+        """Indeks profilu - budowany z bazy przy pierwszym użyciu"""
+        index = self._range_indexes.get(profile_id)
+        if index is None:
+            if self.database is None:
+                raise RuntimeError("CalcService bez bazy danych - brak indeksu zakresów")
+            index = DateRangeIndex.from_rows(self.database.get_work_entry_minutes(profile_id))
+            self._range_indexes[profile_id] = index
+            logger.debug(f"Zbudowano indeks zakresów profilu {profile_id} ({len(index)} dni)")
+        return index
+    
+    def range_totals(self, profile_id: int, start: str, end: str) -> RangeTotals:
+        """
+        Sumy godzin i liczby dni dla dowolnego zakresu dat (włącznie)
         
-        # Sumuj minuty (tylko ważne wpisy)
-        total_minutes = sum(d.net_minutes for d in work_days if d.is_valid)
+        Korzysta z indeksu sum prefiksowych (O(log n)) zbudowanego z minut
+        netto zapisanych przy wpisach; niepoprawne wpisy są pomijane.
         
-        # Średnia dziennie (tylko dni pracujące z wpisami)
-        days_with_work = sum(1 for d in work_days if d.is_valid and d.net_minutes > 0)
-        average_hours = (total_minutes / 60 / days_with_work) if days_with_work > 0 else 0
+        Args:
+            profile_id: ID profilu
+            start: Początkowa data YYYY-MM-DD
+            end: Końcowa data YYYY-MM-DD
+            
+        Returns:
+            RangeTotals
+        """
+        with self._range_lock:
+            return self._get_range_index(profile_id).totals(start, end)
+    
+    def apply_range_change(
+        self,
+        profile_id: int,
+        old: Optional[WorkDayResult] = None,
+        new: Optional[WorkDayResult] = None
+    ) -> None:
+        """
+        Zaktualizuj indeks zakresów po edycji wpisu (O(log n))
         
-        return MonthSummary(
-            year=year,
-            month=month,
-            work_days=work_day_count,
-            sick_days=sick_day_count,
-            vacation_days=vacation_day_count,
-            day_offs=day_off_count,
-            total_work_minutes=total_minutes,
-            total_work_hours_decimal=self.minutes_to_decimal_hours(total_minutes),
-            total_work_hours_hm=self.minutes_to_hours_hm(total_minutes),
-            average_daily_hours=round(average_hours, 2),
-            days_with_entries=[d.date for d in work_days if d.is_valid]
-        )
+        Args:
+            profile_id: ID profilu
+            old: Poprzedni wynik dnia (None dla nowego wpisu)
+            new: Nowy wynik dnia (None dla usunięcia)
+        """
+        with self._range_lock:
+            index = self._range_indexes.get(profile_id)
+            if index is None:
+                return
+            if old is not None:
+                index.remove_day(old.date)
+            if new is not None:
+                index.set_day(new.date, new.day_type, new.net_minutes if new.is_valid else None)
+    
+    def invalidate_range_index(self, profile_id: Optional[int] = None) -> None:
+        """Porzuć indeks zakresów (zostanie odbudowany przy kolejnym zapytaniu)"""
+        with self._range_lock:
+            if profile_id is None:
+                self._range_indexes.clear()
+            else:
+                self._range_indexes.pop(profile_id, None)
     
     def estimate_required_time(
         self,
@@ -515,4 +972,7 @@ class CalcService:
         return days_needed, remaining_hours
 
 
-__all__ = ['CalcService', 'WorkDayResult', 'MonthSummary']
+__all__ = [
+    'CalcService', 'WorkDayResult', 'WorkDayBatchResult', 'MonthSummary',
+    'MonthSummaryAccumulator', 'IncrementalMonthSummary', 'RangeTotals'
+]
@@ -7,22 +7,14 @@ from datetime import datetime
 import logging
 from io import BytesIO
 
-# ReportLab imports (zainstalować via pip)
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch, cm
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning("ReportLab nie zainstalowany - PDF nie będzie dostępny")
+from src.utils.lazy_import import module_available
 
 logger = logging.getLogger(__name__)
 
+# ReportLab (zainstalować via pip) - sprawdzany bez importu; importowany
+# dopiero w metodach generujących PDF
+REPORTLAB_AVAILABLE = module_available('reportlab')
+
 
 class PDFService:
     """
@@ -71,6 +63,12 @@ class PDFService:
         if not REPORTLAB_AVAILABLE:
             logger.error("Nie można wygenerować PDF bez ReportLab")
             return None
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.enums import TA_CENTER
         
         try:
             # Utwórz PDF
@@ -229,6 +227,11 @@ class PDFService:
         if not REPORTLAB_AVAILABLE:
             logger.error("Nie można wygenerować PDF bez ReportLab")
             return None
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
         
         try:
             if output_path:
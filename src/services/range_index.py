@@ -0,0 +1,215 @@
+"""
+DateRangeIndex - Indeks sum prefiksowych (drzewo Fenwicka) po dniach
+
+Pozwala policzyć sumę minut netto i liczby dni danego typu dla dowolnego
+zakresu dat w O(log n) oraz aktualizować pojedynczy dzień w O(log n).
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Kolumny indeksu (kolejność pól w wektorze dnia)
+_FIELDS = (
+    'total_work_minutes', 'days_with_entries', 'days_with_work',
+    'work_days', 'sick_days', 'vacation_days', 'day_offs',
+)
+
+_DAY_TYPE_FIELD = {
+    'work_day': 3,
+    'sick_day': 4,
+    'vacation': 5,
+    'day_off': 6,
+}
+
+
+@dataclass
+class RangeTotals:
+    """Sumy dla zakresu dat (włącznie)"""
+    start: str
+    end: str
+    total_work_minutes: int
+    days_with_entries: int           # Liczba poprawnych wpisów
+    days_with_work: int              # Dni z net_minutes > 0
+    work_days: int
+    sick_days: int
+    vacation_days: int
+    day_offs: int
+    
+    @property
+    def total_work_hours_decimal(self) -> float:
+        return round(self.total_work_minutes / 60, 2)
+    
+    @property
+    def total_work_hours_hm(self) -> str:
+        hours, minutes = divmod(self.total_work_minutes, 60)
+        return f"{hours}:{minutes:02d}"
+    
+    @property
+    def average_daily_hours(self) -> float:
+        if self.days_with_work == 0:
+            return 0
+        return round(self.total_work_minutes / 60 / self.days_with_work, 2)
+
+
+class DateRangeIndex:
+    """
+    Drzewo Fenwicka nad kolejnymi dniami kalendarza
+    
+    Pozycja i odpowiada dniu origin + i. Zakres dni rośnie automatycznie
+    (przebudowa z przechowywanych wartości dni), gdy pojawi się data spoza
+    bieżącego zakresu.
+    """
+    
+    # Zapas dni dodawany przy (prze)budowie zakresu
+    PADDING_DAYS = 366
+    
+    def __init__(self):
+        self._days: Dict[int, Tuple[int, ...]] = {}   # ordinal -> wektor pól
+        self._origin = 0
+        self._size = 0
+        self._trees: List[List[int]] = [[] for _ in _FIELDS]
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> 'DateRangeIndex':
+        """
+        Zbuduj indeks z wierszy {date, day_type, net_minutes}
+        
+        Wiersze z net_minutes = None (niepoprawne wpisy) są pomijane.
+        """
+        index = cls()
+        for row in rows:
+            vector = cls._vector(row['day_type'], row['net_minutes'])
+            if vector is not None:
+                index._days[date.fromisoformat(row['date']).toordinal()] = vector
+        index._rebuild()
+        return index
+    
+    def __len__(self) -> int:
+        return len(self._days)
+    
+    @staticmethod
+    def _vector(day_type: str, net_minutes: Optional[int]) -> Optional[Tuple[int, ...]]:
+        """Wektor pól dla jednego dnia (None dla niepoprawnego wpisu)"""
+        if net_minutes is None:
+            return None
+        vector = [net_minutes, 1, 1 if net_minutes > 0 else 0, 0, 0, 0, 0]
+        field = _DAY_TYPE_FIELD.get(day_type)
+        if field is not None:
+            vector[field] = 1
+        return tuple(vector)
+    
+    def _rebuild(self) -> None:
+        """Przebuduj drzewa w O(n) dla zakresu obejmującego wszystkie dni"""
+        ordinals = self._days.keys()
+        if not ordinals:
+            self._origin, self._size = 0, 0
+            self._trees = [[] for _ in _FIELDS]
+            return
+        
+        self._origin = min(ordinals) - self.PADDING_DAYS
+        self._size = max(ordinals) - self._origin + 1 + self.PADDING_DAYS
+        trees = [[0] * (self._size + 1) for _ in _FIELDS]
+        for ordinal, vector in self._days.items():
+            i = ordinal - self._origin + 1
+            for tree, value in zip(trees, vector):
+                tree[i] += value
+        # Liniowa budowa drzewa Fenwicka
+        for tree in trees:
+            for i in range(1, self._size + 1):
+                parent = i + (i & -i)
+                if parent <= self._size:
+                    tree[parent] += tree[i]
+        self._trees = trees
+    
+    def _add(self, ordinal: int, vector: Tuple[int, ...], sign: int) -> None:
+        i = ordinal - self._origin + 1
+        while i <= self._size:
+            for tree, value in zip(self._trees, vector):
+                if value:
+                    tree[i] += sign * value
+            i += i & -i
+    
+    def _prefix(self, ordinal: int) -> List[int]:
+        """Sumy pól dla dni <= ordinal"""
+        sums = [0] * len(_FIELDS)
+        i = min(ordinal - self._origin + 1, self._size)
+        while i > 0:
+            for f, tree in enumerate(self._trees):
+                sums[f] += tree[i]
+            i -= i & -i
+        return sums
+    
+    @staticmethod
+    def _ordinal(date_str: str) -> Optional[int]:
+        """Numer dnia dla daty YYYY-MM-DD (None dla błędnej daty)"""
+        try:
+            return date.fromisoformat(date_str).toordinal()
+        except (TypeError, ValueError):
+            return None
+    
+    def set_day(self, date_str: str, day_type: str, net_minutes: Optional[int]) -> None:
+        """
+        Ustaw wartości dnia (zastępuje poprzednie)
+        
+        Dzień z błędną datą nie może być w indeksie - jest pomijany.
+        
+        Args:
+            date_str: Data YYYY-MM-DD
+            day_type: Typ dnia
+            net_minutes: Minuty netto (None - wpis niepoprawny, dzień usuwany)
+        """
+        vector = self._vector(day_type, net_minutes)
+        if vector is None:
+            self.remove_day(date_str)
+            return
+        
+        ordinal = self._ordinal(date_str)
+        if ordinal is None:
+            logger.warning(f"Pomijam dzień z błędną datą w indeksie zakresów: {date_str!r}")
+            return
+        old = self._days.get(ordinal)
+        self._days[ordinal] = vector
+        if not (self._origin <= ordinal < self._origin + self._size):
+            self._rebuild()
+            return
+        if old is not None:
+            self._add(ordinal, old, -1)
+        self._add(ordinal, vector, 1)
+    
+    def remove_day(self, date_str: str) -> None:
+        """Usuń dzień z indeksu (brak dnia lub błędna data - bez zmian)"""
+        ordinal = self._ordinal(date_str)
+        if ordinal is None:
+            return
+        old = self._days.pop(ordinal, None)
+        if old is not None:
+            self._add(ordinal, old, -1)
+    
+    def totals(self, start: str, end: str) -> RangeTotals:
+        """
+        Sumy dla zakresu dat (włącznie) w O(log n)
+        
+        Args:
+            start: Początkowa data YYYY-MM-DD
+            end: Końcowa data YYYY-MM-DD
+        
+        Returns:
+            RangeTotals
+        """
+        lo = date.fromisoformat(start).toordinal()
+        hi = date.fromisoformat(end).toordinal()
+        if lo > hi:
+            raise ValueError(f"Początek zakresu {start} jest po końcu {end}")
+        
+        upper = self._prefix(hi)
+        lower = self._prefix(lo - 1)
+        values = dict(zip(_FIELDS, (u - l for u, l in zip(upper, lower))))
+        return RangeTotals(start=start, end=end, **values)
+
+
+__all__ = ['DateRangeIndex', 'RangeTotals']
@@ -0,0 +1,65 @@
+"""
+RecycleList - Wirtualizowana lista wierszy oparta o RecycleView
+
+Widżety są tworzone tylko dla widocznych wierszy i używane ponownie przy
+przewijaniu, więc liczba widżetów nie zależy od liczby wpisów. Odświeżenie
+listy to podmiana listy słowników (RecycleView.data) - bez clear_widgets().
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+
+
+class RecycleList(RecycleView):
+    """
+    Lista wierszy tekstowych (lub dowolnej klasy widoku)
+
+    Każdy wiersz to słownik właściwości widżetu viewclass, np. {'text': ...}.
+    Wspólne właściwości wszystkich wierszy (czcionka, kolor) podaje się raz
+    w row_defaults.
+    """
+
+    def __init__(
+        self,
+        viewclass: str = 'Label',
+        row_height: Any = 25,
+        row_defaults: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ):
+        """
+        Inicjalizuj listę
+
+        Args:
+            viewclass: Nazwa klasy widżetu wiersza (zarejestrowana w Factory)
+            row_height: Wysokość wiersza
+            row_defaults: Właściwości wspólne dla wszystkich wierszy
+        """
+        super().__init__(**kwargs)
+        self.viewclass = viewclass
+        self.row_defaults = dict(row_defaults or {})
+
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, row_height),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))  # type: ignore
+        self.add_widget(layout)
+
+    def set_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Podmień wiersze listy (słowniki właściwości widżetu)"""
+        defaults = self.row_defaults
+        self.data = [{**defaults, **row} for row in rows]
+
+    def set_texts(self, texts: Iterable[str]) -> None:
+        """Podmień wiersze listy na wiersze tekstowe"""
+        self.set_rows({'text': text} for text in texts)
+
+    def clear(self) -> None:
+        """Usuń wszystkie wiersze"""
+        self.data = []
+
+
+__all__ = ['RecycleList']
@@ -0,0 +1,94 @@
+"""
+LazyScreenManager - ScreenManager budujący ekrany przy pierwszym wejściu
+
+Ekrany są rejestrowane jako fabryki; obiekt Screen (z wszystkimi
+widżetami) powstaje dopiero przy pierwszej nawigacji do niego. Opcjonalnie
+po wejściu na ekran w wolnej chwili budowany jest ekran, na który
+użytkownik najpewniej przejdzie dalej.
+"""
+
+import time
+from typing import Callable, Dict, Optional
+from kivy.clock import Clock
+from kivy.uix.screenmanager import Screen, ScreenManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LazyScreenManager(ScreenManager):
+    """
+    ScreenManager z leniwą konstrukcją ekranów
+
+    - register(name, factory) zapisuje fabrykę bez tworzenia ekranu
+    - get_screen/has_screen/current działają jak dla zbudowanych ekranów;
+      brakujący ekran jest budowany w get_screen
+    - prefetch: mapa ekran -> prawdopodobny następny ekran, budowany
+      PREFETCH_DELAY s po wejściu na ekran (o ile jeszcze nie istnieje)
+    """
+
+    # Opóźnienie (s) budowy prawdopodobnego następnego ekranu
+    PREFETCH_DELAY = 0.5
+
+    def __init__(self, prefetch: Optional[Dict[str, str]] = None, **kwargs):
+        """
+        Inicjalizuj menedżer
+
+        Args:
+            prefetch: Mapa nazwa ekranu -> ekran budowany z wyprzedzeniem
+                (None - bez prefetchu)
+        """
+        self._factories: Dict[str, Callable[[], Screen]] = {}
+        self.prefetch = dict(prefetch or {})
+        super().__init__(**kwargs)
+        self.bind(current=self._schedule_prefetch)  # type: ignore
+
+    def register(self, name: str, factory: Callable[[], Screen]) -> None:
+        """
+        Zarejestruj fabrykę ekranu
+
+        Args:
+            name: Nazwa ekranu
+            factory: Funkcja bez argumentów zwracająca Screen o tej nazwie
+        """
+        self._factories[name] = factory
+
+    def is_built(self, name: str) -> bool:
+        """Czy ekran został już zbudowany"""
+        return super().has_screen(name)
+
+    def has_screen(self, name: str) -> bool:
+        return name in self._factories or super().has_screen(name)
+
+    def get_screen(self, name: str) -> Screen:
+        if not self.is_built(name) and name in self._factories:
+            self._build(name)
+        return super().get_screen(name)
+
+    def _build(self, name: str) -> Screen:
+        """Zbuduj ekran z fabryki i dodaj go do menedżera"""
+        started = time.perf_counter()
+        screen = self._factories[name]()
+        self.add_widget(screen)
+        logger.info(f"⏱️ Ekran '{name}' zbudowany w {(time.perf_counter() - started) * 1000:.1f} ms")
+        return screen
+
+    def build_all(self) -> None:
+        """Zbuduj wszystkie zarejestrowane ekrany (np. do porównań)"""
+        for name in self._factories:
+            if not self.is_built(name):
+                self._build(name)
+
+    def _schedule_prefetch(self, instance, current: str) -> None:
+        target = self.prefetch.get(current)
+        if target is None or self.is_built(target):
+            return
+        Clock.schedule_once(lambda dt: self._prefetch(target), self.PREFETCH_DELAY)
+
+    def _prefetch(self, name: str) -> None:
+        if not self.is_built(name):
+            logger.info(f"Prefetch ekranu '{name}'")
+            self._build(name)
+
+
+__all__ = ['LazyScreenManager']
@@ -1,13 +1,30 @@
 """
 UI Screens Package
+
+Moduły ekranów (i widżety KivyMD, których używają) są importowane przy
+pierwszym odwołaniu do klasy ekranu (PEP 562).
 """
 
-from .dashboard_screen import DashboardScreen
-from .entry_screen import EntryScreen
-from .report_screen import ReportScreen
-from .settings_screen import SettingsScreen
-from .profile_screen import ProfileScreen
-from .theme_screen import ThemeScreen
+import importlib
+
+_LAZY_EXPORTS = {
+    'DashboardScreen': '.dashboard_screen',
+    'EntryScreen': '.entry_screen',
+    'ReportScreen': '.report_screen',
+    'SettingsScreen': '.settings_screen',
+    'ProfileScreen': '.profile_screen',
+    'ThemeScreen': '.theme_screen',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'DashboardScreen',
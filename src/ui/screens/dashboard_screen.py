@@ -9,7 +9,13 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.gridlayout import MDGridLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.button import MDRaisedButton
+from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.card import MDCard
+from src.ui.view_models import DashboardViewModel
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +33,7 @@ class StatsCard(MDCard):
         self.height = '120dp'
         self.elevation = 2
         self.radius = '12dp'
+        self.unit = unit
         
         # Tytuł
         title_label = MDLabel(
@@ -38,14 +45,20 @@ class StatsCard(MDCard):
         self.add_widget(title_label)
         
         # Wartość
-        value_label = MDLabel(
+        self.value_label = MDLabel(
             text=f"{value} {unit}",
             size_hint_y = None,
             height = '32dp',
             font_size = '28sp',
             bold = True
         )
-        self.add_widget(value_label)
+        self.add_widget(self.value_label)
+    
+    def set_value(self, value: str) -> None:
+        """Zmień wyświetlaną wartość (bez przebudowy karty)"""
+        text = f"{value} {self.unit}"
+        if self.value_label.text != text:
+            self.value_label.text = text
 
 
 class DashboardScreen(Screen):
@@ -59,12 +72,19 @@ class DashboardScreen(Screen):
     - Szybki dostęp do akcji
     """
     
+    # Liczba ostatnich wpisów na ekranie
+    RECENT_ENTRIES = 3
+    
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
         self.current_year = datetime.now().year
         self.current_month = datetime.now().month
         
+        # Stan ostatnio wyświetlonych danych
+        self._view_model = None
+        self._data_version = None
+        
         # Główny layout
         self.main_layout = MDBoxLayout(orientation='vertical', padding='16dp', spacing='12dp')
         self.add_widget(self.main_layout)
@@ -73,42 +93,18 @@ class DashboardScreen(Screen):
         self.load_ui()
     
     def load_ui(self):
-        """Załaduj UI ekranu"""
+        """Zbuduj widżety ekranu (raz) i wypełnij je danymi"""
         logger.info("Ładowanie Dashboard...")
         
         # Tytuł z miesiącem
-        month_label = MDLabel(
+        self.month_label = MDLabel(
             text=self._get_month_title(),
             size_hint_y = None,
             height = '40dp',
             font_size = '24sp',
             bold = True
         )
-        self.main_layout.add_widget(month_label)
-        
-        # Pobierz dane
-        from src.repository import WorkEntryRepository
-        repo = WorkEntryRepository(self.app.app_context.database)
-        entries = repo.get_month(
-            self.app.app_context.get_current_profile_id(),
-            self.current_year,
-            self.current_month
-        )
-        
-        # Oblicz statystyki
-        results = []
-        for entry in entries:
-            result = self.app.app_context.calc_service.calculate_work_day(
-                date=entry.date,
-                start_time=entry.start_time if entry.start_time else None,
-                end_time=entry.end_time if entry.end_time else None,
-                break_minutes=entry.break_minutes,
-                day_type=entry.day_type
-            )
-            if result.is_valid:
-                results.append(result)
-        
-        summary = self.app.app_context.calc_service.calculate_month_summary(results)
+        self.main_layout.add_widget(self.month_label)
         
         # Stats Grid
         stats_grid = MDGridLayout(
@@ -118,22 +114,25 @@ class DashboardScreen(Screen):
             height = '140dp'
         )
         
-        stats_grid.add_widget(StatsCard("Całkowity czas", summary.total_work_hours_hm, "h"))
-        stats_grid.add_widget(StatsCard("Dni pracujące", str(summary.work_days), ""))
-        stats_grid.add_widget(StatsCard("Średnia/dzień", f"{summary.average_daily_hours}", "h"))
+        self.total_card = StatsCard("Całkowity czas", "-", "h")
+        self.work_days_card = StatsCard("Dni pracujące", "-", "")
+        self.average_card = StatsCard("Średnia/dzień", "-", "h")
+        stats_grid.add_widget(self.total_card)
+        stats_grid.add_widget(self.work_days_card)
+        stats_grid.add_widget(self.average_card)
         
         self.main_layout.add_widget(stats_grid)
         
         # Szczegóły
         details_layout = MDBoxLayout(orientation='vertical', spacing='8dp', size_hint_y=None, height='200dp')
         
-        details_label = MDLabel(
-            text=f"Dni chorobowe: {summary.sick_days} | Urlopy: {summary.vacation_days} | Dni wolne: {summary.day_offs}",
+        self.details_label = MDLabel(
+            text="",
             size_hint_y = None,
             height = '32dp',
             font_size = '14sp'
         )
-        details_layout.add_widget(details_label)
+        details_layout.add_widget(self.details_label)
         
         # Ostatnie wpisy
         entries_label = MDLabel(
@@ -145,15 +144,16 @@ class DashboardScreen(Screen):
         )
         details_layout.add_widget(entries_label)
         
-        # Lista ostatnich wpisów
-        for entry in entries[-3:]:
-            entry_text = f"{entry.date}: {entry.start_time}-{entry.end_time if entry.end_time else 'wolne'}"
+        # Stała liczba etykiet ostatnich wpisów (puste, gdy wpisów mniej)
+        self.entry_labels = []
+        for _ in range(self.RECENT_ENTRIES):
             entry_label = MDLabel(
-                text=entry_text,
+                text="",
                 size_hint_y = None,
                 height = '24dp',
                 font_size = '12sp'
             )
+            self.entry_labels.append(entry_label)
             details_layout.add_widget(entry_label)
         
         self.main_layout.add_widget(details_layout)
@@ -176,8 +176,69 @@ class DashboardScreen(Screen):
         scroll.add_widget(MDBoxLayout(size_hint_y=None, height='100dp'))
         self.main_layout.add_widget(scroll)
         
+        self.refresh()
         logger.info("Dashboard załadowany")
     
+    def refresh(self) -> bool:
+        """
+        Zaktualizuj widżety, jeśli dane miesiąca się zmieniły
+        
+        Returns:
+            True jeśli dane zostały ponownie pobrane
+        """
+        ctx = self.app.app_context
+        profile_id = ctx.get_current_profile_id()
+        version = (
+            profile_id,
+            ctx.get_month_version(profile_id, self.current_year, self.current_month)
+        )
+        if version == self._data_version:
+            return False
+        
+        entries = ctx.work_entry_repository.get_month(profile_id, self.current_year, self.current_month)
+        
+        # Podsumowanie miesiąca (utrzymywane przyrostowo w AppContext)
+        summary = ctx.get_month_summary(profile_id, self.current_year, self.current_month)
+        
+        vm = DashboardViewModel.build(
+            ctx.get_current_profile_name(),
+            self.current_year,
+            self.current_month,
+            summary,
+            entries[-self.RECENT_ENTRIES:]
+        )
+        self._apply(vm)
+        self._data_version = version
+        return True
+    
+    def _apply(self, vm: DashboardViewModel) -> None:
+        """Zaktualizuj tylko widżety zależne od zmienionych pól view-modelu"""
+        changed = vm.changed_fields(self._view_model)
+        
+        if changed & {'year', 'month'}:
+            self.month_label.text = self._get_month_title()
+        if 'total_work_hours_hm' in changed:
+            self.total_card.set_value(vm.total_work_hours_hm)
+        if 'work_days' in changed:
+            self.work_days_card.set_value(str(vm.work_days))
+        if 'average_daily_hours' in changed:
+            self.average_card.set_value(f"{vm.average_daily_hours}")
+        if changed & {'sick_days', 'vacation_days', 'day_offs'}:
+            self.details_label.text = (
+                f"Dni chorobowe: {vm.sick_days} | Urlopy: {vm.vacation_days} | Dni wolne: {vm.day_offs}"
+            )
+        if 'recent_entries' in changed:
+            for i, label in enumerate(self.entry_labels):
+                if i < len(vm.recent_entries):
+                    date, _, start, end = vm.recent_entries[i]
+                    text = f"{date}: {start}-{end if end else 'wolne'}"
+                else:
+                    text = ""
+                if label.text != text:
+                    label.text = text
+        
+        self._view_model = vm
+    
     def _get_month_title(self) -> str:
         """Zwróć tytuł miesiąca"""
         months = [
@@ -187,10 +248,10 @@ class DashboardScreen(Screen):
         return f"{months[self.current_month-1]} {self.current_year}"
     
     def on_enter(self):
-        """Odśwież ekran przy wejściu"""
+        """Odśwież ekran przy wejściu (tylko zmienione widżety)"""
         logger.info("Dashboard: on_enter")
-        self.main_layout.clear_widgets()
-        self.load_ui()
+        if not self.refresh():
+            logger.info("Dashboard: dane bez zmian")
 
 
 __all__ = ['DashboardScreen']
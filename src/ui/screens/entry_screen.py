@@ -3,6 +3,7 @@ EntryScreen - Dodawanie i edytowanie wpisów pracy
 """
 
 from datetime import datetime, timedelta
+from kivy.clock import Clock
 from kivy.uix.screenmanager import Screen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.gridlayout import MDGridLayout
@@ -195,7 +196,6 @@ class EntryScreen(Screen):
     def save_entry(self, instance):
         """Zapisz wpis"""
         from src.models import WorkEntry
-        from src.repository import WorkEntryRepository
         
         try:
             # Pobierz wartości
@@ -234,17 +234,28 @@ class EntryScreen(Screen):
                 updated_at=None
             )
             
-            # Zapisz
-            repo = WorkEntryRepository(self.app.app_context.database)
-            repo.create(entry)
+            # Zapisz w tle - wynik uzgadniany w on_entry_saved
+            future = self.app.app_context.save_entry_async(entry)
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self.on_entry_saved(f, entry))
+            )
             
-            logger.info(f"Wpis zapisany: {date}")
+            logger.info(f"Wpis w kolejce zapisu: {date}")
             
             # Powróć do dashboard
             self.app.switch_screen('dashboard')
             
         except Exception as e:
             logger.error(f"Błąd zapisywania wpisu: {e}")
+    
+    def on_entry_saved(self, future, entry):
+        """Obsłuż zakończenie zapisu w tle (wątek główny)"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Błąd zapisywania wpisu {entry.date}: {error}")
+            return
+        
+        logger.info(f"Wpis zapisany: {entry.date}")
 
 
 __all__ = ['EntryScreen']
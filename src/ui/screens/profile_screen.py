@@ -2,6 +2,7 @@
 ProfileScreen - Zarządzanie profilami użytkowników
 """
 
+from kivy.clock import Clock
 from kivy.uix.screenmanager import Screen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.gridlayout import MDGridLayout
@@ -173,7 +174,6 @@ class ProfileScreen(Screen):
                 return
             
             from src.models import Profile
-            from src.repository import ProfileRepository
             
             # Waliduj
             is_valid, msg = self.app.app_context.validators.is_valid_profile_name(name)
@@ -189,18 +189,26 @@ class ProfileScreen(Screen):
                 updated_at=None
             )
             
-            repo = ProfileRepository(self.app.app_context.database)
-            repo.create(profile)
-            
-            logger.info(f"Profil utworzony: {name}")
-            
-            # Przeładuj UI
-            self.clear_widgets()
-            self.load_ui()
+            # Zapis w tle; UI przeładowywane po COMMIT (wątek główny)
+            future = self.app.app_context.create_profile_async(profile)
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self._on_profile_created(f, name))
+            )
             
         except Exception as e:
             logger.error(f"Błąd tworzenia profilu: {e}")
     
+    def _on_profile_created(self, future, name):
+        """Przeładuj UI po utworzeniu profilu"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Błąd tworzenia profilu: {error}")
+            return
+        
+        logger.info(f"Profil utworzony: {name}")
+        self.clear_widgets()
+        self.load_ui()
+    
     def select_profile(self, profile_id, profile_name):
         """Wybierz profil"""
         try:
@@ -239,20 +247,27 @@ class ProfileScreen(Screen):
     def _do_delete_profile(self, profile_id, profile_name, dialog):
         """Faktycznie usuń profil"""
         try:
-            from src.repository import ProfileRepository
-            
-            repo = ProfileRepository(self.app.app_context.database)
-            repo.delete(profile_id)
-            
             dialog.dismiss()
-            logger.info(f"Profil usunięty: {profile_name}")
             
-            # Przeładuj UI
-            self.clear_widgets()
-            self.load_ui()
+            # Usunięcie w tle; UI przeładowywane po COMMIT (wątek główny)
+            future = self.app.app_context.delete_profile_async(profile_id)
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self._on_profile_deleted(f, profile_name))
+            )
             
         except Exception as e:
             logger.error(f"Błąd przy usuwaniu: {e}")
+    
+    def _on_profile_deleted(self, future, profile_name):
+        """Przeładuj UI po usunięciu profilu"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Błąd przy usuwaniu: {error}")
+            return
+        
+        logger.info(f"Profil usunięty: {profile_name}")
+        self.clear_widgets()
+        self.load_ui()
 
 
 __all__ = ['ProfileScreen']
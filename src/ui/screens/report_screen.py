@@ -165,10 +165,9 @@ class ReportScreen(Screen):
             year = int(self.year_spinner.text)
             
             from src.services.pdf_service import PDFService
-            from src.repository import WorkEntryRepository
             
             # Pobierz wpisy
-            repo = WorkEntryRepository(self.app.app_context.database)
+            repo = self.app.app_context.work_entry_repository
             profile_id = self.app.app_context.get_current_profile_id()
             
             # Filtruj wpisy
@@ -208,19 +207,34 @@ class ReportScreen(Screen):
         try:
             year = int(self.year_spinner.text)
             
+            from itertools import groupby
             from src.services.pdf_service import PDFService
-            from src.repository import WorkEntryRepository
+            from src.services.calc_service import MonthSummaryAccumulator
             
-            # Pobierz wszystkie wpisy z roku
-            repo = WorkEntryRepository(self.app.app_context.database)
+            # Podsumowania miesięcy liczone strumieniowo (stała pamięć)
+            repo = self.app.app_context.work_entry_repository
+            calc = self.app.app_context.calc_service
             profile_id = self.app.app_context.get_current_profile_id()
             
-            all_entries = repo.get_all() or []
-            year_entries = [
-                e for e in all_entries
-                if e.profile_id == profile_id and 
-                   e.date.startswith(f"{year:04d}")
-            ]
+            entries = repo.iter_date_range(profile_id, f"{year:04d}-01-01", f"{year:04d}-12-31")
+            summaries = []
+            for month, month_entries in groupby(entries, key=lambda e: int(e.date[5:7])):
+                accumulator = MonthSummaryAccumulator()
+                for entry in month_entries:
+                    accumulator.add(calc.calculate_work_day(
+                        date=entry.date,
+                        start_time=entry.start_time or None,
+                        end_time=entry.end_time or None,
+                        break_minutes=entry.break_minutes,
+                        day_type=entry.day_type
+                    ))
+                summary = accumulator.to_summary()
+                summaries.append({
+                    'year': year,
+                    'month': month,
+                    'total_work_hours_decimal': summary.total_work_hours_decimal,
+                    'average_daily_hours': summary.average_daily_hours,
+                })
             
             # Generuj PDF
             pdf_service = PDFService()
@@ -231,10 +245,8 @@ class ReportScreen(Screen):
             filepath = os.path.join(output_dir, filename)
             
             pdf_service.generate_summary_report(
-                year_entries,
-                year,
-                self.app.app_context.formatters,
-                self.app.app_context.calc_service,
+                self.app.app_context.get_current_profile_name(),
+                summaries,
                 filepath
             )
             
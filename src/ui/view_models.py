@@ -0,0 +1,88 @@
+"""
+View-modele ekranów - niezmienne migawki danych wyświetlanych przez widżety
+
+Ekran buduje widżety raz, a przy odświeżeniu porównuje nowy view-model
+z poprzednim i aktualizuje tylko widżety zależne od zmienionych pól.
+Moduł nie importuje Kivy, więc można go testować bez środowiska UI.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, FrozenSet, Iterable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class DashboardViewModel:
+    """Dane dashboardu dla jednego profilu i miesiąca"""
+    profile_name: str
+    year: int
+    month: int
+    work_days: int
+    sick_days: int
+    vacation_days: int
+    day_offs: int
+    days_with_entries: int
+    total_work_hours_decimal: float
+    total_work_hours_hm: str
+    average_daily_hours: float
+    recent_entries: Tuple[Tuple[str, str, str, str], ...]   # (data, typ dnia, start, koniec)
+
+    @classmethod
+    def build(
+        cls,
+        profile_name: str,
+        year: int,
+        month: int,
+        summary: Any,
+        recent_entries: Iterable[Any]
+    ) -> 'DashboardViewModel':
+        """
+        Zbuduj view-model z podsumowania miesiąca i listy wpisów
+
+        Args:
+            profile_name: Nazwa profilu
+            year: Rok
+            month: Miesiąc
+            summary: MonthSummary
+            recent_entries: Wpisy (WorkEntry) w kolejności wyświetlania
+
+        Returns:
+            DashboardViewModel
+        """
+        return cls(
+            profile_name=profile_name,
+            year=year,
+            month=month,
+            work_days=summary.work_days,
+            sick_days=summary.sick_days,
+            vacation_days=summary.vacation_days,
+            day_offs=summary.day_offs,
+            days_with_entries=len(summary.days_with_entries),
+            total_work_hours_decimal=summary.total_work_hours_decimal,
+            total_work_hours_hm=summary.total_work_hours_hm,
+            average_daily_hours=summary.average_daily_hours,
+            recent_entries=tuple(
+                (e.date, e.day_type, e.start_time or "", e.end_time or "")
+                for e in recent_entries
+            )
+        )
+
+    def changed_fields(self, previous: Optional['DashboardViewModel']) -> FrozenSet[str]:
+        """
+        Pola różniące się od poprzedniego view-modelu
+
+        Args:
+            previous: Poprzedni view-model (None - wszystkie pola)
+
+        Returns:
+            Zbiór nazw zmienionych pól
+        """
+        names = [f.name for f in fields(self)]
+        if previous is None:
+            return frozenset(names)
+        return frozenset(
+            name for name in names
+            if getattr(self, name) != getattr(previous, name)
+        )
+
+
+__all__ = ['DashboardViewModel']
@@ -0,0 +1,67 @@
+"""
+Leniwe importy - ciężkie zależności ładowane przy pierwszym użyciu
+
+Start aplikacji nie powinien płacić za ReportLab, NumPy czy widżety KivyMD,
+dopóki nie są potrzebne. Dostępność modułu sprawdza się bez jego importu
+(module_available), a sam moduł ładuje przy pierwszym dostępie do atrybutu
+(LazyModule).
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any, Optional
+
+
+def module_available(name: str) -> bool:
+    """
+    Sprawdź, czy moduł da się zaimportować - bez wykonywania jego kodu
+
+    Args:
+        name: Pełna nazwa modułu (np. 'reportlab')
+
+    Returns:
+        True jeśli moduł jest zainstalowany
+    """
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """
+    Pośrednik modułu importowanego przy pierwszym dostępie do atrybutu
+
+    Przykład:
+        np = LazyModule('numpy')
+        np.zeros(3)        # tu następuje import numpy
+    """
+
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def is_loaded(self) -> bool:
+        """Czy moduł jest już zaimportowany (przez ten pośrednik lub inaczej)"""
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "załadowany" if self.is_loaded() else "niezaładowany"
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+__all__ = ['module_available', 'LazyModule']
@@ -0,0 +1,195 @@
+"""
+Test AppContext - Testy przyrostowych podsumowań miesięcy
+"""
+
+import pytest
+import tempfile
+import threading
+from pathlib import Path
+from src.app_context import AppContext
+from src.models import Profile, WorkEntry
+from src.repository import WorkEntryRepository
+
+
+@pytest.fixture
+def context():
+    """AppContext na tymczasowej bazie"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ctx = AppContext(str(Path(tmpdir) / "test.db"))
+        yield ctx
+        ctx.write_queue.close()
+        ctx.database.close()
+
+
+def make_entry(profile_id: int, date: str, **kwargs) -> WorkEntry:
+    """Zbuduj WorkEntry z domyślnymi godzinami 08:00-16:00"""
+    values = dict(start_time="08:00", end_time="16:00", break_minutes=0, day_type="work_day")
+    values.update(kwargs)
+    return WorkEntry(id=None, profile_id=profile_id, date=date, **values)
+
+
+class TestAppContextProfile:
+    """Testy bieżącego profilu"""
+    
+    def test_current_profile_model(self, context):
+        """get_current_profile zwraca model Profile bieżącego profilu"""
+        profile = context.get_current_profile()
+        assert profile.id == context.current_profile_id
+        assert profile.name == context.get_current_profile_name()
+        
+        context.current_profile_id = None
+        assert context.get_current_profile() is None
+
+
+class TestAppContextMonthSummaries:
+    """Testy podsumowań utrzymywanych w AppContext"""
+    
+    def test_summary_follows_edits(self, context):
+        """Zapis, edycja i usunięcie aktualizują podsumowanie jak pełne przeliczenie"""
+        profile_id = context.current_profile_id
+        repo = WorkEntryRepository(context.database)
+        repo.create(make_entry(profile_id, "2025-05-05"))
+        
+        assert context.get_month_summary(profile_id, 2025, 5).total_work_minutes == 480
+        
+        new = make_entry(profile_id, "2025-05-06", end_time="12:00")
+        repo.create(new)
+        context.apply_entry_change(None, new)
+        
+        old = repo.get_by_date(profile_id, "2025-05-05")
+        edited = make_entry(profile_id, "2025-05-05", start_time=None, end_time=None, day_type="vacation")
+        repo.create(edited)
+        context.apply_entry_change(old, edited)
+        
+        summary = context.get_month_summary(profile_id, 2025, 5)
+        assert summary.total_work_minutes == 240
+        assert summary.vacation_days == 1
+        
+        repo.delete(profile_id, "2025-05-06")
+        context.apply_entry_change(new, None)
+        
+        summary = context.get_month_summary(profile_id, 2025, 5)
+        assert summary.total_work_minutes == 0
+        assert summary.days_with_entries == ["2025-05-05"]
+    
+    def test_periodic_verification(self, context, monkeypatch):
+        """Po SUMMARY_VERIFY_INTERVAL zmianach stan jest porównywany z bazą"""
+        monkeypatch.setattr(AppContext, "SUMMARY_VERIFY_INTERVAL", 1)
+        profile_id = context.current_profile_id
+        repo = WorkEntryRepository(context.database)
+        context.get_month_summary(profile_id, 2025, 6)
+        
+        # Zapis z pominięciem apply_entry_change - stan przyrostowy się rozjeżdża
+        repo.create(make_entry(profile_id, "2025-06-02"))
+        context.apply_entry_change(None, make_entry(profile_id, "2025-06-03"))
+        
+        summary = context.get_month_summary(profile_id, 2025, 6)
+        assert summary.days_with_entries == ["2025-06-02"]
+        assert summary.total_work_minutes == 480
+    
+    def test_verification_waits_for_pending_writes(self, context, monkeypatch):
+        """Weryfikacja nie startuje między COMMIT zapisu w tle a jego uzgodnieniem"""
+        monkeypatch.setattr(AppContext, "SUMMARY_VERIFY_INTERVAL", 1)
+        profile_id = context.current_profile_id
+        repo = context.work_entry_repository
+        context.get_month_summary(profile_id, 2025, 6)
+        first = make_entry(profile_id, "2025-06-02")
+        repo.create(first)
+        context.apply_entry_change(None, first)
+        
+        # Wstrzymaj uzgodnienie zapisu (po COMMIT, przed apply_entry_change)
+        committed, release = threading.Event(), threading.Event()
+        apply_entry_change = context.apply_entry_change
+        
+        def blocking_apply(old_entry=None, new_entry=None):
+            committed.set()
+            assert release.wait(timeout=5)
+            apply_entry_change(old_entry, new_entry)
+        
+        monkeypatch.setattr(context, 'apply_entry_change', blocking_apply)
+        future = context.save_entry_async(make_entry(profile_id, "2025-06-03"))
+        try:
+            assert committed.wait(timeout=5)
+            assert future.result(timeout=5) is None
+            assert context.get_month_summary(profile_id, 2025, 6).total_work_minutes == 480
+        finally:
+            release.set()
+        context.flush_writes()
+        monkeypatch.setattr(AppContext, "SUMMARY_VERIFY_INTERVAL", 1000)   # Bez naprawy dryfu
+        
+        summary = context.get_month_summary(profile_id, 2025, 6)
+        assert summary.total_work_minutes == 960
+        assert summary.days_with_entries == ["2025-06-02", "2025-06-03"]
+    
+    def test_range_totals_follow_edits(self, context):
+        """apply_entry_change aktualizuje też sumy zakresów"""
+        profile_id = context.current_profile_id
+        repo = WorkEntryRepository(context.database)
+        repo.create(make_entry(profile_id, "2025-08-01"))
+        assert context.calc_service.range_totals(profile_id, "2025-08-01", "2025-08-31").work_days == 1
+        
+        new = make_entry(profile_id, "2025-08-04", end_time="10:00")
+        repo.create(new)
+        context.apply_entry_change(None, new)
+        
+        totals = context.calc_service.range_totals(profile_id, "2025-08-01", "2025-08-31")
+        assert totals.work_days == 2
+        assert totals.total_work_minutes == 600
+    
+    def test_invalidate(self, context):
+        """Unieważnienie wymusza ponowne przeliczenie z bazy"""
+        profile_id = context.current_profile_id
+        repo = WorkEntryRepository(context.database)
+        context.get_month_summary(profile_id, 2025, 7)
+        repo.create(make_entry(profile_id, "2025-07-01"))
+        
+        context.invalidate_month_summaries(profile_id)
+        
+        assert context.get_month_summary(profile_id, 2025, 7).work_days == 1
+    
+    def test_async_save_reconciles_summary(self, context):
+        """Zapis w tle aktualizuje podsumowanie i cache po COMMIT"""
+        profile_id = context.current_profile_id
+        assert context.get_month_summary(profile_id, 2025, 6).total_work_minutes == 0
+        assert context.work_entry_repository.get_month(profile_id, 2025, 6) == []
+        
+        first = context.save_entry_async(make_entry(profile_id, "2025-06-02"))
+        second = context.save_entry_async(make_entry(profile_id, "2025-06-02", end_time="12:00"))
+        assert first.result(timeout=5) is None
+        assert second.result(timeout=5).end_time == "16:00"
+        context.flush_writes()
+        
+        summary = context.get_month_summary(profile_id, 2025, 6)
+        assert summary.total_work_minutes == 240
+        entries = context.work_entry_repository.get_month(profile_id, 2025, 6)
+        assert [e.end_time for e in entries] == ["12:00"]
+    
+    def test_async_profile_create_and_delete(self, context):
+        """Profil tworzony i usuwany przez kolejkę zapisów"""
+        profile_id = context.create_profile_async(Profile(name="Async")).result(timeout=5)
+        assert context.database.get_profile(profile_id)['name'] == "Async"
+        
+        context.save_entry_async(make_entry(profile_id, "2025-06-02")).result(timeout=5)
+        assert context.get_month_summary(profile_id, 2025, 6).total_work_minutes == 480
+        version = context.get_month_version(profile_id, 2025, 6)
+        
+        assert context.delete_profile_async(profile_id).result(timeout=5) is True
+        context.flush_writes()
+        assert context.database.get_profile(profile_id) is None
+        assert context.get_month_version(profile_id, 2025, 6) > version
+        assert context.get_month_summary(profile_id, 2025, 6).total_work_minutes == 0
+    
+    def test_month_version(self, context):
+        """Wersja miesiąca rośnie tylko przy zmianach jego danych"""
+        profile_id = context.current_profile_id
+        may = context.get_month_version(profile_id, 2025, 5)
+        june = context.get_month_version(profile_id, 2025, 6)
+        
+        context.apply_entry_change(None, make_entry(profile_id, "2025-05-07"))
+        assert context.get_month_version(profile_id, 2025, 5) > may
+        assert context.get_month_version(profile_id, 2025, 6) == june
+        
+        may = context.get_month_version(profile_id, 2025, 5)
+        context.invalidate_month_summaries(profile_id)
+        assert context.get_month_version(profile_id, 2025, 5) > may
+        assert context.get_month_version(profile_id, 2025, 6) > june
@@ -3,8 +3,15 @@ Test CalcService - Testy jednostkowe dla logiki obliczeń czasowych
 """
 
 import pytest
-from datetime import datetime, timedelta
-from src.services.calc_service import CalcService, WorkDayResult, MonthSummary
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from src.services.calc_service import (
+    CalcService, WorkDayResult, WorkDayBatchResult, MonthSummary, MonthSummaryAccumulator,
+    IncrementalMonthSummary, NUMPY_AVAILABLE
+)
+from src.services.range_index import DateRangeIndex
 
 
 class TestCalcServiceValidation:
@@ -239,6 +246,107 @@ class TestCalcServiceWorkday:
         assert "brakuje" in result.error_message.lower()
 
 
+class TestCalcServiceResultModel:
+    """Testy zwartego modelu WorkDayResult"""
+    
+    def test_no_instance_dict(self):
+        """WorkDayResult nie ma __dict__ (__slots__)"""
+        result = CalcService().calculate_work_day("2025-01-15", "08:00", "16:30", 30)
+        
+        assert not hasattr(result, "__dict__")
+    
+    def test_lazy_formats(self):
+        """Formaty godzin są liczone z minut przy odczycie"""
+        result = CalcService().calculate_work_day("2025-01-15", "08:00", "16:30", 30)
+        
+        assert result.work_hours_hm == "8:30"
+        assert result.work_hours_decimal == 8.5
+        assert result.net_hours_hm == "8:00"
+        assert result.net_hours_decimal == 8.0
+
+
+class TestCalcServiceBatch:
+    """Testy obliczeń wsadowych (zgodność z calculate_work_day)"""
+    
+    ROWS = [
+        ("2025-01-15", "08:00", "16:00", 30, "work_day"),
+        ("2025-01-16", "22:00", "06:00", 30, "work_day"),
+        ("2025-01-17", None, None, 0, "vacation"),
+        ("2025-01-18", "", "", 0, "day_off"),
+        ("2025-01-19", None, None, 0, "sick_day"),
+        ("2025-01-20", "08:00", "08:10", 0, "work_day"),
+        ("2025-01-21", "06:00", "19:00", 0, "work_day"),
+        ("2025-01-22", "08:00", "09:00", 60, "work_day"),
+        ("2025-01-23", "08:00", "09:00", -5, "work_day"),
+        ("2025-01-24", "25:00", "09:00", 0, "work_day"),
+        ("2025-01-25", "08:00", "9.00", 0, "work_day"),
+        ("2025-01-26", None, "16:00", 0, "work_day"),
+        ("2025-02-30", "08:00", "16:00", 0, "work_day"),
+        ("2025-1-5", "08:00", "16:00", 0, "work_day"),
+        ("2025-W03-1", "08:00", "16:00", 0, "work_day"),
+        ("2025-01-27", "23:00", "11:30", 0, "work_day"),
+        ("2025-01-28", "8:05", "16:00", 15, "work_day"),
+    ]
+    
+    @pytest.fixture
+    def service(self):
+        return CalcService()
+    
+    def _modes(self):
+        return [False, True] if NUMPY_AVAILABLE else [False]
+    
+    def _columns(self, rows):
+        return [list(column) for column in zip(*rows)]
+    
+    def test_batch_matches_scalar(self, service):
+        """Każdy wiersz wsadu zgadza się z calculate_work_day"""
+        for use_numpy in self._modes():
+            result = service.calculate_work_days_batch(*self._columns(self.ROWS), use_numpy=use_numpy)
+            
+            assert len(result) == len(self.ROWS)
+            for i, row in enumerate(self.ROWS):
+                scalar = service.calculate_work_day(*row)
+                assert result.is_valid(i) == scalar.is_valid, row
+                assert int(result.work_minutes[i]) == scalar.work_minutes, row
+                assert int(result.net_minutes[i]) == scalar.net_minutes, row
+                assert bool(result.is_midnight_crossing[i]) == scalar.is_midnight_crossing, row
+    
+    def test_batch_status_codes(self, service):
+        """Kody statusu wskazują przyczynę niepoprawności"""
+        result = service.calculate_work_days_batch(*self._columns(self.ROWS), use_numpy=False)
+        
+        assert result.status[0] == WorkDayBatchResult.STATUS_VALID
+        assert result.status[5] == WorkDayBatchResult.STATUS_TOO_SHORT
+        assert result.status[6] == WorkDayBatchResult.STATUS_TOO_LONG
+        assert result.status[7] == WorkDayBatchResult.STATUS_INVALID_BREAK
+        assert result.status[9] == WorkDayBatchResult.STATUS_INVALID_START
+        assert result.status[10] == WorkDayBatchResult.STATUS_INVALID_END
+        assert result.status[11] == WorkDayBatchResult.STATUS_MISSING_TIMES
+        assert result.status[12] == WorkDayBatchResult.STATUS_INVALID_DATE
+    
+    def test_batch_total_net_minutes(self, service):
+        """Suma minut netto obejmuje tylko poprawne wpisy"""
+        result = service.calculate_work_days_batch(*self._columns(self.ROWS))
+        expected = sum(
+            r.net_minutes for r in (service.calculate_work_day(*row) for row in self.ROWS)
+            if r.is_valid
+        )
+        
+        assert result.total_net_minutes() == expected
+    
+    def test_batch_empty(self, service):
+        """Pusty wsad"""
+        result = service.calculate_work_days_batch([], [], [], [], [])
+        
+        assert len(result) == 0
+        assert result.total_net_minutes() == 0
+    
+    def test_batch_length_mismatch(self, service):
+        """Kolumny różnej długości"""
+        with pytest.raises(ValueError):
+            service.calculate_work_days_batch(["2025-01-15"], [], [], [], [])
+
+
 class TestCalcServiceMonthlySummary:
     """Testy podsumowań miesięcznych"""
     
@@ -289,6 +397,242 @@ class TestCalcServiceMonthlySummary:
         assert summary.total_work_minutes == 480
 
 
+class TestCalcServiceSummaryReducer:
+    """Testy jednoprzebiegowego reduktora podsumowań"""
+    
+    @pytest.fixture
+    def service(self):
+        return CalcService()
+    
+    @pytest.fixture
+    def results(self, service):
+        rows = [
+            ("2025-03-03", "08:00", "16:00", 30, "work_day"),
+            ("2025-03-04", "22:00", "06:00", 30, "work_day"),
+            ("2025-03-05", None, None, 0, "sick_day"),
+            ("2025-03-06", None, None, 0, "vacation"),
+            ("2025-03-07", None, None, 0, "day_off"),
+            ("2025-03-10", "08:00", "08:05", 0, "work_day"),
+            ("2025-03-11", "07:30", "15:45", 45, "work_day"),
+        ]
+        return [service.calculate_work_day(*row) for row in rows]
+    
+    def test_generator_input(self, service, results):
+        """Generator daje ten sam wynik co lista"""
+        from_list = service.calculate_month_summary(results)
+        from_generator = service.calculate_month_summary(r for r in results)
+        
+        assert from_generator == from_list
+        assert from_list.year == 2025
+        assert from_list.month == 3
+        assert from_list.work_days == 3
+        assert from_list.sick_days == 1
+        assert from_list.vacation_days == 1
+        assert from_list.day_offs == 1
+        assert len(from_list.days_with_entries) == 6
+    
+    def test_invalid_results_skipped(self, service, results):
+        """Niepoprawne dni nie wpływają na podsumowanie"""
+        valid = [r for r in results if r.is_valid]
+        
+        assert service.calculate_month_summary(results) == service.calculate_month_summary(valid)
+    
+    def test_merge_partial_summaries(self, service, results):
+        """Połączone fragmenty dają ten sam wynik co jeden przebieg"""
+        parts = [
+            MonthSummaryAccumulator().update(results[i:i + 3])
+            for i in range(0, len(results), 3)
+        ]
+        
+        merged = service.merge_month_summaries(parts)
+        
+        assert merged == service.calculate_month_summary(results)
+    
+    def test_merge_with_empty(self, service, results):
+        """Łączenie z pustym akumulatorem nie zmienia wyniku"""
+        accumulator = MonthSummaryAccumulator().merge(MonthSummaryAccumulator().update(results))
+        accumulator.merge(MonthSummaryAccumulator())
+        
+        assert accumulator.to_summary() == service.calculate_month_summary(results)
+
+
+class TestCalcServiceIncrementalSummary:
+    """Testy przyrostowego podsumowania miesiąca"""
+    
+    @pytest.fixture
+    def service(self):
+        return CalcService()
+    
+    def test_replace_matches_recompute(self, service):
+        """Edycja przez replace daje ten sam wynik co pełne przeliczenie"""
+        first = service.calculate_work_day("2025-04-01", "08:00", "16:00", 30, "work_day")
+        second = service.calculate_work_day("2025-04-02", "22:00", "06:00", 30, "work_day")
+        edited = service.calculate_work_day("2025-04-02", None, None, 0, "sick_day")
+        
+        summary = IncrementalMonthSummary(2025, 4)
+        summary.update([first, second])
+        summary.replace(second, edited)
+        
+        assert summary.to_summary() == service.calculate_month_summary([first, edited])
+    
+    def test_add_and_remove(self, service):
+        """Dodanie i usunięcie wraca do stanu początkowego"""
+        day = service.calculate_work_day("2025-04-03", "09:00", "17:00", 0, "work_day")
+        summary = IncrementalMonthSummary(2025, 4)
+        
+        summary.add(day)
+        summary.remove(day)
+        
+        result = summary.to_summary()
+        assert result.total_work_minutes == 0
+        assert result.work_days == 0
+        assert result.days_with_entries == []
+        assert summary.changes_since_verify == 2
+    
+    def test_out_of_order_edits_match_recompute(self, service):
+        """Wpisy dodawane w dowolnej kolejności dają daty jak pełne przeliczenie"""
+        days = [
+            service.calculate_work_day(f"2025-04-{d:02d}", "08:00", "16:00", 0, "work_day")
+            for d in (1, 2, 3)
+        ]
+        summary = IncrementalMonthSummary(2025, 4)
+        for day in (days[2], days[0], days[1]):
+            summary.add(day)
+        summary.replace(days[1], days[1])
+        
+        assert summary.to_summary() == service.calculate_month_summary(days)
+        assert summary.verify(days) is True
+    
+    def test_verify_repairs_drift(self, service):
+        """Weryfikacja wykrywa dryf i przywraca poprawny stan"""
+        day = service.calculate_work_day("2025-04-04", "08:00", "16:00", 0, "work_day")
+        summary = IncrementalMonthSummary(2025, 4)
+        summary.add(day)
+        summary.total_minutes += 5
+        
+        assert summary.verify([day]) is False
+        assert summary.total_minutes == 480
+        assert summary.changes_since_verify == 0
+        assert summary.verify([day]) is True
+
+
+class TestCalcServiceRangeTotals:
+    """Testy sum dla zakresów dat (indeks sum prefiksowych)"""
+    
+    @pytest.fixture
+    def db(self):
+        from src.db import Database
+        with tempfile.TemporaryDirectory() as tmpdir:
+            database = Database(str(Path(tmpdir) / "test.db"))
+            yield database
+            database.close()
+    
+    @pytest.fixture
+    def seeded(self, db):
+        """Profil z losowymi wpisami z dwóch lat"""
+        profile_id = db.create_profile("Range")
+        rng = random.Random(7)
+        entries = []
+        day = date(2024, 1, 1)
+        while day < date(2026, 1, 1):
+            if rng.random() < 0.7:
+                day_type = rng.choice(["work_day"] * 6 + ["sick_day", "vacation", "day_off"])
+                start, end = ("08:00", rng.choice(["12:00", "16:30", "08:05"])) if day_type == "work_day" else ("", "")
+                entries.append({
+                    'profile_id': profile_id, 'date': day.isoformat(), 'start_time': start,
+                    'end_time': end, 'break_minutes': 30, 'day_type': day_type
+                })
+            day += timedelta(days=1)
+        db.insert_work_entries_many(entries)
+        return CalcService(db), profile_id, entries
+    
+    def _brute_force(self, service, entries, start, end):
+        results = [
+            service.calculate_work_day(e['date'], e['start_time'] or None, e['end_time'] or None,
+                                       e['break_minutes'], e['day_type'])
+            for e in entries if start <= e['date'] <= end
+        ]
+        return service.calculate_month_summary(results)
+    
+    def test_matches_full_scan(self, seeded):
+        """Sumy z indeksu zgadzają się z pełnym przeliczeniem"""
+        service, profile_id, entries = seeded
+        for start, end in [("2024-03-03", "2024-08-17"), ("2023-01-01", "2027-01-01"),
+                           ("2025-02-28", "2025-02-28"), ("2024-12-31", "2025-01-01")]:
+            totals = service.range_totals(profile_id, start, end)
+            expected = self._brute_force(service, entries, start, end)
+            
+            assert totals.total_work_minutes == expected.total_work_minutes
+            assert totals.days_with_entries == len(expected.days_with_entries)
+            assert totals.work_days == expected.work_days
+            assert totals.sick_days == expected.sick_days
+            assert totals.vacation_days == expected.vacation_days
+            assert totals.day_offs == expected.day_offs
+            assert totals.average_daily_hours == expected.average_daily_hours
+    
+    def test_updates_after_edit(self, seeded, monkeypatch):
+        """apply_range_change aktualizuje indeks bez przebudowy"""
+        service, profile_id, entries = seeded
+        taken = {e['date'] for e in entries}
+        free_day = next(
+            d for d in (date(2025, 6, 1) + timedelta(days=i) for i in range(60))
+            if d.isoformat() not in taken
+        ).isoformat()
+        before = service.range_totals(profile_id, "2025-06-01", "2025-07-31")
+        
+        def no_rebuild(index):
+            raise AssertionError("indeks nie powinien być przebudowywany")
+        monkeypatch.setattr(DateRangeIndex, '_rebuild', no_rebuild)
+        
+        new = service.calculate_work_day(free_day, "08:00", "16:00", 0, "work_day")
+        service.apply_range_change(profile_id, new=new)
+        after = service.range_totals(profile_id, "2025-06-01", "2025-07-31")
+        
+        assert after.total_work_minutes == before.total_work_minutes + 480
+        assert after.work_days == before.work_days + 1
+        assert after.days_with_entries == before.days_with_entries + 1
+        
+        service.apply_range_change(profile_id, old=new)
+        assert service.range_totals(profile_id, "2025-06-01", "2025-07-31") == before
+    
+    def test_edit_outside_range_rebuilds(self, seeded):
+        """Dzień poza indeksowanym zakresem rozszerza indeks"""
+        service, profile_id, _ = seeded
+        assert service.range_totals(profile_id, "2030-01-01", "2030-12-31").total_work_minutes == 0
+        
+        new = service.calculate_work_day("2030-06-01", "08:00", "16:00", 0, "work_day")
+        service.apply_range_change(profile_id, new=new)
+        
+        assert service.range_totals(profile_id, "2030-01-01", "2030-12-31").total_work_minutes == 480
+    
+    def test_invalid_dates_are_ignored(self, seeded):
+        """Wpis z błędną datą nie zmienia indeksu i nie zgłasza wyjątku"""
+        service, profile_id, _ = seeded
+        before = service.range_totals(profile_id, "2024-01-01", "2025-12-31")
+        
+        old = service.calculate_work_day("2025-02-30", "08:00", "16:00", 0, "work_day")
+        new = service.calculate_work_day("2025-13-01", "08:00", "16:00", 0, "work_day")
+        service.apply_range_change(profile_id, old=old, new=new)
+        
+        index = DateRangeIndex()
+        index.remove_day("2025-02-30")
+        index.set_day("nie-data", "work_day", 480)
+        
+        assert len(index) == 0
+        assert service.range_totals(profile_id, "2024-01-01", "2025-12-31") == before
+    
+    def test_invalid_range(self, seeded):
+        """Początek zakresu po końcu"""
+        service, profile_id, _ = seeded
+        with pytest.raises(ValueError):
+            service.range_totals(profile_id, "2025-02-01", "2025-01-01")
+    
+    def test_requires_database(self):
+        """Bez bazy danych indeks nie może powstać"""
+        with pytest.raises(RuntimeError):
+            CalcService().range_totals(1, "2025-01-01", "2025-01-31")
+
+
 class TestCalcServiceEstimation:
     """Testy estymacji"""
     
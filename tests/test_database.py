@@ -3,10 +3,13 @@ Test Database - Testy integracyjne bazy danych
 """
 
 import pytest
+import shutil
 import sqlite3
 import tempfile
+import threading
 from pathlib import Path
-from src.db import Database
+from src.db import Database, ConnectionProfile, MigrationRunner
+from src.db.entry_minutes import entry_minutes
 
 
 @pytest.fixture
@@ -47,6 +50,141 @@ class TestDatabaseInitialization:
         profiles = db.get_all_profiles()
         assert len(profiles) > 0
         assert profiles[0]['name'] == 'Default User'
+    
+    def test_schema_version_stamp(self, temp_db):
+        """Po inicjalizacji PRAGMA user_version zawiera wersję schematu"""
+        db, _ = temp_db
+        
+        expected = Database.target_schema_version()
+        assert 0 < expected < 2 ** 31
+        assert db.get_schema_version() == expected
+    
+    def test_schema_version_identifies_migrations(self, tmp_path, monkeypatch):
+        """Wersja zmienia się po edycji lub dodaniu migracji, nie tylko po zmianie liczby"""
+        migrations_dir = tmp_path / "migrations"
+        shutil.copytree(MigrationRunner.MIGRATIONS_DIR, migrations_dir)
+        monkeypatch.setattr(MigrationRunner, 'MIGRATIONS_DIR', migrations_dir)
+        original = Database.target_schema_version()
+        
+        newest = MigrationRunner.available_migrations()[-1][1]
+        newest.write_text(newest.read_text(encoding='utf-8') + "\n-- zmiana\n", encoding='utf-8')
+        edited = Database.target_schema_version()
+        
+        newest.rename(newest.with_name("20991231_000000_renamed.sql"))
+        renamed = Database.target_schema_version()
+        
+        assert len({original, edited, renamed}) == 3
+    
+    def test_edited_migration_is_detected_on_current_database(self, tmp_path, monkeypatch):
+        """Edycja zastosowanej migracji wymusza pełną inicjalizację i weryfikację sum"""
+        migrations_dir = tmp_path / "migrations"
+        shutil.copytree(MigrationRunner.MIGRATIONS_DIR, migrations_dir)
+        monkeypatch.setattr(MigrationRunner, 'MIGRATIONS_DIR', migrations_dir)
+        db_path = tmp_path / "test.db"
+        Database(str(db_path)).close()
+        
+        newest = MigrationRunner.available_migrations()[-1][1]
+        newest.write_text(newest.read_text(encoding='utf-8') + "\n-- zmiana\n", encoding='utf-8')
+        
+        with pytest.raises(RuntimeError, match=newest.name):
+            Database(str(db_path))
+    
+    def test_unknown_migrations_keep_schema_version(self, temp_db):
+        """Baza z migracją nieznaną aplikacji (nowsza wersja) nie dostaje nowej wersji"""
+        db, db_path = temp_db
+        conn = db.get_connection()
+        conn.execute("INSERT INTO schema_migrations (version) VALUES ('20991231_000000')")
+        conn.execute("PRAGMA user_version = 12345")
+        conn.commit()
+        db.close()
+        
+        reopened = Database(str(db_path))
+        assert reopened.get_schema_version() == 12345
+        reopened.close()
+    
+    def test_current_database_skips_bootstrap(self, temp_db, monkeypatch):
+        """Aktualna baza nie uruchamia schematu bazowego ani migracji"""
+        db, db_path = temp_db
+        db.close()
+        
+        calls = []
+        monkeypatch.setattr(Database, '_bootstrap_schema', lambda self: calls.append('bootstrap'))
+        monkeypatch.setattr(MigrationRunner, '__init__', lambda self, *a, **k: calls.append('migrations'))
+        
+        reopened = Database(str(db_path))
+        reopened.close()
+        assert calls == []
+    
+    def test_outdated_database_is_upgraded(self, temp_db):
+        """Baza bez znacznika wersji przechodzi pełną inicjalizację"""
+        db, db_path = temp_db
+        db.get_connection().execute("PRAGMA user_version = 0")
+        db.close()
+        
+        reopened = Database(str(db_path))
+        assert reopened.get_schema_version() == Database.target_schema_version()
+        assert reopened.get_all_profiles()
+        reopened.close()
+
+
+class TestDatabaseConnectionProfile:
+    """Testy ustawień PRAGMA połączenia"""
+    
+    def test_default_profile_uses_wal(self, temp_db):
+        """Test domyślnego profilu WAL"""
+        db, db_path = temp_db
+        conn = db.get_connection()
+        
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2   # MEMORY
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8000
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    
+    def test_rollback_journal_profile(self):
+        """Test profilu z klasycznym dziennikiem rollback"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(str(Path(tmpdir) / "test.db"), ConnectionProfile.rollback_journal())
+            conn = db.get_connection()
+            
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+            db.close()
+    
+    def test_custom_profile_skips_unset_pragmas(self):
+        """Test czy wartości None nie są ustawiane"""
+        profile = ConnectionProfile(mmap_size=None, cache_size=None, temp_store=None)
+        names = [name for name, value in profile.pragmas()]
+        
+        assert names == ['journal_mode', 'synchronous', 'foreign_keys']
+
+
+class TestDatabaseConnectionPool:
+    """Testy puli połączeń"""
+    
+    def test_reader_wait_times_out(self):
+        """Zajęte połączenia do odczytu kończą oczekiwanie błędem po timeout"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(str(Path(tmpdir) / "test.db"), ConnectionProfile(timeout=0.2), readers=1)
+            held, release = threading.Event(), threading.Event()
+            
+            def hold_reader():
+                with db._pool.reader():
+                    held.set()
+                    release.wait(timeout=5)
+            
+            thread = threading.Thread(target=hold_reader)
+            thread.start()
+            try:
+                assert held.wait(timeout=5)
+                with pytest.raises(sqlite3.OperationalError, match="zajęte"):
+                    db.get_all_profiles()
+            finally:
+                release.set()
+                thread.join()
+            
+            assert db.get_all_profiles()
+            db.close()
 
 
 class TestDatabaseProfiles:
@@ -163,6 +301,25 @@ class TestDatabaseWorkEntries:
         entries = db.get_work_entries_month(profile_id, 2025, 1)
         assert len(entries) == 5
     
+    def test_get_work_entries_range(self, profile_with_entries):
+        """Test pobierania wpisów z zakresu dat (granice włącznie)"""
+        db, db_path, profile_id = profile_with_entries
+        
+        for date in ['2024-12-31', '2025-01-01', '2025-01-15', '2025-02-01']:
+            entry = {
+                'profile_id': profile_id,
+                'date': date,
+                'start_time': '09:00',
+                'end_time': '17:00',
+                'break_minutes': 0,
+                'day_type': 'work_day',
+                'notes': ''
+            }
+            db.insert_work_entry(entry)
+        
+        entries = db.get_work_entries_range(profile_id, '2025-01-01', '2025-02-01')
+        assert [e['date'] for e in entries] == ['2025-01-01', '2025-01-15', '2025-02-01']
+    
     def test_delete_work_entry(self, profile_with_entries):
         """Test usuwania wpisu"""
         db, db_path, profile_id = profile_with_entries
@@ -183,6 +340,37 @@ class TestDatabaseWorkEntries:
         assert result is True
         assert db.get_work_entry(profile_id, '2025-01-15') is None
     
+    def test_insert_stores_minute_columns(self, profile_with_entries):
+        """Test zapisu wartości minutowych razem z wpisem"""
+        db, db_path, profile_id = profile_with_entries
+        
+        db.insert_work_entry({
+            'profile_id': profile_id,
+            'date': '2025-01-15',
+            'start_time': '22:00',
+            'end_time': '06:00',
+            'break_minutes': 30,
+            'day_type': 'work_day',
+            'notes': ''
+        })
+        db.insert_work_entry({
+            'profile_id': profile_id,
+            'date': '2025-01-16',
+            'start_time': '',
+            'end_time': '',
+            'break_minutes': 0,
+            'day_type': 'sick_day',
+            'notes': ''
+        })
+        
+        night = db.get_work_entry(profile_id, '2025-01-15')
+        sick = db.get_work_entry(profile_id, '2025-01-16')
+        
+        assert (night['start_minute'], night['end_minute']) == (1320, 360)
+        assert night['net_minutes'] == 450
+        assert night['is_midnight_crossing'] == 1
+        assert (sick['start_minute'], sick['end_minute'], sick['net_minutes']) == (None, None, 480)
+    
     def test_upsert_work_entry(self, profile_with_entries):
         """Test aktualizacji wpisu (UPSERT)"""
         db, db_path, profile_id = profile_with_entries
@@ -210,6 +398,588 @@ class TestDatabaseWorkEntries:
         assert retrieved['notes'] == 'Updated'
 
 
+class TestDatabaseBulkInsert:
+    """Testy zapisu wielu wpisów w jednej transakcji"""
+    
+    @staticmethod
+    def make_entries(profile_id, days, end_time='17:00'):
+        return [
+            {
+                'profile_id': profile_id,
+                'date': f'2025-01-{day:02d}',
+                'start_time': '09:00',
+                'end_time': end_time,
+                'break_minutes': 30,
+                'day_type': 'work_day',
+                'notes': ''
+            }
+            for day in days
+        ]
+    
+    def test_insert_many_returns_ids_in_input_order(self, temp_db):
+        """Test zwracanych ID i kolejności"""
+        db, db_path = temp_db
+        profile_id = db.create_profile("Bulk")
+        
+        results = db.insert_work_entries_many(self.make_entries(profile_id, range(1, 11)), chunk_size=3)
+        
+        assert [r['date'] for r in results] == [f'2025-01-{d:02d}' for d in range(1, 11)]
+        assert all(r['replaced'] is False for r in results)
+        for r in results:
+            assert db.get_work_entry(profile_id, r['date'])['id'] == r['id']
+    
+    def test_insert_many_caps_chunk_size(self, temp_db):
+        """Duży chunk_size nie przekracza limitu 999 parametrów SQLite"""
+        db, db_path = temp_db
+        profile_id = db.create_profile("Bulk")
+        db.get_connection().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        entries = [
+            dict(entry, date=f'{year}-{entry["date"][5:]}')
+            for year in range(2001, 2041)
+            for entry in self.make_entries(profile_id, range(1, 31))
+        ]
+        
+        results = db.insert_work_entries_many(entries, chunk_size=5000)
+        
+        assert len(results) == 1200
+        assert len({r['id'] for r in results}) == 1200
+    
+    def test_insert_many_reports_conflicts(self, temp_db):
+        """Test informacji o zastąpionych wpisach"""
+        db, db_path = temp_db
+        profile_id = db.create_profile("Bulk")
+        db.insert_work_entries_many(self.make_entries(profile_id, [1, 2]))
+        
+        results = db.insert_work_entries_many(self.make_entries(profile_id, [2, 3], end_time='18:00'))
+        
+        assert [(r['date'], r['replaced']) for r in results] == [
+            ('2025-01-02', True),
+            ('2025-01-03', False),
+        ]
+        assert db.get_work_entry(profile_id, '2025-01-02')['end_time'] == '18:00'
+    
+    def test_insert_many_accepts_generator_and_models(self, temp_db):
+        """Test wejścia jako generator obiektów WorkEntry"""
+        from src.models import WorkEntry
+        db, db_path = temp_db
+        profile_id = db.create_profile("Bulk")
+        
+        entries = (
+            WorkEntry(profile_id=profile_id, date=f'2025-02-{day:02d}', start_time='08:00', end_time='16:00')
+            for day in range(1, 29)
+        )
+        results = db.insert_work_entries_many(entries, chunk_size=10)
+        
+        assert len(results) == 28
+        assert len(db.get_work_entries_month(profile_id, 2025, 2)) == 28
+    
+    def test_insert_many_rolls_back_on_error(self, temp_db):
+        """Test czy błąd w partii wycofuje całą transakcję"""
+        db, db_path = temp_db
+        profile_id = db.create_profile("Bulk")
+        entries = self.make_entries(profile_id, [1, 2, 3])
+        entries[2]['date'] = None  # NOT NULL
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            db.insert_work_entries_many(entries, chunk_size=2)
+        
+        assert db.get_work_entries_month(profile_id, 2025, 1) == []
+
+
+class TestDatabaseMonthQueries:
+    """Testy zapytań miesięcznych (zakres półotwarty na indeksie)"""
+    
+    MONTH_QUERIES = [
+        "SELECT * FROM work_entries WHERE profile_id = ? AND date >= ? AND date < ? ORDER BY date",
+        "SELECT COUNT(*) FROM work_entries WHERE profile_id = ? AND date >= ? AND date < ?",
+        "DELETE FROM work_entries WHERE profile_id = ? AND date >= ? AND date < ?",
+    ]
+    
+    @pytest.fixture
+    def profile_with_year(self, temp_db):
+        """Profil z wpisem na początku i końcu każdego miesiąca"""
+        db, db_path = temp_db
+        profile_id = db.create_profile("Month Test")
+        for month in range(1, 13):
+            for day in ('01', '28'):
+                db.insert_work_entry({
+                    'profile_id': profile_id,
+                    'date': f'2025-{month:02d}-{day}',
+                    'start_time': '09:00',
+                    'end_time': '17:00',
+                    'break_minutes': 0,
+                    'day_type': 'work_day',
+                    'notes': ''
+                })
+        return db, profile_id
+    
+    def test_month_bounds(self):
+        """Test granic miesiąca, w tym przejścia roku"""
+        assert Database._month_bounds(2025, 1) == ('2025-01-01', '2025-02-01')
+        assert Database._month_bounds(2025, 12) == ('2025-12-01', '2026-01-01')
+    
+    def test_month_queries_use_profile_date_index(self, temp_db):
+        """Regresja: zapytania miesięczne nie mogą wracać do pełnego skanu"""
+        db, db_path = temp_db
+        conn = db.get_connection()
+        
+        for query in self.MONTH_QUERIES:
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN {query}", (1, '2025-01-01', '2025-02-01')
+            ).fetchall()
+            details = [row[3] for row in plan]
+            assert any(
+                d.startswith('SEARCH work_entries') and 'idx_work_entries_profile_date' in d
+                and 'date>? AND date<?' in d
+                for d in details
+            ), details
+            assert not any(d.startswith('SCAN work_entries') for d in details), details
+    
+    def test_expression_index_not_created(self, temp_db):
+        """Test czy zbędny indeks wyrażeniowy nie istnieje"""
+        db, db_path = temp_db
+        indexes = [
+            row[0] for row in db.get_connection().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        ]
+        assert 'idx_work_entries_profile_date' in indexes
+        assert 'idx_work_entries_profile_month' not in indexes
+    
+    def test_migration_drops_legacy_expression_index(self):
+        """Test czy migracja usuwa indeks wyrażeniowy ze starej bazy"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "legacy.db"
+            Database(str(db_path)).close()
+            
+            conn = sqlite3.connect(str(db_path))
+            conn.execute("DELETE FROM schema_migrations WHERE version = '20261018_000000'")
+            conn.execute("PRAGMA user_version = 0")   # Baza sprzed wersjonowania schematu
+            conn.execute("""
+                CREATE INDEX idx_work_entries_profile_month
+                ON work_entries(profile_id, strftime('%Y-%m', date))
+            """)
+            conn.commit()
+            conn.close()
+            
+            db = Database(str(db_path))
+            row = db.get_connection().execute(
+                "SELECT name FROM sqlite_master WHERE name = 'idx_work_entries_profile_month'"
+            ).fetchone()
+            db.close()
+            assert row is None
+    
+    def test_get_month_excludes_neighbour_months(self, profile_with_year):
+        """Test czy miesiąc nie zawiera wpisów z sąsiednich miesięcy"""
+        db, profile_id = profile_with_year
+        
+        entries = db.get_work_entries_month(profile_id, 2025, 12)
+        assert [e['date'] for e in entries] == ['2025-12-01', '2025-12-28']
+    
+    def test_count_work_entries_month(self, profile_with_year):
+        """Test zliczania wpisów z miesiąca"""
+        db, profile_id = profile_with_year
+        
+        assert db.count_work_entries_month(profile_id, 2025, 2) == 2
+        assert db.count_work_entries_month(profile_id, 2026, 1) == 0
+    
+    def test_delete_work_entries_month(self, profile_with_year):
+        """Test usuwania wpisów z miesiąca"""
+        db, profile_id = profile_with_year
+        
+        assert db.delete_work_entries_month(profile_id, 2025, 3) == 2
+        assert db.count_work_entries_month(profile_id, 2025, 3) == 0
+        assert db.count_work_entries_month(profile_id, 2025, 2) == 2
+        assert db.count_work_entries_month(profile_id, 2025, 4) == 2
+
+
+class TestDatabaseTransactions:
+    """Testy transakcji obejmujących wiele operacji"""
+    
+    @staticmethod
+    def entry(profile_id, date):
+        return {
+            'profile_id': profile_id, 'date': date, 'start_time': '08:00',
+            'end_time': '16:00', 'break_minutes': 0, 'day_type': 'work_day', 'notes': ''
+        }
+    
+    def test_single_commit(self, temp_db):
+        """Wiele zapisów w transakcji kończy jeden COMMIT"""
+        db, _ = temp_db
+        profile_id = db.create_profile("Tx Test")
+        statements = []
+        writer = db.get_connection()
+        writer.set_trace_callback(statements.append)
+        try:
+            with db.transaction():
+                for day in range(1, 6):
+                    db.insert_work_entry(self.entry(profile_id, f'2025-01-{day:02d}'))
+                db.set_setting(profile_id, 'theme', 'dark')
+        finally:
+            writer.set_trace_callback(None)
+        
+        assert sum(1 for sql in statements if sql.strip() == "COMMIT") == 1
+        assert db.count_work_entries_month(profile_id, 2025, 1) == 5
+    
+    def test_foreign_open_transaction_is_not_committed(self, temp_db):
+        """Niezakończona transakcja spoza transaction() nie jest zatwierdzana"""
+        db, _ = temp_db
+        writer = db.get_connection()
+        writer.execute("INSERT INTO profiles (name) VALUES ('Pending')")
+        
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                pass
+        
+        assert all(p['name'] != 'Pending' for p in db.get_all_profiles())
+        writer.rollback()
+        with db.transaction():
+            pass
+    
+    def test_rollback_on_exception(self, temp_db):
+        """Wyjątek wycofuje wszystkie zapisy transakcji"""
+        db, _ = temp_db
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                profile_id = db.create_profile("Rolled Back")
+                db.insert_work_entry(self.entry(profile_id, '2025-01-01'))
+                raise RuntimeError("przerwij")
+        
+        assert all(p['name'] != "Rolled Back" for p in db.get_all_profiles())
+        assert db.get_month_aggregate(profile_id, 2025, 1) is None
+    
+    def test_nested_savepoint(self, temp_db):
+        """Błąd w zagnieżdżonej transakcji wycofuje tylko jej fragment"""
+        db, _ = temp_db
+        profile_id = db.create_profile("Nested")
+        with db.transaction():
+            db.insert_work_entry(self.entry(profile_id, '2025-02-01'))
+            with pytest.raises(ValueError):
+                with db.transaction():
+                    db.insert_work_entry(self.entry(profile_id, '2025-02-02'))
+                    db.create_profile("Nested")  # duplikat -> ValueError
+            db.insert_work_entry(self.entry(profile_id, '2025-02-03'))
+        
+        dates = [e['date'] for e in db.get_work_entries_month(profile_id, 2025, 2)]
+        assert dates == ['2025-02-01', '2025-02-03']
+    
+    def test_failed_method_is_atomic(self, temp_db):
+        """Nieudana metoda zbiorcza wewnątrz transakcji nie zostawia połowy zmian"""
+        db, _ = temp_db
+        profile_id = db.create_profile("Atomic")
+        entries = [self.entry(profile_id, '2025-03-01'), self.entry(None, '2025-03-02')]
+        with db.transaction():
+            with pytest.raises(sqlite3.IntegrityError):
+                db.insert_work_entries_many(entries, chunk_size=1)
+        
+        assert db.count_work_entries_month(profile_id, 2025, 3) == 0
+
+
+class TestDatabaseStreaming:
+    """Testy strumieniowego odczytu wpisów (fetchmany)"""
+    
+    @pytest.fixture
+    def profile_with_entries(self, temp_db):
+        db, _ = temp_db
+        profile_id = db.create_profile("Stream Test")
+        db.insert_work_entries_many(
+            {
+                'profile_id': profile_id, 'date': f'2025-{month:02d}-{day:02d}',
+                'start_time': '08:00', 'end_time': '16:00', 'break_minutes': 0,
+                'day_type': 'work_day'
+            }
+            for month in range(1, 13) for day in (5, 15, 25)
+        )
+        return db, profile_id
+    
+    def test_iter_matches_range(self, profile_with_entries):
+        """Iterator zwraca te same wiersze co get_work_entries_range"""
+        db, profile_id = profile_with_entries
+        expected = db.get_work_entries_range(profile_id, '2025-02-01', '2025-11-30')
+        
+        for batch_size in (1, 4, 1000):
+            rows = list(db.iter_work_entries(profile_id, '2025-02-01', '2025-11-30', batch_size))
+            assert rows == expected
+    
+    def test_iter_is_lazy(self, profile_with_entries):
+        """Wiersze są pobierane dopiero podczas iteracji"""
+        db, profile_id = profile_with_entries
+        rows = db.iter_work_entries(profile_id, '2025-01-01', '2025-12-31', batch_size=2)
+        
+        first = next(rows)
+        
+        assert first['date'] == '2025-01-05'
+        assert sum(1 for _ in rows) == 35
+    
+    def test_iter_releases_reader(self, profile_with_entries):
+        """Zamknięty iterator oddaje połączenie do puli"""
+        db, profile_id = profile_with_entries
+        rows = db.iter_work_entries(profile_id, '2025-01-01', '2025-12-31', batch_size=2)
+        next(rows)
+        rows.close()
+        
+        assert db._pool._local.reader is None
+    
+    def test_iter_invalid_batch_size(self, profile_with_entries):
+        """batch_size musi być dodatni (błąd zgłaszany od razu)"""
+        db, profile_id = profile_with_entries
+        with pytest.raises(ValueError):
+            db.iter_work_entries(profile_id, '2025-01-01', '2025-12-31', batch_size=0)
+
+
+class TestDatabaseEntryMinutes:
+    """Testy wartości minutowych zapisywanych z wpisem (entry_minutes)"""
+    
+    def test_workday_minutes(self):
+        """Test zwykłego dnia pracy"""
+        assert entry_minutes("2025-01-15", "09:00", "17:00", 30, "work_day") == (540, 1020, 450, False)
+    
+    def test_midnight_crossing_minutes(self):
+        """Test zmiany nocnej"""
+        assert entry_minutes("2025-01-15", "22:00", "06:00", 0, "work_day") == (1320, 360, 480, True)
+    
+    def test_invalid_entry_has_no_net_minutes(self):
+        """Test niepoprawnego wpisu (za krótki) i pustych czasów"""
+        assert entry_minutes("2025-01-15", "09:00", "09:05", 0, "work_day")[2] is None
+        assert entry_minutes("2025-01-15", "", "", 0, "vacation") == (None, None, 0, False)
+
+
+class TestDatabaseMonthAggregates:
+    """Testy podsumowań miesięcznych utrzymywanych przez triggery"""
+    
+    @staticmethod
+    def entry(profile_id, date, start='09:00', end='17:00', break_minutes=30, day_type='work_day'):
+        return {
+            'profile_id': profile_id,
+            'date': date,
+            'start_time': start,
+            'end_time': end,
+            'break_minutes': break_minutes,
+            'day_type': day_type,
+            'notes': ''
+        }
+    
+    @pytest.fixture
+    def profile(self, temp_db):
+        db, db_path = temp_db
+        return db, db.create_profile("Aggregates")
+    
+    def test_insert_updates_aggregate(self, profile):
+        """Test podsumowania po dodaniu wpisów różnych typów"""
+        db, profile_id = profile
+        db.insert_work_entry(self.entry(profile_id, '2025-01-02'))
+        db.insert_work_entry(self.entry(profile_id, '2025-01-03', '22:00', '06:00', 0))
+        db.insert_work_entry(self.entry(profile_id, '2025-01-06', '', '', 0, 'sick_day'))
+        db.insert_work_entry(self.entry(profile_id, '2025-01-07', '', '', 0, 'vacation'))
+        db.insert_work_entry(self.entry(profile_id, '2025-01-08', '09:00', '09:05'))  # niepoprawny
+        
+        agg = db.get_month_aggregate(profile_id, 2025, 1)
+        
+        assert agg['entry_count'] == 5
+        assert agg['valid_days'] == 4
+        assert agg['work_days'] == 2
+        assert agg['sick_days'] == 1
+        assert agg['vacation_days'] == 1
+        assert agg['days_with_work'] == 3
+        assert agg['net_minutes'] == 450 + 480 + 480
+        assert db.verify_month_aggregates() == []
+    
+    def test_replace_and_delete_keep_aggregate_consistent(self, profile):
+        """Test UPSERT, UPDATE i DELETE"""
+        db, profile_id = profile
+        db.insert_work_entry(self.entry(profile_id, '2025-02-03'))
+        db.insert_work_entry(self.entry(profile_id, '2025-02-03', end='18:00'))  # REPLACE
+        assert db.get_month_aggregate(profile_id, 2025, 2)['net_minutes'] == 510
+        
+        db.get_connection().execute(
+            "UPDATE work_entries SET date = '2025-03-03' WHERE profile_id = ?", (profile_id,)
+        )
+        db.get_connection().commit()
+        assert db.get_month_aggregate(profile_id, 2025, 2) is None
+        assert db.get_month_aggregate(profile_id, 2025, 3)['entry_count'] == 1
+        
+        db.delete_work_entry(profile_id, '2025-03-03')
+        assert db.get_month_aggregate(profile_id, 2025, 3) is None
+        assert db.verify_month_aggregates() == []
+    
+    def test_bulk_insert_and_month_delete(self, profile):
+        """Test zapisu wielu wpisów i usuwania miesiąca"""
+        db, profile_id = profile
+        db.insert_work_entries_many(
+            self.entry(profile_id, f'2025-{m:02d}-{d:02d}') for m in (4, 5) for d in range(1, 21)
+        )
+        assert [a['entry_count'] for a in db.get_year_aggregates(profile_id, 2025)] == [20, 20]
+        
+        db.delete_work_entries_month(profile_id, 2025, 4)
+        assert [a['year_month'] for a in db.get_year_aggregates(profile_id, 2025)] == ['2025-05']
+        assert db.verify_month_aggregates(profile_id) == []
+    
+    def test_profile_delete_removes_aggregates(self, profile):
+        """Test kaskadowego usuwania podsumowań profilu"""
+        db, profile_id = profile
+        db.insert_work_entry(self.entry(profile_id, '2025-01-02'))
+        db.delete_profile(profile_id)
+        
+        assert db.get_year_aggregates(profile_id, 2025) == []
+    
+    def test_verify_detects_drift_and_rebuild_fixes_it(self, profile):
+        """Test sprawdzania spójności i odtwarzania"""
+        db, profile_id = profile
+        db.insert_work_entry(self.entry(profile_id, '2025-01-02'))
+        db.insert_work_entry(self.entry(profile_id, '2025-02-03'))
+        conn = db.get_connection()
+        conn.execute("UPDATE month_aggregates SET net_minutes = 1 WHERE year_month = '2025-01'")
+        conn.execute("DELETE FROM month_aggregates WHERE year_month = '2025-02'")
+        conn.commit()
+        
+        mismatches = db.verify_month_aggregates()
+        assert [m['year_month'] for m in mismatches] == ['2025-01', '2025-02']
+        assert mismatches[1]['actual'] is None
+        
+        assert db.rebuild_month_aggregates() == 2
+        assert db.verify_month_aggregates() == []
+    
+    def test_migration_backfills_existing_entries(self):
+        """Test wypełnienia kolumn i podsumowań dla bazy sprzed migracji"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "legacy.db"
+            conn = sqlite3.connect(str(db_path))
+            conn.executescript("""
+                CREATE TABLE profiles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE work_entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    profile_id INTEGER NOT NULL,
+                    date TEXT NOT NULL,
+                    start_time TEXT,
+                    end_time TEXT,
+                    break_minutes INTEGER DEFAULT 0,
+                    day_type TEXT DEFAULT 'work_day',
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (profile_id) REFERENCES profiles(id) ON DELETE CASCADE,
+                    UNIQUE(profile_id, date)
+                );
+                INSERT INTO profiles (name) VALUES ('Legacy');
+                INSERT INTO work_entries (profile_id, date, start_time, end_time, break_minutes, day_type)
+                VALUES (1, '2025-01-02', '08:00', '16:00', 0, 'work_day'),
+                       (1, '2025-01-03', '22:00', '06:00', 30, 'work_day'),
+                       (1, '2025-01-04', '08:00', '08:05', 0, 'work_day');
+            """)
+            conn.close()
+            
+            db = Database(str(db_path))
+            agg = db.get_month_aggregate(1, 2025, 1)
+            rows = db.get_work_entries_month(1, 2025, 1)
+            mismatches = db.verify_month_aggregates()
+            db.close()
+            
+            assert agg['net_minutes'] == 480 + 450
+            assert agg['entry_count'] == 3
+            assert [(r['start_minute'], r['end_minute'], r['net_minutes'], r['is_midnight_crossing']) for r in rows] == [
+                (480, 960, 480, 0),
+                (1320, 360, 450, 1),
+                (480, 485, None, 0),
+            ]
+            assert mismatches == []
+    
+    def test_plain_update_recomputes_minutes(self, temp_db):
+        """Test czy zwykły UPDATE godzin przelicza kolumny i podsumowanie"""
+        db, _ = temp_db
+        db.insert_work_entry(self.entry(1, '2025-01-02'))
+        db.insert_work_entry(self.entry(1, '2025-01-03'))
+        
+        with db.transaction() as conn:
+            conn.execute("""
+                UPDATE work_entries SET start_time = '22:00', end_time = '06:00', break_minutes = 0
+                WHERE date = '2025-01-02'
+            """)
+            conn.execute("UPDATE work_entries SET day_type = 'sick_day' WHERE date = '2025-01-03'")
+        
+        rows = db.get_work_entries_month(1, 2025, 1)
+        assert [(r['start_minute'], r['end_minute'], r['net_minutes'], r['is_midnight_crossing']) for r in rows] == [
+            (1320, 360, 480, 1),
+            (540, 1020, 480, 0),
+        ]
+        assert db.get_month_aggregate(1, 2025, 1)['net_minutes'] == 960
+        assert db.verify_month_aggregates() == []
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.transaction() as conn:
+                conn.execute("UPDATE work_entries SET net_minutes = 5 WHERE date = '2025-01-02'")
+        assert db.verify_month_aggregates() == []
+    
+    def test_verify_reads_one_snapshot(self, temp_db):
+        """Test czy zapis zatwierdzony między odczytami nie daje rozbieżności"""
+        db, db_path = temp_db
+        db.insert_work_entry(self.entry(1, '2025-01-02'))
+        iter_rows = db._iter_rows
+        
+        def iter_rows_after_commit(*args, **kwargs):
+            other = sqlite3.connect(str(db_path))
+            other.execute("""
+                INSERT INTO work_entries (profile_id, date, start_time, end_time, break_minutes,
+                                          day_type, start_minute, end_minute, net_minutes)
+                VALUES (1, '2025-01-03', '09:00', '17:00', 30, 'work_day', 540, 1020, 450)
+            """)
+            other.commit()
+            other.close()
+            return iter_rows(*args, **kwargs)
+        
+        db._iter_rows = iter_rows_after_commit
+        assert db.verify_month_aggregates() == []
+        del db._iter_rows
+        assert db.get_month_aggregate(1, 2025, 1)['entry_count'] == 2
+        assert db.verify_month_aggregates() == []
+    
+    def test_entry_minutes_matches_calc_service(self):
+        """Test zgodności entry_minutes (warstwa bazy) z CalcService.calculate_work_day"""
+        from src.services.calc_service import CalcService
+        
+        service = CalcService()
+        times = ['08:00', '22:00', '06:00', '08:10', '8:5', '24:00', '', None, 'xx']
+        dates = ['2025-01-15', '2025-1-5', '2025-02-30', '']
+        day_types = ['work_day', 'sick_day', 'vacation', 'day_off', 'other']
+        for date in dates:
+            for day_type in day_types:
+                for start in times:
+                    for end in times:
+                        for break_minutes in (0, 30, 600, -5, None):
+                            args = (date, start, end, break_minutes, day_type)
+                            result = service.calculate_work_day(
+                                date=date,
+                                start_time=start or None,
+                                end_time=end or None,
+                                break_minutes=break_minutes or 0,
+                                day_type=day_type
+                            )
+                            expected = (
+                                service.time_to_minutes(start) if service.validate_time_format(start) else None,
+                                service.time_to_minutes(end) if service.validate_time_format(end) else None,
+                                result.net_minutes if result.is_valid else None,
+                                result.is_midnight_crossing
+                            )
+                            assert entry_minutes(*args) == expected, args
+    
+    def test_db_import_does_not_load_services(self):
+        """Test czy import src.db nie ładuje warstwy serwisów"""
+        import subprocess
+        import sys
+        
+        code = "import sys, src.db; print(any(m.startswith('src.services') for m in sys.modules))"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+
 class TestDatabaseSettings:
     """Testy operacji na ustawieniach"""
     
@@ -0,0 +1,143 @@
+"""
+Test czasu importu - Budżet startu aplikacji i leniwe importy
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+from src.utils.lazy_import import LazyModule, module_available
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Budżet skumulowanego czasu importu (ms, najlepszy z RUNS pomiarów);
+# czas zależy od maszyny, więc testy budżetu uruchamia się jawnie:
+#     WH_IMPORT_BUDGET=1 pytest tests/test_import_time.py
+MAIN_BUDGET_MS = 150
+APP_BUDGET_MS = 1500
+RUNS = 3
+
+budget = pytest.mark.skipif(
+    not os.environ.get('WH_IMPORT_BUDGET'),
+    reason="Budżet czasu importu sprawdzany tylko z WH_IMPORT_BUDGET=1"
+)
+
+# Moduły, które nie mogą być ładowane przy starcie
+HEAVY_MODULES = (
+    'reportlab', 'numpy',
+    'src.services.pdf_service', 'src.services.theme_service',
+)
+
+
+def import_profile(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Zaimportuj moduł w nowym procesie z -X importtime
+
+    Returns:
+        nazwa modułu -> (czas własny, czas skumulowany) w mikrosekundach
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(own), int(cumulative))
+    return profile
+
+
+def best_cumulative_ms(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Najlepszy skumulowany czas importu modułu z RUNS pomiarów"""
+    best, best_profile = float("inf"), {}
+    for _ in range(RUNS):
+        profile = import_profile(module)
+        cumulative = profile[module][1] / 1000
+        if cumulative < best:
+            best, best_profile = cumulative, profile
+    return best, best_profile
+
+
+def loaded_heavy(profile: Dict[str, Tuple[int, int]], prefixes) -> list:
+    return sorted(
+        name for name in profile
+        if any(name == p or name.startswith(p + ".") for p in prefixes)
+    )
+
+
+def require_kivy() -> None:
+    if not module_available('kivy') or not module_available('kivymd'):
+        pytest.skip("Kivy/KivyMD nie jest zainstalowane")
+
+
+class TestStartupImports:
+    """Testy zależności ładowanych przy starcie"""
+
+    def test_main_skips_heavy_modules(self):
+        """src.main nie ładuje ciężkich zależności"""
+        profile = import_profile("src.main")
+
+        assert loaded_heavy(profile, HEAVY_MODULES + ('kivy', 'kivymd')) == []
+
+    def test_app_skips_heavy_modules(self):
+        """src.app ładuje Kivy, ale nie ReportLab, NumPy ani ekranów KivyMD"""
+        require_kivy()
+
+        profile = import_profile("src.app")
+
+        assert loaded_heavy(profile, HEAVY_MODULES + ('src.ui.screens', 'kivymd.uix')) == []
+
+
+@budget
+class TestStartupImportBudget:
+    """Testy budżetu czasu importu przy starcie (WH_IMPORT_BUDGET=1)"""
+
+    def test_main_import_budget(self):
+        """src.main mieści się w budżecie czasu importu"""
+        cumulative, _ = best_cumulative_ms("src.main")
+
+        assert cumulative <= MAIN_BUDGET_MS, f"import src.main: {cumulative:.1f} ms"
+
+    def test_app_import_budget(self):
+        """src.app mieści się w budżecie czasu importu"""
+        require_kivy()
+
+        cumulative, _ = best_cumulative_ms("src.app")
+
+        assert cumulative <= APP_BUDGET_MS, f"import src.app: {cumulative:.1f} ms"
+
+
+class TestLazyImport:
+    """Testy warstwy leniwych importów"""
+
+    def test_module_available(self):
+        """Dostępność sprawdzana bez importu"""
+        assert module_available('json')
+        assert not module_available('nie_istniejacy_modul_xyz')
+        assert not module_available('nie_istniejacy_pakiet.modul')
+
+    def test_lazy_module_loads_on_first_attribute(self, monkeypatch):
+        """Moduł ładowany przy pierwszym dostępie do atrybutu"""
+        monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+        colorsys = LazyModule('colorsys')
+        assert not colorsys.is_loaded()
+
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert colorsys.is_loaded()
+
+    def test_lazy_service_exports(self):
+        """Leniwe eksporty src.services rozwiązują się do klas serwisów"""
+        import src.services
+        from src.services.theme_service import ThemeService
+
+        assert src.services.ThemeService is ThemeService
+        with pytest.raises(AttributeError):
+            src.services.NieIstniejacySerwis
@@ -0,0 +1,160 @@
+"""
+Test Migrations - Transakcje, sumy kontrolne i migracje w Pythonie
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+from src.db import MigrationRunner, backfill
+
+
+@pytest.fixture
+def migrations_env(tmp_path):
+    """Pusta baza i katalog migracji"""
+    migrations_dir = tmp_path / "migrations"
+    migrations_dir.mkdir()
+    return tmp_path / "test.db", migrations_dir
+
+
+def write_migration(migrations_dir: Path, name: str, content: str) -> Path:
+    path = migrations_dir / name
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+class TestMigrationRunner:
+    """Testy uruchamiania migracji"""
+    
+    def test_single_connection(self, migrations_env, monkeypatch):
+        """Runner otwiera jedno połączenie na cały przebieg"""
+        db_path, migrations_dir = migrations_env
+        write_migration(migrations_dir, "20260101_000000_a.sql", "CREATE TABLE a (x INTEGER);")
+        write_migration(migrations_dir, "20260101_000100_b.sql", "CREATE TABLE b (x INTEGER);")
+        
+        connect = sqlite3.connect
+        calls = []
+        monkeypatch.setattr(sqlite3, 'connect', lambda *a, **k: calls.append(a) or connect(*a, **k))
+        
+        with MigrationRunner(str(db_path), str(migrations_dir)) as runner:
+            assert runner.run_pending_migrations() == 2
+            runner.get_status()
+        
+        assert len(calls) == 1
+    
+    def test_failed_migration_rolls_back(self, migrations_env):
+        """Błąd w środku migracji wycofuje jej wszystkie instrukcje i wpis"""
+        db_path, migrations_dir = migrations_env
+        write_migration(migrations_dir, "20260101_000000_ok.sql", "CREATE TABLE ok (x INTEGER);")
+        write_migration(migrations_dir, "20260101_000100_bad.sql", """
+            CREATE TABLE partial (x INTEGER);
+            INSERT INTO ok (x) VALUES (1);
+            INSERT INTO missing_table VALUES (1);
+        """)
+        
+        with MigrationRunner(str(db_path), str(migrations_dir)) as runner:
+            with pytest.raises(sqlite3.OperationalError):
+                runner.run_pending_migrations()
+            assert runner.get_applied_migrations() == ['20260101_000000']
+        
+        conn = sqlite3.connect(str(db_path))
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert 'partial' not in tables
+        assert conn.execute("SELECT COUNT(*) FROM ok").fetchone()[0] == 0
+        conn.close()
+    
+    def test_migration_with_commit_is_rejected(self, migrations_env):
+        """Migracja zatwierdzająca transakcję samodzielnie jest błędem"""
+        db_path, migrations_dir = migrations_env
+        write_migration(migrations_dir, "20260101_000000_commit.sql", "CREATE TABLE c (x INTEGER); COMMIT;")
+        
+        with MigrationRunner(str(db_path), str(migrations_dir)) as runner:
+            with pytest.raises(RuntimeError):
+                runner.run_pending_migrations()
+            assert runner.get_applied_migrations() == []
+    
+    def test_checksum_mismatch(self, migrations_env):
+        """Zmiana pliku zastosowanej migracji jest wykrywana"""
+        db_path, migrations_dir = migrations_env
+        path = write_migration(migrations_dir, "20260101_000000_a.sql", "CREATE TABLE a (x INTEGER);")
+        
+        with MigrationRunner(str(db_path), str(migrations_dir)) as runner:
+            runner.run_pending_migrations()
+        
+        path.write_text("CREATE TABLE a (x INTEGER, y INTEGER);", encoding='utf-8')
+        with MigrationRunner(str(db_path), str(migrations_dir)) as runner:
+            with pytest.raises(RuntimeError, match="20260101_000000_a.sql"):
+                runner.run_pending_migrations()
+    
+    def test_legacy_table_gets_checksums(self, migrations_env):
+        """Tabela schema_migrations bez sum kontrolnych jest uzupełniana"""
+        db_path, migrations_dir = migrations_env
+        path = write_migration(migrations_dir, "20260101_000000_a.sql", "CREATE TABLE a (x INTEGER);")
+        
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript("""
+            CREATE TABLE schema_migrations (
+                version TEXT PRIMARY KEY,
+                executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE a (x INTEGER);
+            INSERT INTO schema_migrations (version) VALUES ('20260101_000000');
+        """)
+        conn.close()
+        
+        with MigrationRunner(str(db_path), str(migrations_dir)) as runner:
+            assert runner.run_pending_migrations() == 0
+            assert runner.get_applied_checksums() == {'20260101_000000': MigrationRunner.checksum(path)}
+    
+    def test_python_migration_batched_backfill(self, migrations_env):
+        """Migracja w Pythonie uzupełnia dużą tabelę partiami"""
+        db_path, migrations_dir = migrations_env
+        write_migration(migrations_dir, "20260101_000000_items.sql", """
+            CREATE TABLE items (id INTEGER PRIMARY KEY, minutes INTEGER);
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1050)
+            INSERT INTO items (id, minutes) SELECT i, i FROM n;
+        """)
+        write_migration(migrations_dir, "20260101_000100_hours.py", '''
+from src.db.migrations import backfill
+
+
+def migrate(conn):
+    conn.execute("ALTER TABLE items ADD COLUMN hours REAL")
+
+    def compute(row):
+        rowid, minutes = row
+        return (minutes / 60, rowid)
+
+    assert backfill(
+        conn, "items", ["minutes"],
+        "UPDATE items SET hours = ? WHERE rowid = ?",
+        compute, where="minutes % 2 = 0", batch_size=100
+    ) == 525
+''')
+        
+        with MigrationRunner(str(db_path), str(migrations_dir)) as runner:
+            assert runner.run_pending_migrations() == 2
+        
+        conn = sqlite3.connect(str(db_path))
+        assert conn.execute("SELECT COUNT(*) FROM items WHERE hours IS NOT NULL").fetchone()[0] == 525
+        assert conn.execute("SELECT hours FROM items WHERE id = 1050").fetchone()[0] == 17.5
+        assert conn.execute("SELECT hours FROM items WHERE id = 1049").fetchone()[0] is None
+        conn.close()
+    
+    def test_backfill_batches(self):
+        """backfill czyta najwyżej batch_size wierszy naraz"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (v INTEGER, w INTEGER)")
+        conn.executemany("INSERT INTO t (v) VALUES (?)", [(i,) for i in range(250)])
+        
+        selects = []
+        conn.set_trace_callback(lambda sql: selects.append(sql) if sql.startswith("SELECT rowid") else None)
+        
+        updated = backfill(
+            conn, "t", ["v"], "UPDATE t SET w = ? WHERE rowid = ?",
+            lambda row: (row[1] * 2, row[0]), batch_size=100
+        )
+        
+        assert updated == 250
+        assert len(selects) == 4   # 100 + 100 + 50 + pusta partia
+        assert conn.execute("SELECT COUNT(*) FROM t WHERE w = v * 2").fetchone()[0] == 250
+        conn.close()
@@ -0,0 +1,98 @@
+"""
+Test Models - Testy modeli danych
+"""
+
+import pytest
+import sqlite3
+from src.models import Profile, WorkEntry, Setting, CustomTheme
+
+
+class TestModelTimestamps:
+    """Testy znaczników czasu nowych obiektów"""
+    
+    def test_new_objects_share_timestamp(self):
+        """created_at i updated_at nowego obiektu są jednym odczytem zegara"""
+        for model in (Profile(name="A"), WorkEntry(date="2025-01-01"), Setting(key="k")):
+            assert model.created_at is not None
+            assert model.created_at == model.updated_at
+    
+    def test_explicit_timestamps_kept(self):
+        """Podane znaczniki czasu nie są nadpisywane"""
+        entry = WorkEntry(created_at="2025-01-01T08:00:00", updated_at="2025-01-02T08:00:00")
+        
+        assert entry.created_at == "2025-01-01T08:00:00"
+        assert entry.updated_at == "2025-01-02T08:00:00"
+
+
+class TestModelHydration:
+    """Testy szybkiej hydratacji z wierszy bazy"""
+    
+    @pytest.fixture
+    def entry_row(self):
+        return {
+            'id': 7, 'profile_id': 1, 'date': "2025-01-15", 'start_time': "22:00",
+            'end_time': "06:00", 'break_minutes': 30, 'day_type': "work_day", 'notes': "",
+            'created_at': "2025-01-15 10:00:00", 'updated_at': "2025-01-15 10:00:00",
+            'start_minute': 1320, 'end_minute': 360, 'net_minutes': 450,
+            'is_midnight_crossing': 1,
+        }
+    
+    def test_from_row_matches_constructor(self, entry_row):
+        """from_row daje ten sam obiekt co konstruktor"""
+        expected = WorkEntry(**{**entry_row, 'is_midnight_crossing': True})
+        
+        entry = WorkEntry.from_row(entry_row)
+        
+        assert entry == expected
+        assert entry.is_midnight_crossing is True
+    
+    def test_work_entry_is_slotted(self, entry_row):
+        """WorkEntry nie ma __dict__ (__slots__), także po hydratacji"""
+        assert not hasattr(WorkEntry(), '__dict__')
+        assert not hasattr(WorkEntry.from_row(entry_row), '__dict__')
+    
+    def test_from_row_skips_post_init(self):
+        """Hydratacja nie uzupełnia znaczników czasu"""
+        profile = Profile.from_row({'id': 1, 'name': "A", 'created_at': None, 'updated_at': None})
+        
+        assert profile.created_at is None
+        assert profile.updated_at is None
+    
+    def test_from_row_ignores_extra_columns(self, entry_row):
+        """Dodatkowe kolumny wiersza nie trafiają do modelu"""
+        entry = WorkEntry.from_row({**entry_row, 'extra': 1})
+        
+        assert not hasattr(entry, 'extra')
+        assert entry.to_dict()['date'] == "2025-01-15"
+    
+    def test_from_row_rejects_wrong_column(self):
+        """Wiersz z tą samą liczbą kolumn, ale inną nazwą, jest błędem"""
+        row = {'id': 1, 'name': "A", 'created_at': None, 'profile_name': "x"}
+        
+        with pytest.raises(KeyError, match="updated_at"):
+            Profile.from_row(row)
+    
+    def test_from_sqlite_row_missing_column(self):
+        """Brakująca kolumna w sqlite3.Row daje KeyError"""
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT 1 AS id, 'A' AS name, NULL AS created_at, 'x' AS profile_name").fetchone()
+        
+        with pytest.raises(KeyError, match="updated_at"):
+            Profile.from_row(row)
+        conn.close()
+    
+    def test_from_sqlite_row(self):
+        """Hydratacja bezpośrednio z sqlite3.Row"""
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            "SELECT 3 AS id, 1 AS profile_id, 100 AS theme_id, 'T' AS name, "
+            "'{}' AS config_json, '2025-01-01' AS created_at"
+        ).fetchone()
+        
+        theme = CustomTheme.from_row(row)
+        
+        assert theme == CustomTheme(id=3, profile_id=1, theme_id=100, name="T",
+                                    config_json="{}", created_at="2025-01-01")
+        conn.close()
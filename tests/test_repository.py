@@ -0,0 +1,339 @@
+"""
+Test Repository - Testy integracyjne warstwy repozytoriów
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+from src.db import Database
+from src.models import WorkEntry, WorkEntryRecord
+from src.repository import WorkEntryRepository, ProfileRepository, UnitOfWork
+
+
+@pytest.fixture
+def temp_db():
+    """Utwórz tymczasową bazę danych"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        db = Database(str(db_path))
+        yield db
+        db.close()
+
+
+@pytest.fixture
+def repo(temp_db):
+    """Repozytorium wpisów z nowym profilem"""
+    profile_id = temp_db.create_profile("Repo Test")
+    return WorkEntryRepository(temp_db), profile_id
+
+
+def make_entry(profile_id: int, date: str, **kwargs) -> WorkEntry:
+    """Utwórz wpis dnia pracującego"""
+    values = dict(
+        profile_id=profile_id,
+        date=date,
+        start_time="09:00",
+        end_time="17:00",
+        break_minutes=30,
+        day_type="work_day",
+    )
+    values.update(kwargs)
+    return WorkEntry(**values)
+
+
+class TestWorkEntryRepositoryRanges:
+    """Testy zapytań po zakresie dat"""
+    
+    def test_get_date_range(self, repo):
+        """Test zakresu dat obejmującego granicę miesięcy"""
+        repository, profile_id = repo
+        
+        for date in ['2025-01-30', '2025-01-31', '2025-02-01', '2025-02-03']:
+            repository.create(make_entry(profile_id, date))
+        
+        entries = repository.get_date_range(profile_id, '2025-01-31', '2025-02-02')
+        assert [e.date for e in entries] == ['2025-01-31', '2025-02-01']
+        assert all(isinstance(e, WorkEntry) for e in entries)
+    
+    def test_get_date_range_ignores_other_profiles(self, repo, temp_db):
+        """Test czy zakres nie zwraca wpisów innych profili"""
+        repository, profile_id = repo
+        other_id = temp_db.create_profile("Other")
+        
+        repository.create(make_entry(profile_id, '2025-03-10'))
+        repository.create(make_entry(other_id, '2025-03-11'))
+        
+        entries = repository.get_date_range(profile_id, '2025-03-01', '2025-03-31')
+        assert [e.date for e in entries] == ['2025-03-10']
+    
+    def test_iter_date_range(self, repo):
+        """Strumieniowe pobieranie zwraca modele w kolejności dat"""
+        repository, profile_id = repo
+        for day in ("2025-03-03", "2025-03-01", "2025-03-02", "2025-04-01"):
+            repository.create(make_entry(profile_id, day))
+        
+        entries = repository.iter_date_range(profile_id, "2025-03-01", "2025-03-31", batch_size=2)
+        
+        assert not isinstance(entries, list)
+        assert [e.date for e in entries] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    
+    def test_get_week(self, repo):
+        """Test tygodnia - 7 dni od daty początkowej"""
+        repository, profile_id = repo
+        
+        for date in ['2025-03-02', '2025-03-03', '2025-03-09', '2025-03-10']:
+            repository.create(make_entry(profile_id, date))
+        
+        entries = repository.get_week(profile_id, '2025-03-03')
+        assert [e.date for e in entries] == ['2025-03-03', '2025-03-09']
+
+
+
+class TestWorkEntryRepositoryBulk:
+    """Testy zapisu wielu wpisów"""
+    
+    def test_create_many(self, repo):
+        """Test zapisu roku wpisów"""
+        repository, profile_id = repo
+        
+        entries = [make_entry(profile_id, f'2025-{m:02d}-{d:02d}') for m in range(1, 13) for d in range(1, 21)]
+        results = repository.create_many(entries, chunk_size=50)
+        
+        assert len(results) == 240
+        assert repository.count_month(profile_id, 2025, 6) == 20
+    
+    def test_create_many_requires_profile_id(self, repo):
+        """Test czy brak profile_id przerywa zapis bez częściowych zmian"""
+        repository, profile_id = repo
+        
+        entries = [make_entry(profile_id, '2025-01-01'), make_entry(None, '2025-01-02')]
+        with pytest.raises(ValueError):
+            repository.create_many(entries)
+        
+        assert repository.count_month(profile_id, 2025, 1) == 0
+
+
+class TestWorkEntryRepositoryCache:
+    """Testy cache miesięcy (LRU)"""
+    
+    @pytest.fixture
+    def cached(self, temp_db):
+        profile_id = temp_db.create_profile("Cache Test")
+        return WorkEntryRepository(temp_db, cache_size=2), profile_id
+    
+    def test_disabled_by_default(self, repo):
+        """Bez cache_size każde wywołanie czyta bazę"""
+        repository, profile_id = repo
+        repository.get_month(profile_id, 2025, 1)
+        repository.get_month(profile_id, 2025, 1)
+        
+        assert repository.cache_info() == {'hits': 0, 'misses': 0, 'size': 0, 'max_size': 0}
+    
+    def test_hits_and_misses(self, cached):
+        """Powtórny odczyt miesiąca trafia w cache"""
+        repository, profile_id = cached
+        repository.create(make_entry(profile_id, "2025-01-10"))
+        
+        first = repository.get_month(profile_id, 2025, 1)
+        second = repository.get_month(profile_id, 2025, 1)
+        
+        assert [e.date for e in first] == [e.date for e in second] == ["2025-01-10"]
+        assert repository.cache_info()['hits'] == 1
+        assert repository.cache_info()['misses'] == 1
+    
+    def test_returned_entries_do_not_alias_cache(self, cached):
+        """Edycja zwróconego wpisu nie zmienia danych w cache"""
+        repository, profile_id = cached
+        repository.create(make_entry(profile_id, "2025-01-10"))
+        
+        first = repository.get_month(profile_id, 2025, 1)
+        first[0].end_time = "23:59"
+        second = repository.get_month(profile_id, 2025, 1)
+        
+        assert second[0].end_time == "17:00"
+        assert second[0] is not first[0]
+        assert repository.get_month_records(profile_id, 2025, 1)[0].end_time == "17:00"
+        assert repository.cache_info()['hits'] == 2
+    
+    def test_writes_invalidate_affected_month(self, cached):
+        """create/update/delete unieważniają tylko miesiąc wpisu"""
+        repository, profile_id = cached
+        repository.get_month(profile_id, 2025, 1)
+        repository.get_month(profile_id, 2025, 2)
+        
+        repository.create(make_entry(profile_id, "2025-01-15"))
+        assert len(repository.get_month(profile_id, 2025, 1)) == 1
+        repository.get_month(profile_id, 2025, 2)
+        assert repository.cache_info()['hits'] == 1
+        
+        repository.update(make_entry(profile_id, "2025-01-15", end_time="12:00"))
+        assert repository.get_month(profile_id, 2025, 1)[0].end_time == "12:00"
+        
+        repository.delete(profile_id, "2025-01-15")
+        assert repository.get_month(profile_id, 2025, 1) == []
+    
+    def test_bulk_writes_invalidate(self, cached):
+        """create_many i delete_month unieważniają dotknięte miesiące"""
+        repository, profile_id = cached
+        repository.get_month(profile_id, 2025, 3)
+        
+        repository.create_many([make_entry(profile_id, "2025-03-01"), make_entry(profile_id, "2025-03-02")])
+        assert len(repository.get_month(profile_id, 2025, 3)) == 2
+        
+        repository.delete_month(profile_id, 2025, 3)
+        assert repository.get_month(profile_id, 2025, 3) == []
+    
+    def test_lru_eviction(self, cached):
+        """Najdawniej używany miesiąc jest usuwany po przekroczeniu limitu"""
+        repository, profile_id = cached
+        repository.get_month(profile_id, 2025, 1)
+        repository.get_month(profile_id, 2025, 2)
+        repository.get_month(profile_id, 2025, 1)
+        repository.get_month(profile_id, 2025, 3)
+        
+        repository.get_month(profile_id, 2025, 1)
+        repository.get_month(profile_id, 2025, 2)
+        
+        info = repository.cache_info()
+        assert info['size'] == 2
+        assert info['hits'] == 2
+        assert info['misses'] == 4
+
+
+class TestWorkEntryRecords:
+    """Testy zwartych rekordów wpisów"""
+    
+    def test_month_records_match_models(self, repo):
+        """get_month_records zwraca te same dane co get_month"""
+        repository, profile_id = repo
+        repository.create(make_entry(profile_id, "2025-02-03"))
+        repository.create(make_entry(profile_id, "2025-02-04", start_time="22:00", end_time="06:00"))
+        
+        records = repository.get_month_records(profile_id, 2025, 2)
+        models = repository.get_month(profile_id, 2025, 2)
+        
+        assert all(isinstance(r, WorkEntryRecord) for r in records)
+        assert [r.to_dict() for r in records] == [m.to_dict() for m in models]
+        assert records[1].is_midnight_crossing is True
+    
+    def test_record_to_entry(self, repo):
+        """Rekord można zamienić na mutowalny WorkEntry"""
+        repository, profile_id = repo
+        repository.create(make_entry(profile_id, "2025-02-05"))
+        record = repository.get_month_records(profile_id, 2025, 2)[0]
+        
+        entry = record.to_entry()
+        
+        assert isinstance(entry, WorkEntry)
+        assert entry.to_dict() == record.to_dict()
+
+
+class TestRepositorySetBased:
+    """Testy operacji zbiorowych (jedno zapytanie zamiast pętli)"""
+    
+    def test_delete_month_single_statement(self, repo, temp_db):
+        """delete_month to jedna transakcja z jednym zapytaniem DELETE"""
+        repository, profile_id = repo
+        repository.create_many(make_entry(profile_id, f"2025-05-{day:02d}") for day in range(1, 11))
+        repository.create(make_entry(profile_id, "2025-06-01"))
+        
+        statements = []
+        writer = temp_db._pool.get_writer()
+        writer.set_trace_callback(statements.append)
+        try:
+            deleted = repository.delete_month(profile_id, 2025, 5)
+        finally:
+            writer.set_trace_callback(None)
+        
+        # Wyzwalacze raportują tekst głównego zapytania, więc liczymy transakcje
+        assert deleted == 10
+        assert sum(1 for sql in statements if sql.strip().startswith("BEGIN")) == 1
+        assert sum(1 for sql in statements if sql.strip() == "COMMIT") == 1
+        assert len({sql for sql in statements if "DELETE" in sql}) == 1
+        assert repository.count_month(profile_id, 2025, 6) == 1
+    
+    def test_count_month_and_exists(self, repo):
+        """count_month i exists bez budowania modeli"""
+        repository, profile_id = repo
+        repository.create(make_entry(profile_id, "2025-07-01"))
+        repository.create(make_entry(profile_id, "2025-07-31"))
+        repository.create(make_entry(profile_id, "2025-08-01"))
+        
+        assert repository.count_month(profile_id, 2025, 7) == 2
+        assert repository.exists(profile_id, "2025-07-31")
+        assert not repository.exists(profile_id, "2025-07-30")
+    
+    def test_profile_count_and_exists(self, temp_db):
+        """ProfileRepository.count i exists przez COUNT(*) / SELECT 1"""
+        profiles = ProfileRepository(temp_db)
+        before = profiles.count()
+        profile_id = temp_db.create_profile("Count Test")
+        
+        assert profiles.count() == before + 1
+        assert profiles.exists(profile_id)
+        assert not profiles.exists(profile_id + 1000)
+
+
+class TestUnitOfWork:
+    """Testy jednostki pracy"""
+    
+    def test_commit(self, temp_db):
+        """Zapisy kilku repozytoriów zatwierdzane razem"""
+        with UnitOfWork(temp_db) as uow:
+            profile_id = uow.db.create_profile("UoW")
+            uow.work_entries.create_many(make_entry(profile_id, f"2025-09-{d:02d}") for d in range(1, 4))
+        
+        assert WorkEntryRepository(temp_db).count_month(profile_id, 2025, 9) == 3
+    
+    def test_rollback_and_cache(self, temp_db):
+        """Wycofanie usuwa zapisy i czyści cache odczytany w transakcji"""
+        repository = WorkEntryRepository(temp_db, cache_size=4)
+        profile_id = temp_db.create_profile("UoW Rollback")
+        
+        with pytest.raises(RuntimeError):
+            with UnitOfWork(temp_db, work_entries=repository) as uow:
+                uow.work_entries.create(make_entry(profile_id, "2025-10-01"))
+                assert len(uow.work_entries.get_month(profile_id, 2025, 10)) == 1
+                raise RuntimeError("przerwij")
+        
+        assert repository.get_month(profile_id, 2025, 10) == []
+        assert not repository.exists(profile_id, "2025-10-01")
+
+
+class TestRepositoryConcurrency:
+    """Testy równoległego dostępu z wątków roboczych"""
+    
+    def test_concurrent_reads_and_writes(self, repo):
+        """Test odczytów i zapisów z ThreadPoolExecutor"""
+        from concurrent.futures import ThreadPoolExecutor
+        repository, profile_id = repo
+        
+        def write(month):
+            for day in range(1, 11):
+                repository.create(make_entry(profile_id, f'2025-{month:02d}-{day:02d}'))
+            return month
+        
+        def read(month):
+            return len(repository.get_month(profile_id, 2025, month))
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            writes = [executor.submit(write, month) for month in range(1, 13)]
+            reads = [executor.submit(read, month) for month in range(1, 13) for _ in range(5)]
+            for future in writes + reads:
+                future.result()
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            counts = list(executor.map(read, range(1, 13)))
+        assert counts == [10] * 12
+    
+    def test_reader_connections_are_read_only(self, temp_db):
+        """Test czy połączenia czytelników nie pozwalają na zapis"""
+        import sqlite3
+        
+        with temp_db._pool.reader() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM profiles")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
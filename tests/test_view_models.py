@@ -0,0 +1,58 @@
+"""
+Test view-modeli - Testy porównywania danych dashboardu
+"""
+
+import pytest
+from src.models import WorkEntry
+from src.services.calc_service import CalcService
+from src.ui.view_models import DashboardViewModel
+
+
+@pytest.fixture
+def calc_service():
+    return CalcService()
+
+
+def build(calc_service, entries, profile_name="Jan"):
+    """View-model dla wpisów z maja 2025"""
+    results = [
+        calc_service.calculate_work_day(e.date, e.start_time, e.end_time, e.break_minutes, e.day_type)
+        for e in entries
+    ]
+    summary = calc_service.calculate_month_summary(results)
+    return DashboardViewModel.build(profile_name, 2025, 5, summary, entries)
+
+
+def make_entry(date: str, end_time: str = "16:00") -> WorkEntry:
+    return WorkEntry(
+        id=None, profile_id=1, date=date, start_time="08:00",
+        end_time=end_time, break_minutes=0, day_type="work_day"
+    )
+
+
+class TestDashboardViewModel:
+    """Testy DashboardViewModel"""
+    
+    def test_build_from_summary(self, calc_service):
+        """View-model zawiera sumy miesiąca i ostatnie wpisy"""
+        vm = build(calc_service, [make_entry("2025-05-05"), make_entry("2025-05-06", "12:00")])
+        
+        assert vm.work_days == 2
+        assert vm.days_with_entries == 2
+        assert vm.total_work_hours_hm == "12:00"
+        assert vm.recent_entries[1] == ("2025-05-06", "work_day", "08:00", "12:00")
+    
+    def test_changed_fields(self, calc_service):
+        """Porównanie zwraca tylko zmienione pola"""
+        entries = [make_entry("2025-05-05")]
+        first = build(calc_service, entries)
+        
+        assert first.changed_fields(None) >= {'profile_name', 'recent_entries'}
+        assert build(calc_service, entries).changed_fields(first) == frozenset()
+        assert build(calc_service, entries, "Anna").changed_fields(first) == {'profile_name'}
+        
+        edited = build(calc_service, [make_entry("2025-05-05", "12:00")])
+        changed = edited.changed_fields(first)
+        assert 'recent_entries' in changed
+        assert 'total_work_hours_hm' in changed
+        assert 'work_days' not in changed
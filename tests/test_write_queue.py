@@ -0,0 +1,108 @@
+"""
+Test WriteBehindQueue - Testy kolejki zapisów w tle
+"""
+
+import pytest
+import tempfile
+import threading
+from pathlib import Path
+from src.db import Database, WriteBehindQueue
+
+
+@pytest.fixture
+def temp_db():
+    """Utwórz tymczasową bazę danych"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "test.db"))
+        yield db
+        db.close()
+
+
+def entry(profile_id: int, date: str, **kwargs) -> dict:
+    """Słownik wpisu z domyślnymi godzinami 08:00-16:00"""
+    values = dict(
+        profile_id=profile_id, date=date, start_time="08:00", end_time="16:00",
+        break_minutes=0, day_type="work_day", notes=""
+    )
+    values.update(kwargs)
+    return values
+
+
+class TestWriteBehindQueue:
+    """Testy kolejki zapisów"""
+
+    def test_submit_returns_future_with_result(self, temp_db):
+        """Future zwraca wynik funkcji zapisu po COMMIT"""
+        profile_id = temp_db.create_profile("Kolejka")
+        writes = WriteBehindQueue(temp_db)
+        try:
+            future = writes.submit(temp_db.insert_work_entry, entry(profile_id, "2025-03-03"))
+            assert future.result(timeout=5) > 0
+            assert temp_db.work_entry_exists(profile_id, "2025-03-03")
+        finally:
+            writes.close()
+
+    def test_burst_is_coalesced_into_one_transaction(self, temp_db):
+        """Seria zapisów oczekujących w kolejce kończy się jednym COMMIT"""
+        profile_id = temp_db.create_profile("Seria")
+        writes = WriteBehindQueue(temp_db, coalesce_delay=0)
+
+        # Zablokuj wątek roboczy, aby cała seria czekała w kolejce
+        started, gate = threading.Event(), threading.Event()
+
+        def blocker():
+            started.set()
+            gate.wait(5)
+
+        writes.submit(blocker)
+        assert started.wait(5)
+        futures = [
+            writes.submit(temp_db.insert_work_entry, entry(profile_id, f"2025-03-{day:02d}"))
+            for day in range(1, 21)
+        ]
+        gate.set()
+        try:
+            for future in futures:
+                future.result(timeout=5)
+            # Seria blokująca + jedna seria dla 20 zapisów
+            assert writes.batches_committed == 2
+            assert temp_db.count_work_entries_month(profile_id, 2025, 3) == 20
+        finally:
+            writes.close()
+
+    def test_failed_write_does_not_roll_back_batch(self, temp_db):
+        """Błąd jednego zadania wycofuje tylko jego SAVEPOINT"""
+        profile_id = temp_db.create_profile("Błędy")
+        writes = WriteBehindQueue(temp_db, coalesce_delay=0.2)
+
+        def failing():
+            temp_db.insert_work_entry(entry(profile_id, "2025-03-02"))
+            raise RuntimeError("awaria zapisu")
+
+        try:
+            ok = writes.submit(temp_db.insert_work_entry, entry(profile_id, "2025-03-01"))
+            bad = writes.submit(failing)
+            writes.flush()
+
+            assert ok.result() > 0
+            with pytest.raises(RuntimeError):
+                bad.result()
+            assert temp_db.work_entry_exists(profile_id, "2025-03-01")
+            assert not temp_db.work_entry_exists(profile_id, "2025-03-02")
+        finally:
+            writes.close()
+
+    def test_close_flushes_pending_writes(self, temp_db):
+        """close() wykonuje wszystkie oczekujące zapisy i blokuje nowe"""
+        profile_id = temp_db.create_profile("Zamknięcie")
+        writes = WriteBehindQueue(temp_db, coalesce_delay=0)
+        futures = [
+            writes.submit(temp_db.insert_work_entry, entry(profile_id, f"2025-04-{day:02d}"))
+            for day in range(1, 11)
+        ]
+        writes.close()
+
+        assert all(future.done() for future in futures)
+        assert temp_db.count_work_entries_month(profile_id, 2025, 4) == 10
+        with pytest.raises(RuntimeError):
+            writes.submit(temp_db.insert_work_entry, entry(profile_id, "2025-04-11"))